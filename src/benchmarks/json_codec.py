@@ -0,0 +1,47 @@
+"""Micro-benchmark of JSON codec backends on real LDA payloads.
+
+Decodes and re-encodes raw assets with every installed backend and reports
+throughput. Run from src/ with DATA_DIR (or R2 credentials) set:
+
+    python -m benchmarks.json_codec filings_2024 contributions_2024
+"""
+
+import argparse
+import time
+from subsets_utils import load_raw_json, json_codec
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON codec backends")
+    parser.add_argument("assets", nargs="+", help="Raw asset ids (e.g., filings_2024)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    backends = [json_codec.get_backend(name) for name in json_codec.available_backends()]
+    print(f"Backends: {', '.join(b.name for b in backends)} (active: {json_codec.get_backend().name})")
+
+    for asset_id in args.assets:
+        data = load_raw_json(asset_id)
+        payload = json_codec.get_backend("json").dumps(data)
+        size_mb = len(payload) / 1024 / 1024
+        records = len(data) if isinstance(data, list) else 1
+        print(f"\n{asset_id}: {records:,} records, {size_mb:.1f} MB")
+        print(f"  {'backend':<10}{'decode MB/s':>14}{'encode MB/s':>14}{'decode rec/s':>16}")
+
+        for backend in backends:
+            decode = _best_of(lambda: backend.loads(payload), args.repeat)
+            encode = _best_of(lambda: backend.dumps(data), args.repeat)
+            print(f"  {backend.name:<10}{size_mb / decode:>14.1f}{size_mb / encode:>14.1f}{records / decode:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Benchmark of the row-wise and Arrow-native filings transforms.
+
+The row-wise reference decodes a raw asset to Python dicts and builds each
+output row with per-record Python, as the transforms originally did (with
+the same output types). The
+Arrow-native path parses the raw bytes with pyarrow.json and builds the
+same tables with compute kernels. Both paths start from the stored bytes,
+so decoding is included. Reports rows per second and checks that the two
+produce identical tables. Run from src/ with DATA_DIR (or R2 credentials) set:
+
+    python -m benchmarks.transforms filings_2024
+"""
+
+import argparse
+import hashlib
+import time
+import uuid
+from datetime import date
+from decimal import Decimal, InvalidOperation
+import pyarrow as pa
+from subsets_utils.io import load_raw_bytes, decode_dictionaries, _decode_raw_json
+from subsets_utils.arrow_cache import _decode_ndjson
+from utils import FILINGS_RAW_SCHEMA, ACTIVITY_INDEX_BITS, organization_id
+from transforms.filings.main import FilingsBuilder
+from transforms.lobbying_activities.main import ActivitiesBuilder
+
+QUARTERS = {"first_quarter": "Q1", "second_quarter": "Q2", "third_quarter": "Q3", "fourth_quarter": "Q4"}
+
+
+def _parse_amount(val):
+    if not val:
+        return None
+    try:
+        amount = Decimal(val.replace(",", "").strip()).quantize(Decimal("0.01"))
+    except (ValueError, TypeError, InvalidOperation):
+        return None
+    return amount if amount.is_finite() and abs(amount) < Decimal("1e16") else None
+
+
+def _parse_date(val):
+    try:
+        return date.fromisoformat(val[:10]) if val else None
+    except ValueError:
+        return None
+
+
+def _parse_uuid(val):
+    try:
+        return uuid.UUID(val).bytes if val else None
+    except ValueError:
+        return None
+
+
+def _text_key(val):
+    if not val or not val.strip():
+        return None
+    return int.from_bytes(hashlib.blake2b(val.encode("utf-8"), digest_size=8).digest(), "big") >> 1
+
+
+_organizations = {}
+
+
+def _organization_id(name):
+    # One lookup per distinct name, as a row-wise transform would memoize it
+    if name not in _organizations:
+        _organizations[name] = organization_id(pa.chunked_array([[name]], pa.string()))[0].as_py()
+    return _organizations[name]
+
+
+def rowwise_filings(filings: list[dict]) -> list[dict]:
+    records = []
+    for filing in filings:
+        registrant = filing.get("registrant") or {}
+        client = filing.get("client") or {}
+        records.append({
+            "filing_uuid": _parse_uuid(filing.get("filing_uuid")),
+            "filing_year": filing.get("filing_year"),
+            "filing_quarter": QUARTERS.get(filing.get("filing_period")),
+            "filing_type": filing.get("filing_type"),
+            "filing_type_display": filing.get("filing_type_display"),
+            "posted_date": _parse_date(filing.get("dt_posted")),
+            "termination_date": _parse_date(filing.get("termination_date")),
+            "registrant_id": registrant.get("id"),
+            "registrant_name": registrant.get("name"),
+            "registrant_organization_id": _organization_id(registrant.get("name")),
+            "registrant_state": registrant.get("state"),
+            "client_id": client.get("id"),
+            "client_name": client.get("name"),
+            "client_organization_id": _organization_id(client.get("name")),
+            "client_state": client.get("state"),
+            "client_country": client.get("country"),
+            "income": _parse_amount(filing.get("income")),
+            "expenses": _parse_amount(filing.get("expenses")),
+        })
+    return records
+
+
+def rowwise_activities(filings: list[dict]) -> list[dict]:
+    records = []
+    for filing in filings:
+        registrant = filing.get("registrant") or {}
+        client = filing.get("client") or {}
+        filing_uuid = _parse_uuid(filing.get("filing_uuid"))
+        filing_key = int.from_bytes(filing_uuid[:8], "big") >> (1 + ACTIVITY_INDEX_BITS) if filing_uuid else None
+        for index, activity in enumerate(filing.get("lobbying_activities") or []):
+            lobbyist_names = []
+            for entry in activity.get("lobbyists") or []:
+                lobbyist = entry.get("lobbyist") or {}
+                first = lobbyist.get("first_name") or ""
+                last = lobbyist.get("last_name") or ""
+                if first or last:
+                    lobbyist_names.append(f"{first} {last}".strip())
+            gov_names = [e.get("name") for e in activity.get("government_entities") or [] if e.get("name")]
+            records.append({
+                "activity_id": (filing_key << ACTIVITY_INDEX_BITS) | index if filing_key is not None else None,
+                "filing_uuid": filing_uuid,
+                "filing_year": filing.get("filing_year"),
+                "registrant_name": registrant.get("name"),
+                "registrant_organization_id": _organization_id(registrant.get("name")),
+                "client_name": client.get("name"),
+                "client_organization_id": _organization_id(client.get("name")),
+                "issue_code": activity.get("general_issue_code"),
+                "issue_area": activity.get("general_issue_code_display"),
+                "description_id": _text_key(activity.get("description")),
+                "lobbyist_names": lobbyist_names or None,
+                "government_entities": gov_names or None,
+            })
+    return records
+
+
+def _best_of(fn, repeat: int) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark row-wise vs Arrow-native filings transforms")
+    parser.add_argument("assets", nargs="+", help="Raw filings asset ids (e.g., filings_2024)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement (best is kept)")
+    args = parser.parse_args()
+
+    builders = [(FilingsBuilder(), rowwise_filings), (ActivitiesBuilder(), rowwise_activities)]
+
+    for asset_id in args.assets:
+        content, codec = load_raw_bytes(asset_id)
+        print(f"\n{asset_id}: {len(content) / 1024 / 1024:.1f} MB ({codec})")
+        print(f"  {'dataset':<26}{'rows':>10}{'row-wise rows/s':>18}{'arrow rows/s':>16}{'speedup':>10}  identical")
+
+        for builder, rowwise in builders:
+            def before():
+                rows = rowwise(_decode_raw_json(content, codec))
+                return pa.Table.from_pylist(rows, schema=builder.schema)
+
+            def after():
+                if codec.startswith("ndjson"):
+                    table = _decode_ndjson(content, codec, FILINGS_RAW_SCHEMA)
+                else:
+                    table = pa.Table.from_pylist(_decode_raw_json(content, codec), schema=FILINGS_RAW_SCHEMA)
+                return builder.build(table, asset_id)
+
+            before_time, expected = _best_of(before, args.repeat)
+            after_time, actual = _best_of(after, args.repeat)
+            rows = len(expected)
+            print(f"  {builder.dataset_id:<26}{rows:>10,}{rows / before_time:>18,.0f}{rows / after_time:>16,.0f}"
+                  f"{before_time / after_time:>9.1f}x  {decode_dictionaries(actual).equals(decode_dictionaries(expected))}")
+
+
+if __name__ == "__main__":
+    main()
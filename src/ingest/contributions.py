@@ -7,7 +7,8 @@ API: https://lda.senate.gov/api/v1/contributions/
 """
 
 import time
-from subsets_utils import get, save_raw_json, load_state, save_state
+from typing import Callable
+from subsets_utils import get, save_raw_json, raw_asset_exists, flush_manifest, load_state, save_state, json_codec
 from utils import CONTRIBUTION_YEARS, API_BASE, RATE_LIMIT_DELAY
 
 
@@ -21,7 +22,7 @@ def fetch_contributions_for_year(year: int) -> list[dict]:
     while url:
         print(f"    Page {page}...")
         response = get(url, params=params if page == 1 else None)
-        data = response.json()
+        data = json_codec.loads(response.content)
 
         results = data.get("results", [])
         all_contributions.extend(results)
@@ -35,8 +36,14 @@ def fetch_contributions_for_year(year: int) -> list[dict]:
     return all_contributions
 
 
-def run():
-    """Fetch LDA contribution reports by year."""
+def run(on_asset: Callable[[str], None] = None):
+    """Fetch LDA contribution reports by year.
+
+    Args:
+        on_asset: Called with each raw asset id as soon as it is available,
+            in year order: immediately for years fetched on earlier runs,
+            right after saving for the others (see subsets_utils.pipeline)
+    """
     state = load_state("contributions")
     completed = set(state.get("completed_years", []))
 
@@ -44,23 +51,41 @@ def run():
 
     if not pending:
         print("  All contribution years up to date")
-        return
+    else:
+        print(f"  Fetching contributions for {len(pending)} years...")
 
-    print(f"  Fetching contributions for {len(pending)} years...")
+    for year in CONTRIBUTION_YEARS:
+        asset_id = f"contributions_{year}"
+        if year in completed:
+            # Years without reports were never saved
+            if on_asset and raw_asset_exists(asset_id):
+                on_asset(asset_id)
+            continue
 
-    for year in pending:
         print(f"  [{year}] Fetching contributions...")
 
         contributions = fetch_contributions_for_year(year)
         print(f"    -> Total: {len(contributions):,} reports")
 
         if contributions:
-            save_raw_json(contributions, f"contributions_{year}", compress=True)
+            save_raw_json(
+                contributions,
+                asset_id,
+                compress=True,
+                ndjson=True,
+                source={"url": f"{API_BASE}/contributions/", "params": {"filing_year": year}},
+            )
 
         completed.add(year)
         save_state("contributions", {"completed_years": list(completed)})
 
-    print(f"  Completed fetching contributions")
+        if on_asset and contributions:
+            on_asset(asset_id)
+
+    # One manifest update for every year saved by this run
+    flush_manifest()
+    if pending:
+        print(f"  Completed fetching contributions")
 
 
 if __name__ == "__main__":
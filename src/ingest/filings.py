@@ -6,7 +6,8 @@ API: https://lda.senate.gov/api/v1/filings/
 """
 
 import time
-from subsets_utils import get, save_raw_json, load_state, save_state
+from typing import Callable
+from subsets_utils import get, save_raw_json, raw_asset_exists, flush_manifest, load_state, save_state, json_codec
 from utils import FILING_YEARS, API_BASE, RATE_LIMIT_DELAY
 
 
@@ -20,7 +21,7 @@ def fetch_filings_for_year(year: int) -> list[dict]:
     while url:
         print(f"    Page {page}...")
         response = get(url, params=params if page == 1 else None)
-        data = response.json()
+        data = json_codec.loads(response.content)
 
         results = data.get("results", [])
         all_filings.extend(results)
@@ -34,8 +35,14 @@ def fetch_filings_for_year(year: int) -> list[dict]:
     return all_filings
 
 
-def run():
-    """Fetch LDA filings by year."""
+def run(on_asset: Callable[[str], None] = None):
+    """Fetch LDA filings by year.
+
+    Args:
+        on_asset: Called with each raw asset id as soon as it is available,
+            in year order: immediately for years fetched on earlier runs,
+            right after saving for the others (see subsets_utils.pipeline)
+    """
     state = load_state("filings")
     completed = set(state.get("completed_years", []))
 
@@ -43,23 +50,41 @@ def run():
 
     if not pending:
         print("  All filing years up to date")
-        return
+    else:
+        print(f"  Fetching filings for {len(pending)} years...")
 
-    print(f"  Fetching filings for {len(pending)} years...")
+    for year in FILING_YEARS:
+        asset_id = f"filings_{year}"
+        if year in completed:
+            # Years without filings were never saved
+            if on_asset and raw_asset_exists(asset_id):
+                on_asset(asset_id)
+            continue
 
-    for year in pending:
         print(f"  [{year}] Fetching filings...")
 
         filings = fetch_filings_for_year(year)
         print(f"    -> Total: {len(filings):,} filings")
 
         if filings:
-            save_raw_json(filings, f"filings_{year}", compress=True)
+            save_raw_json(
+                filings,
+                asset_id,
+                compress=True,
+                ndjson=True,
+                source={"url": f"{API_BASE}/filings/", "params": {"filing_year": year}},
+            )
 
         completed.add(year)
         save_state("filings", {"completed_years": list(completed)})
 
-    print(f"  Completed fetching filings")
+        if on_asset and filings:
+            on_asset(asset_id)
+
+    # One manifest update for every year saved by this run
+    flush_manifest()
+    if pending:
+        print(f"  Completed fetching filings")
 
 
 if __name__ == "__main__":
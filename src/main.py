@@ -3,7 +3,14 @@
 Data flow:
 1. filings: Fetch lobbying registration and quarterly activity reports via API
 2. contributions: Fetch contribution reports (LD-203)
-3. transform: Clean and transform into datasets
+3. transform: Clean and transform into datasets (a first scan of raw filings
+   resolves registrant and client names to organizations, a second feeds
+   every other filings-derived dataset, one scan of raw contributions feeds
+   the report and item tables)
+
+With --pipeline the steps overlap: each raw year is handed to the scans
+that depend on it as soon as it is saved (see run_pipelined). After
+transforming, the Delta tables are compacted, checkpointed and vacuumed.
 
 Data source: https://lda.senate.gov/api/
 License: US Government Public Domain
@@ -14,17 +21,120 @@ import os
 
 os.environ['RUN_ID'] = os.getenv('RUN_ID', 'local-run')
 
-from subsets_utils import validate_environment
+from subsets_utils import validate_environment, flush_state
+from subsets_utils.transform import run_builders
+from subsets_utils.pipeline import stream_assets
+from subsets_utils.maintenance import maintain_tables
+from utils import YEARS, CONTRIBUTION_YEARS, load_filings, load_contributions
 from ingest import filings as ingest_filings
 from ingest import contributions as ingest_contributions
-from transforms.filings import main as transform_filings
-from transforms.lobbying_activities import main as transform_activities
+from transforms.organizations.main import OrganizationsBuilder
+from transforms.filings.main import FilingsBuilder
+from transforms.current_filings.main import CurrentFilingsBuilder
+from transforms.lobbying_activities.main import ActivitiesBuilder, DescriptionsBuilder, IssueCooccurrenceBuilder
+from transforms.lobbyists.main import LobbyistsBuilder, ActivityLobbyistsBuilder
+from transforms.government_entities.main import GovernmentEntitiesBuilder, ActivityGovernmentEntitiesBuilder
+from transforms.graph.main import GraphBuilder
+from transforms.contributions.main import ContributionsBuilder, ContributionItemsBuilder
+
+# Every Delta table the transforms write, and the columns queries filter on most
+DATASETS = [
+    "lda_organization_names",
+    "lda_filings", "lda_current_filings",
+    "lda_lobbying_activities", "lda_activity_descriptions", "lda_activity_descriptions_parts", "lda_issue_cooccurrence",
+    "lda_lobbyists", "lda_lobbyists_parts", "lda_activity_lobbyists",
+    "lda_government_entities", "lda_government_entities_parts", "lda_activity_government_entities",
+    "lda_graph_nodes", "lda_graph_edges", "lda_graph_adjacency",
+    "lda_contributions", "lda_contribution_items",
+]
+CLUSTER_COLUMNS = ["filing_year", "client_id", "issue_code"]
+
+
+# Filings-derived datasets whose rows for a year come from that raw year alone, without organization ids
+YEAR_LOCAL_BUILDERS = (ActivityLobbyistsBuilder, ActivityGovernmentEntitiesBuilder)
+
+
+def filings_builders():
+    return [
+        FilingsBuilder(), CurrentFilingsBuilder(),
+        ActivitiesBuilder(), DescriptionsBuilder(), IssueCooccurrenceBuilder(),
+        LobbyistsBuilder(), ActivityLobbyistsBuilder(),
+        GovernmentEntitiesBuilder(), ActivityGovernmentEntitiesBuilder(),
+        GraphBuilder(),
+    ]
+
+
+def transform_organizations(filing_assets, builders=()):
+    # Filings and activities look names up in the resolved organizations
+    print("\n--- Organizations ---")
+    run_builders(filing_assets, [OrganizationsBuilder(), *builders], loader=load_filings)
+
+
+def transform_filings(filing_assets, builders=None):
+    # All of these come from the same raw filings, read once per year
+    print("\n--- Filings, Lobbying Activities, Lobbyists, Government Entities & Network Graph ---")
+    run_builders(filing_assets, filings_builders() if builders is None else builders, loader=load_filings)
+
+
+def transform_contributions(contribution_assets):
+    print("\n--- Contributions (LD-203) ---")
+    run_builders(
+        contribution_assets,
+        [ContributionsBuilder(), ContributionItemsBuilder()],
+        loader=load_contributions,
+    )
+
+
+def maintain():
+    print("\n=== Maintenance ===")
+    maintain_tables(DATASETS, z_order_by=CLUSTER_COLUMNS)
+
+
+def run_pipelined():
+    """Ingest and transform concurrently, following the per-year dependencies.
+
+    Each raw year feeds the transforms that need only that year as soon as
+    it is saved: the organizations scan, which also builds the year-local
+    activity bridges, runs while later filing years are still being
+    fetched, and the contributions scan while later contribution years are.
+    The other filings-derived datasets look names up in the resolved
+    organizations (and their fingerprints include its version) or combine
+    years, so their scan starts once every filing year is in; it overlaps
+    with the contributions ingest instead.
+    """
+    print("\n=== Pipelined ingest and transform ===")
+    print("\n--- Filings (LD-1/LD-2) ---")
+    filing_assets = []
+
+    def ingest_filings_years(on_asset):
+        def saved(asset_id):
+            filing_assets.append(asset_id)
+            on_asset(asset_id)
+        ingest_filings.run(on_asset=saved)
+
+    builders = filings_builders()
+    transform_organizations(
+        stream_assets(ingest_filings_years, name="ingest-filings"),
+        [builder for builder in builders if isinstance(builder, YEAR_LOCAL_BUILDERS)],
+    )
+
+    print("\n--- Contributions (LD-203) ---")
+    contribution_assets = stream_assets(
+        lambda on_asset: ingest_contributions.run(on_asset=on_asset), name="ingest-contributions",
+    )
+    transform_filings(filing_assets, [builder for builder in builders if not isinstance(builder, YEAR_LOCAL_BUILDERS)])
+    transform_contributions(contribution_assets)
+    flush_state()
 
 
 def main():
     parser = argparse.ArgumentParser(description="LDA Lobbying Disclosure Connector")
     parser.add_argument("--ingest-only", action="store_true", help="Only fetch data from LDA API")
     parser.add_argument("--transform-only", action="store_true", help="Only transform existing raw data")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Transform each raw year as soon as it is fetched instead of after the whole ingest")
+    parser.add_argument("--skip-maintenance", action="store_true",
+                        help="Don't compact, checkpoint and vacuum the Delta tables after transforming")
     args = parser.parse_args()
 
     validate_environment([])
@@ -32,21 +142,29 @@ def main():
     should_ingest = not args.transform_only
     should_transform = not args.ingest_only
 
+    if should_ingest and should_transform and args.pipeline:
+        run_pipelined()
+        if not args.skip_maintenance:
+            maintain()
+        return
+
     if should_ingest:
         print("\n=== Phase 1: Ingest ===")
         print("\n--- Filings (LD-1/LD-2) ---")
         ingest_filings.run()
         print("\n--- Contributions (LD-203) ---")
         ingest_contributions.run()
+        flush_state()
 
     if should_transform:
         print("\n=== Phase 2: Transform ===")
+        filing_assets = [f"filings_{year}" for year in YEARS]
+        transform_organizations(filing_assets)
+        transform_filings(filing_assets)
+        transform_contributions([f"contributions_{year}" for year in CONTRIBUTION_YEARS])
 
-        print("\n--- Filings ---")
-        transform_filings.run()
-
-        print("\n--- Lobbying Activities ---")
-        transform_activities.run()
+        if not args.skip_maintenance:
+            maintain()
 
 
 if __name__ == "__main__":
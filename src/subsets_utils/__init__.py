@@ -1,15 +1,19 @@
 from .http_client import get, post, put, delete
-from .io import upload_data, load_state, save_state, load_asset, has_changed, save_raw_json, load_raw_json, save_raw_file, load_raw_file, save_raw_parquet, load_raw_parquet
+from .io import upload_data, decode_dictionaries, load_state, save_state, load_asset, load_asset_schema, has_changed, save_raw_json, load_raw_json, load_raw_bytes, raw_asset_exists, save_raw_file, load_raw_file, save_raw_parquet, load_raw_parquet
+from .manifest import get_raw_entry, get_raw_hash, flush_manifest
+from .state import flush_state
+from .arrow_cache import load_raw_table, raw_column, raw_list
 from .environment import validate_environment, get_data_dir
 from .publish import publish
 from .testing import validate
-from . import debug
+from . import debug, json_codec
 
 __all__ = [
     'get', 'post', 'put', 'delete',
-    'upload_data', 'load_state', 'save_state', 'load_asset', 'has_changed',
-    'save_raw_json', 'load_raw_json', 'save_raw_file', 'load_raw_file',
+    'upload_data', 'decode_dictionaries', 'load_state', 'save_state', 'flush_state', 'load_asset', 'load_asset_schema', 'has_changed',
+    'save_raw_json', 'load_raw_json', 'load_raw_bytes', 'raw_asset_exists', 'save_raw_file', 'load_raw_file',
     'save_raw_parquet', 'load_raw_parquet',
+    'get_raw_entry', 'get_raw_hash', 'flush_manifest', 'load_raw_table', 'raw_column', 'raw_list',
     'validate_environment', 'get_data_dir',
     'publish',
     'validate',
@@ -0,0 +1,193 @@
+"""Decoded cache of raw JSON assets as Arrow IPC files.
+
+The first load of a raw asset decodes it once and writes the result as an
+Arrow IPC file named after the asset's manifest content hash. Later loads of
+the same content open that file with memory mapping: no decompression, no
+JSON parsing and no copy, and concurrent processes share the same pages
+through the OS page cache.
+
+NDJSON assets (save_raw_json(..., ndjson=True)) are parsed straight into
+Arrow by pyarrow.json without building Python objects. Pass an explicit
+schema to pin nested types and drop fields the transforms never read; the
+schema is part of the cache key.
+
+Assets without a manifest entry (written before the manifest existed) are
+keyed by the hash of the bytes loaded, which load_raw_bytes records in the
+manifest, so from the next load on they are served like any other.
+
+Cache files are named {asset_id}.{sha256}[-{schema}].arrow. Writing one
+deletes the asset's files for older content, and least recently used files
+are evicted once the cache exceeds its size budget. Deleting a file that
+another process has memory-mapped is safe: its pages stay valid until
+unmapped.
+
+Configuration:
+    ARROW_CACHE_DIR: cache directory (default DATA_DIR/cache/arrow)
+    ARROW_CACHE_MAX_MB: size budget in MB (default 8192, 0 = unbounded)
+"""
+
+import os
+import re
+import hashlib
+from pathlib import Path
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+import pyarrow.json as pa_json
+from .environment import get_data_dir
+from .io import load_raw_bytes, _decode_raw_json
+from .manifest import get_raw_hash, content_hash
+
+
+def _get_cache_dir() -> Path:
+    cache_dir = Path(os.environ.get('ARROW_CACHE_DIR', Path(get_data_dir()) / "cache" / "arrow"))
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def read_ipc(path: Path) -> pa.Table:
+    """Open an Arrow IPC file with memory mapping (zero-copy)."""
+    with pa.memory_map(str(path), 'r') as source:
+        return ipc.open_file(source).read_all()
+
+
+def write_ipc(table: pa.Table, path: Path) -> None:
+    """Write a table as an Arrow IPC file, atomically."""
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    # The IPC file format allows one dictionary per column
+    table = table.unify_dictionaries()
+    with ipc.new_file(str(tmp_path), table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _decode_ndjson(content: bytes, codec: str, schema: pa.Schema = None) -> pa.Table:
+    source = pa.BufferReader(content)
+    if codec.endswith(".gz"):
+        source = pa.CompressedInputStream(source, "gzip")
+    parse_options = pa_json.ParseOptions(
+        explicit_schema=schema,
+        unexpected_field_behavior="ignore" if schema else "infer",
+    )
+    return pa_json.read_json(source, parse_options=parse_options)
+
+
+def _cache_name(asset_id: str, sha256: str, schema: pa.Schema = None) -> str:
+    if schema is None:
+        return f"{asset_id}.{sha256}.arrow"
+    fingerprint = hashlib.sha256(schema.serialize().to_pybytes()).hexdigest()[:12]
+    return f"{asset_id}.{sha256}-{fingerprint}.arrow"
+
+
+def _evict(cache_dir: Path, asset_id: str, sha256: str) -> None:
+    """Delete the asset's cache files for other content, then LRU files over the size budget."""
+    stale = re.compile(rf"{re.escape(asset_id)}\.(?!{sha256})[0-9a-f]{{64}}(-[0-9a-f]{{12}})?\.arrow")
+    files = []
+    for path in cache_dir.glob("*.arrow"):
+        try:
+            if stale.fullmatch(path.name):
+                path.unlink()
+                continue
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+
+    max_bytes = int(os.environ.get('ARROW_CACHE_MAX_MB', '8192')) * 1024 * 1024
+    total = sum(size for _, size, _ in files)
+    if max_bytes <= 0 or total <= max_bytes:
+        return
+
+    for _, size, path in sorted(files):
+        path.unlink(missing_ok=True)
+        total -= size
+        if total <= max_bytes:
+            break
+
+
+def load_raw_table(asset_id: str, schema: pa.Schema = None) -> pa.Table:
+    """Load a raw JSON asset (a list of records) as a PyArrow table.
+
+    Decoded once per content hash and schema, then served from a
+    memory-mapped Arrow IPC file.
+
+    Args:
+        asset_id: Identifier for the raw asset
+        schema: Optional explicit schema; fields not in it are dropped and
+            missing ones come back null
+
+    Returns:
+        PyArrow table with one row per record; nested objects become structs
+    """
+    sha256 = get_raw_hash(asset_id)
+    cache_dir = _get_cache_dir()
+    path = cache_dir / _cache_name(asset_id, sha256, schema) if sha256 else None
+
+    if path and path.exists():
+        try:
+            # Bump recency for LRU eviction
+            os.utime(path, None)
+            return read_ipc(path)
+        except FileNotFoundError:
+            # Evicted by another process since the exists() check
+            pass
+
+    content, codec = load_raw_bytes(asset_id)
+    if sha256 is None:
+        # Not in the manifest until this load recorded it; key the cache by what was loaded
+        sha256 = content_hash(content)
+        path = cache_dir / _cache_name(asset_id, sha256, schema)
+        if path.exists():
+            try:
+                os.utime(path, None)
+                return read_ipc(path)
+            except FileNotFoundError:
+                pass
+
+    if codec.startswith("ndjson"):
+        table = _decode_ndjson(content, codec, schema)
+    else:
+        table = pa.Table.from_pylist(_decode_raw_json(content, codec), schema=schema)
+
+    write_ipc(table, path)
+    table = read_ipc(path)
+    _evict(cache_dir, asset_id, sha256)
+    return table
+
+
+def raw_column(table: pa.Table, path: str) -> pa.ChunkedArray:
+    """Get a possibly nested column by dotted path (e.g., 'registrant.name').
+
+    Missing fields come back as all-null, mirroring dict.get() on the raw
+    records; a null parent struct yields null children.
+    """
+    name, *fields = path.split(".")
+    if name not in table.column_names:
+        return pa.chunked_array([pa.nulls(len(table))])
+
+    column = table.column(name)
+    for field in fields:
+        if not pa.types.is_struct(column.type) or column.type.get_field_index(field) < 0:
+            return pa.chunked_array([pa.nulls(len(table))])
+        column = pc.struct_field(column, field)
+    return column
+
+
+def raw_list(table: pa.Table, path: str) -> tuple[pa.Array, pa.Table]:
+    """Explode a list-of-objects column by dotted path (e.g., 'lobbying_activities').
+
+    Returns:
+        (parent row index of each item, table with one row per item). Null or
+        missing lists contribute no items. Use pc.take(column, parents) to
+        repeat parent columns alongside the items.
+    """
+    column = raw_column(table, path)
+    if not pa.types.is_list(column.type):
+        return pa.array([], pa.int64()), pa.table({})
+
+    column = column.combine_chunks()
+    items = pc.list_flatten(column)
+    if not pa.types.is_struct(items.type):
+        return pa.array([], pa.int64()), pa.table({})
+
+    return pc.list_parent_indices(column), pa.Table.from_struct_array(items)
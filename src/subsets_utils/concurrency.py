@@ -0,0 +1,100 @@
+"""Overlapping I/O with compute using background threads.
+
+prefetch() loads the next raw assets while the caller is still working on
+the current one, so R2 latency and decompression overlap with transforms.
+run_concurrently() fans independent I/O calls (uploads, downloads) out over
+a thread pool.
+
+Configuration:
+    PREFETCH_LOOKAHEAD: assets loaded ahead of the one being consumed (default 1)
+    PREFETCH_MAX_MB: stop loading ahead once this much is buffered (default 1024)
+    IO_MAX_WORKERS: threads for run_concurrently (default 8)
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Any
+import pyarrow as pa
+
+
+def _buffered_bytes(value: Any) -> int:
+    """Approximate in-memory size of a loaded asset (0 if unknown)."""
+    if isinstance(value, (pa.Table, pa.RecordBatch)):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return 0
+
+
+def prefetch(asset_ids: Iterable[str], loader: Callable[[str], Any], lookahead: int = None,
+             max_buffered_mb: int = None) -> Iterator[tuple[str, Any]]:
+    """Yield (asset_id, loader(asset_id)) in order, loading ahead in the background.
+
+    While the caller processes asset N, up to `lookahead` following assets are
+    loaded in threads. Loading ahead pauses while the assets that are already
+    loaded but not yet consumed exceed `max_buffered_mb`.
+
+    Args:
+        asset_ids: Asset ids in processing order (may be a lazy iterator)
+        loader: Function loading one asset, e.g. load_raw_table
+        lookahead: Number of assets to load ahead
+        max_buffered_mb: Memory cap for loaded-but-unconsumed assets
+    """
+    if lookahead is None:
+        lookahead = int(os.environ.get('PREFETCH_LOOKAHEAD', '1'))
+    if max_buffered_mb is None:
+        max_buffered_mb = int(os.environ.get('PREFETCH_MAX_MB', '1024'))
+    max_bytes = max_buffered_mb * 1024 * 1024
+
+    ids = iter(asset_ids)
+    pending = deque()
+    exhausted = False
+
+    def buffered() -> int:
+        return sum(_buffered_bytes(f.result()) for _, f in pending if f.done() and not f.exception())
+
+    with ThreadPoolExecutor(max_workers=max(lookahead, 1), thread_name_prefix="prefetch") as executor:
+        try:
+            while True:
+                # Keep the current asset plus `lookahead` more in flight
+                while not exhausted and len(pending) <= lookahead:
+                    if pending and buffered() >= max_bytes:
+                        break
+                    asset_id = next(ids, None)
+                    if asset_id is None:
+                        exhausted = True
+                        break
+                    pending.append((asset_id, executor.submit(loader, asset_id)))
+
+                if not pending:
+                    return
+
+                asset_id, future = pending.popleft()
+                yield asset_id, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def run_concurrently(fn: Callable[[Any], Any], items: Iterable[Any], max_workers: int = None) -> list[tuple[Any, Any, Exception | None]]:
+    """Call fn on every item in a thread pool.
+
+    Returns:
+        List of (item, result, error) in input order; error is None on success
+    """
+    if max_workers is None:
+        max_workers = int(os.environ.get('IO_MAX_WORKERS', '8'))
+
+    items = list(items)
+    if not items:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="io") as executor:
+        futures = [executor.submit(fn, item) for item in items]
+
+    results = []
+    for item, future in zip(items, futures):
+        error = future.exception()
+        results.append((item, None if error else future.result(), error))
+    return results
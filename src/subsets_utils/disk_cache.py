@@ -0,0 +1,136 @@
+"""Bounded local read-through cache for R2 objects.
+
+Each cached object is stored as a content file plus a small JSON entry that
+records the object's ETag and the sha256 of the content. A cached copy is
+served without touching the network when the caller already knows the
+expected hash (e.g., from the raw manifest); otherwise it is revalidated with
+a conditional GET on the ETag, which costs one round-trip and no body.
+
+Content is checked against the entry's sha256 on every read; a copy that
+doesn't match is dropped and reads as a miss. Least recently used entries
+(content file and entry together) are evicted once the cache exceeds its
+size budget. Files are replaced atomically, so threads and worker processes
+can share one cache directory.
+
+Configuration:
+    R2_CACHE_DIR: cache directory (default /tmp/r2_cache)
+    R2_CACHE_MAX_MB: size budget in MB (default 2048, 0 disables the cache)
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Optional
+
+_cache = None
+
+
+class DiskCache:
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha1(key.encode()).hexdigest()}.json"
+
+    def _write_atomic(self, path: Path, data: bytes) -> None:
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _remove(self, content_path: Path) -> None:
+        """Delete a content file and its key's entry, if the entry still points at it."""
+        entry_path = self.cache_dir / f"{content_path.name.split('-')[0]}.json"
+        try:
+            with open(entry_path, 'r') as f:
+                if json.load(f).get("file") == content_path.name:
+                    entry_path.unlink(missing_ok=True)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        content_path.unlink(missing_ok=True)
+
+    def get(self, key: str) -> Optional[tuple[bytes, dict]]:
+        """Return (content, entry) for a cached key, or None on a miss or a corrupt copy."""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'r') as f:
+                entry = json.load(f)
+            content_path = self.cache_dir / entry["file"]
+            with open(content_path, 'rb') as f:
+                content = f.read()
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+
+        if hashlib.sha256(content).hexdigest() != entry.get("sha256"):
+            # Truncated or overwritten on disk; refetch rather than serve it
+            self._remove(content_path)
+            return None
+
+        # Bump recency for LRU eviction
+        os.utime(content_path, None)
+        return content, entry
+
+    def put(self, key: str, content: bytes, etag: str = None) -> dict:
+        """Store content for a key, replacing any previous version."""
+        key_hash = hashlib.sha1(key.encode()).hexdigest()
+        sha256 = hashlib.sha256(content).hexdigest()
+        entry = {
+            "key": key,
+            "etag": etag,
+            "sha256": sha256,
+            "size": len(content),
+            "file": f"{key_hash}-{sha256[:16]}.bin",
+        }
+
+        entry_path = self._entry_path(key)
+        previous = None
+        if entry_path.exists():
+            try:
+                with open(entry_path, 'r') as f:
+                    previous = json.load(f).get("file")
+            except json.JSONDecodeError:
+                pass
+
+        self._write_atomic(self.cache_dir / entry["file"], content)
+        self._write_atomic(entry_path, json.dumps(entry).encode('utf-8'))
+
+        if previous and previous != entry["file"]:
+            (self.cache_dir / previous).unlink(missing_ok=True)
+
+        self.evict()
+        return entry
+
+    def evict(self) -> None:
+        """Delete least recently used entries until under the size budget."""
+        files = []
+        for path in self.cache_dir.glob("*.bin"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(files):
+            self._remove(path)
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+
+def get_disk_cache() -> Optional[DiskCache]:
+    """Get the process-wide R2 disk cache, or None if disabled."""
+    global _cache
+    if _cache is None:
+        max_mb = int(os.environ.get('R2_CACHE_MAX_MB', '2048'))
+        if max_mb <= 0:
+            return None
+        cache_dir = Path(os.environ.get('R2_CACHE_DIR', '/tmp/r2_cache'))
+        _cache = DiskCache(cache_dir, max_mb * 1024 * 1024)
+    return _cache
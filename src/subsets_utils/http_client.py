@@ -6,7 +6,7 @@ import time
 from pathlib import Path
 from typing import Optional, Dict, Union
 from datetime import datetime
-from . import debug
+from . import debug, json_codec
 
 _client = None
 _client_config = {
@@ -34,8 +34,8 @@ class CacheManager:
         
         if metadata_file.exists() and content_file.exists():
             # Load metadata
-            with open(metadata_file, 'r') as f:
-                metadata = json.load(f)
+            with open(metadata_file, 'rb') as f:
+                metadata = json_codec.loads(f.read())
             
             # Load raw content bytes
             with open(content_file, 'rb') as f:
@@ -73,8 +73,8 @@ class CacheManager:
             "cached_at": datetime.now().isoformat()
         }
         
-        with open(metadata_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        with open(metadata_file, 'wb') as f:
+            f.write(json_codec.dumps(metadata, indent=True))
 
 
 class CachedClient:
@@ -3,28 +3,145 @@ import io
 import json
 import gzip
 import uuid
-from datetime import datetime
 from pathlib import Path
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 from deltalake import write_deltalake, DeltaTable
-from . import debug
+from . import debug, json_codec
 from .environment import get_data_dir
-from .r2 import is_cloud_mode, upload_bytes, upload_file, upload_fileobj, download_bytes, get_storage_options, get_delta_table_uri, get_bucket_name, get_connector_name
+from .r2 import is_cloud_mode, upload_bytes, upload_file, upload_fileobj, download_bytes, object_exists, get_storage_options, get_delta_table_uri, get_bucket_name, get_connector_name
+from .manifest import get_raw_entry, raw_entry_path, record_raw_asset
+from .state import get_state_store
 
 
-def upload_data(data: pa.Table, dataset_name: str, metadata: dict = None, mode: str = "append", merge_key: str = None) -> str:
+def decode_dictionaries(table: pa.Table) -> pa.Table:
+    """Cast dictionary-encoded columns back to their value type.
+
+    Transforms keep low-cardinality columns dictionary-encoded in memory;
+    Delta tables store the plain type (Parquet dictionary-encodes the pages
+    itself), so merges and schema evolution see the same types every run.
+    """
+    schema = pa.schema([
+        field.with_type(field.type.value_type) if pa.types.is_dictionary(field.type) else field
+        for field in table.schema
+    ])
+    return table if schema.equals(table.schema) else table.cast(schema)
+
+
+def _open_delta_table(dataset_name: str) -> DeltaTable | None:
+    """The dataset's Delta table, or None if it has not been written yet."""
+    if is_cloud_mode():
+        try:
+            return DeltaTable(get_delta_table_uri(dataset_name), storage_options=get_storage_options())
+        except Exception:
+            return None
+    table_path = Path(get_data_dir()) / "subsets" / dataset_name
+    return DeltaTable(str(table_path)) if table_path.exists() else None
+
+
+def _sql_literal(value) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    text = value.isoformat() if hasattr(value, "isoformat") else str(value)
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _partition_scope(data: pa.Table, partition_by: list[str], partitions: list | None,
+                     alias: str = "") -> tuple[pa.Table, str]:
+    """Rows of data in the given partitions, and a predicate selecting those partitions.
+
+    The predicate is "" when there are no partitions to write. alias
+    qualifies its columns (e.g. "target." in a merge).
+    """
+    if partitions is None:
+        partitions = [tuple(row.values()) for row in data.group_by(partition_by).aggregate([]).to_pylist()]
+
+    mask = None
+    clauses = []
+    for key in partitions:
+        key = key if isinstance(key, tuple) else (key,)
+        match, terms = None, []
+        for column, value in zip(partition_by, key):
+            if value is None:
+                term = pc.is_null(data[column])
+                terms.append(f"{alias}{column} IS NULL")
+            else:
+                term = pc.fill_null(pc.equal(data[column], value), False)
+                terms.append(f"{alias}{column} = {_sql_literal(value)}")
+            match = term if match is None else pc.and_(match, term)
+        mask = match if mask is None else pc.or_(mask, match)
+        clauses.append(" AND ".join(terms))
+
+    if mask is None:
+        return data.slice(0, 0), ""
+    return data.filter(mask), " OR ".join(f"({clause})" for clause in clauses)
+
+
+def _merge(dt: DeltaTable, data: pa.Table, merge_key: list[str], scope: str | None, compare: list[str] | None) -> None:
+    """Upsert data into dt on merge_key in one commit.
+
+    With a scope (a predicate on the target's partitions), only those
+    partitions are read, and their stored rows whose key is not in data are
+    deleted. With compare, a matched row is only rewritten if one of those
+    columns differs.
+    """
+    predicate = " AND ".join(f"target.{key} = source.{key}" for key in merge_key)
+    if scope:
+        predicate = f"{predicate} AND ({scope})"
+    updates = {col: f"source.{col}" for col in data.column_names}
+    differs = " OR ".join(f"target.{col} IS DISTINCT FROM source.{col}" for col in compare) if compare else None
+
+    merger = (
+        dt.merge(source=data, predicate=predicate, source_alias="source", target_alias="target")
+        .when_matched_update(updates=updates, predicate=differs)
+        .when_not_matched_insert(updates=updates)
+    )
+    if scope:
+        merger = merger.when_not_matched_by_source_delete(predicate=scope)
+    metrics = merger.execute()
+    print(f"Merged: {metrics['num_target_rows_inserted']} inserted, {metrics['num_target_rows_updated']} updated, "
+          f"{metrics['num_target_rows_deleted']} deleted")
+
+
+def upload_data(data: pa.Table, dataset_name: str, metadata: dict = None, mode: str = "append",
+                merge_key: str | list[str] = None, partition_by: str | list[str] = None,
+                partitions: list = None, compare: str | list[str] = None) -> str:
     """Upload a PyArrow table to a Delta table.
 
     In local mode: writes to DATA_DIR/subsets/{dataset_name}
     In cloud mode: writes directly to R2 s3://{bucket}/data/subsets/{dataset_name}
 
+    A table written with partition_by stores one directory per partition
+    value. An overwrite of a partitioned table then replaces only the
+    partitions being written, in one atomic commit, and leaves the others as
+    they are. If the stored table is missing or its columns differ, the
+    whole table is rewritten instead; if its partitioning differs, it is
+    first re-created empty with the new layout.
+
+    A merge with partition_by and partitions treats data as the complete
+    contents of those partitions: it upserts data and deletes the stored
+    rows there whose key data no longer has, in one commit, and reads no
+    other partition. If the stored columns or partitioning differ, the
+    table is rewritten in full instead.
+
     Args:
         data: The PyArrow table to upload
         dataset_name: Name of the dataset (used as directory name)
         metadata: Optional metadata dict with keys: title, description, columns
         mode: 'append', 'overwrite', or 'merge'
-        merge_key: Required when mode='merge', the column to merge on
+        merge_key: Required when mode='merge', the column (or columns, for a
+            composite key) to merge on
+        partition_by: Column (or columns) to partition a new or rewritten table by
+        partitions: With partition_by, the partition values to replace
+            (tuples for several columns; default for 'overwrite': every value
+            in data; a 'merge' without partitions deletes nothing). Rows of
+            data in other partitions are only written when the whole table
+            is rewritten
+        compare: With mode='merge', only rewrite a stored row if one of these
+            columns (e.g. a row hash) differs; default rewrites every matched row
     """
     if mode not in ("append", "overwrite", "merge"):
         raise ValueError(f"Invalid mode '{mode}'. Must be 'append', 'overwrite', or 'merge'.")
@@ -32,17 +149,50 @@ def upload_data(data: pa.Table, dataset_name: str, metadata: dict = None, mode:
     if mode == "merge" and not merge_key:
         raise ValueError("merge_key is required when mode='merge'")
 
-    if mode == "overwrite":
-        print(f"⚠️  Warning: Overwriting {dataset_name} - all existing data will be replaced")
+    if isinstance(merge_key, str):
+        merge_key = [merge_key]
+    if isinstance(compare, str):
+        compare = [compare]
+    if isinstance(partition_by, str):
+        partition_by = [partition_by]
 
     if len(data) == 0:
         print(f"No data to upload for {dataset_name}")
         return ""
 
+    data = decode_dictionaries(data)
+
+    predicate = None
+    if partition_by and (mode == "overwrite" or (mode == "merge" and partitions is not None)):
+        dt = _open_delta_table(dataset_name)
+        if mode == "merge" and dt is not None and (dt.metadata().partition_columns != partition_by
+                                                   or pa.schema(dt.schema()).names != data.column_names):
+            # A merge scoped to some partitions needs the stored layout; write the whole table instead
+            mode = "overwrite"
+        if mode == "overwrite" and dt is not None and dt.metadata().partition_columns != partition_by:
+            # A write cannot change a table's partitioning, so start a new table version with the new layout
+            print(f"Repartitioning {dataset_name} by {', '.join(partition_by)}")
+            DeltaTable.create(dt.table_uri, schema=data.schema, mode="overwrite", partition_by=partition_by,
+                              storage_options=get_storage_options() if is_cloud_mode() else None)
+        elif dt is not None and pa.schema(dt.schema()).names == data.column_names:
+            data, predicate = _partition_scope(data, partition_by, partitions, "target." if mode == "merge" else "")
+            if not predicate:
+                print(f"No partitions of {dataset_name} to rewrite")
+                return ""
+
+    if mode == "overwrite" and predicate is None:
+        print(f"⚠️  Warning: Overwriting {dataset_name} - all existing data will be replaced")
+
     size_mb = round(data.nbytes / 1024 / 1024, 2)
     columns = ', '.join([f.name for f in data.schema])
     mode_label = {"append": "Appending to", "overwrite": "Overwriting", "merge": "Merging into"}[mode]
-    print(f"{mode_label} {dataset_name}: {len(data)} rows, {len(data.schema)} cols ({columns}), {size_mb} MB")
+    where = f" where {predicate}" if predicate else ""
+    print(f"{mode_label} {dataset_name}{where}: {len(data)} rows, {len(data.schema)} cols ({columns}), {size_mb} MB")
+
+    # A partition-scoped overwrite keeps the stored schema; full rewrites may replace it
+    schema_mode = "merge" if mode == "append" else None if predicate else "overwrite"
+    scope = predicate if mode == "merge" else None
+    predicate = None if mode == "merge" else predicate
 
     # Extract metadata for Delta table
     table_name = metadata.get("title") if metadata else None
@@ -56,28 +206,19 @@ def upload_data(data: pa.Table, dataset_name: str, metadata: dict = None, mode:
         if mode == "merge":
             try:
                 dt = DeltaTable(table_uri, storage_options=storage_options)
-                updates = {col: f"source.{col}" for col in data.column_names}
-                (
-                    dt.merge(
-                        source=data,
-                        predicate=f"target.{merge_key} = source.{merge_key}",
-                        source_alias="source",
-                        target_alias="target"
-                    )
-                    .when_matched_update(updates=updates)
-                    .when_not_matched_insert(updates=updates)
-                    .execute()
-                )
-                result = dt.to_pyarrow_table()
-                print(f"Merged: table now has {len(result)} total rows")
             except Exception:
+                dt = None
+            if dt is not None:
+                _merge(dt, data, merge_key, scope, compare)
+            else:
                 # Table doesn't exist, create it
                 write_deltalake(
                     table_uri,
                     data,
                     storage_options=storage_options,
                     name=table_name,
-                    description=table_description
+                    description=table_description,
+                    partition_by=partition_by
                 )
                 print(f"Created new table {dataset_name}")
         else:
@@ -88,7 +229,9 @@ def upload_data(data: pa.Table, dataset_name: str, metadata: dict = None, mode:
                 storage_options=storage_options,
                 name=table_name,
                 description=table_description,
-                schema_mode="merge" if mode == "append" else "overwrite"
+                partition_by=partition_by,
+                predicate=predicate,
+                schema_mode=schema_mode
             )
 
         output_path = table_uri
@@ -98,24 +241,11 @@ def upload_data(data: pa.Table, dataset_name: str, metadata: dict = None, mode:
 
         if mode == "merge":
             if not table_path.exists():
-                write_deltalake(str(table_path), data, name=table_name, description=table_description)
+                write_deltalake(str(table_path), data, name=table_name, description=table_description,
+                                partition_by=partition_by)
                 print(f"Created new table {dataset_name}")
             else:
-                dt = DeltaTable(str(table_path))
-                updates = {col: f"source.{col}" for col in data.column_names}
-                (
-                    dt.merge(
-                        source=data,
-                        predicate=f"target.{merge_key} = source.{merge_key}",
-                        source_alias="source",
-                        target_alias="target"
-                    )
-                    .when_matched_update(updates=updates)
-                    .when_not_matched_insert(updates=updates)
-                    .execute()
-                )
-                result = dt.to_pyarrow_table()
-                print(f"Merged: table now has {len(result)} total rows")
+                _merge(DeltaTable(str(table_path)), data, merge_key, scope, compare)
         else:
             write_deltalake(
                 str(table_path),
@@ -123,7 +253,9 @@ def upload_data(data: pa.Table, dataset_name: str, metadata: dict = None, mode:
                 mode=mode,
                 name=table_name,
                 description=table_description,
-                schema_mode="merge" if mode == "append" else "overwrite"
+                partition_by=partition_by,
+                predicate=predicate,
+                schema_mode=schema_mode
             )
 
         output_path = str(table_path)
@@ -152,21 +284,10 @@ def load_state(asset: str) -> dict:
 
     In local mode: reads from DATA_DIR/state/{asset}.json (mirrors R2 structure)
     In cloud mode: reads from R2 {connector}/data/state/{asset}.json
-    """
-    if is_cloud_mode():
-        connector = get_connector_name()
-        key = f"{connector}/data/state/{asset}.json"
-        data = download_bytes(key)
-        if data is None:
-            return {}
-        return json.loads(data.decode('utf-8'))
-    else:
-        state_file = Path(get_data_dir()) / "state" / f"{asset}.json"
 
-        if state_file.exists():
-            with open(state_file, 'r') as f:
-                return json.load(f)
-        return {}
+    Read once per process, then served from the in-memory state store.
+    """
+    return get_state_store().load(asset)
 
 
 def save_state(asset: str, state_data: dict) -> str:
@@ -174,34 +295,11 @@ def save_state(asset: str, state_data: dict) -> str:
 
     In local mode: writes to DATA_DIR/state/{asset}.json (mirrors R2 structure)
     In cloud mode: writes to R2 {connector}/data/state/{asset}.json
-    """
-    # Load old state for comparison (for debug logging)
-    old_state = load_state(asset)
-
-    # Add metadata to state
-    state_data = state_data.copy()
-    state_data['_metadata'] = {
-        'updated_at': datetime.now().isoformat(),
-        'run_id': os.environ.get('RUN_ID', 'unknown')
-    }
-
-    if is_cloud_mode():
-        connector = get_connector_name()
-        key = f"{connector}/data/state/{asset}.json"
-        data = json.dumps(state_data, indent=2).encode('utf-8')
-        uri = upload_bytes(data, key)
-        debug.log_state_change(asset, old_state, state_data)
-        return uri
-    else:
-        state_dir = Path(get_data_dir()) / "state"
-        state_dir.mkdir(parents=True, exist_ok=True)
-
-        state_file = state_dir / f"{asset}.json"
-        with open(state_file, 'w') as f:
-            json.dump(state_data, f, indent=2)
 
-        debug.log_state_change(asset, old_state, state_data)
-        return str(state_file)
+    Cloud writes are batched and ETag-conditional; call flush_state() to force
+    pending saves out (also done at exit).
+    """
+    return get_state_store().save(asset, state_data)
 
 
 def has_changed(new_data: pa.Table, asset_name: str) -> bool:
@@ -263,7 +361,7 @@ def has_changed(new_data: pa.Table, asset_name: str) -> bool:
             return True
 
 
-def load_asset(asset_name: str) -> pa.Table:
+def load_asset(asset_name: str, columns: list[str] = None, filters: pc.Expression = None) -> pa.Table:
     """Load a previously saved asset from Delta table.
 
     In local mode: reads from DATA_DIR/subsets/{asset_name}
@@ -271,6 +369,8 @@ def load_asset(asset_name: str) -> pa.Table:
 
     Args:
         asset_name: The dataset/asset name (e.g., 'indicators', 'series')
+        columns: Only read these columns (default: all)
+        filters: Only read rows matching this expression (e.g. pc.field("id").isin(ids))
 
     Returns:
         pa.Table: The loaded PyArrow table
@@ -284,7 +384,7 @@ def load_asset(asset_name: str) -> pa.Table:
 
         try:
             dt = DeltaTable(table_uri, storage_options=storage_options)
-            return dt.to_pyarrow_table()
+            return dt.to_pyarrow_table(columns=columns, filters=filters)
         except Exception as e:
             raise FileNotFoundError(f"No Delta table found at {table_uri}") from e
     else:
@@ -294,7 +394,39 @@ def load_asset(asset_name: str) -> pa.Table:
             raise FileNotFoundError(f"No Delta table found at {table_path}")
 
         dt = DeltaTable(str(table_path))
-        return dt.to_pyarrow_table()
+        return dt.to_pyarrow_table(columns=columns, filters=filters)
+
+
+def load_asset_partitioning(asset_name: str) -> list[str]:
+    """Partition columns of a previously saved Delta table ([] if unpartitioned).
+
+    Raises:
+        FileNotFoundError: If no Delta table found
+    """
+    dt = _open_delta_table(asset_name)
+    if dt is None:
+        raise FileNotFoundError(f"No Delta table found for {asset_name}")
+    return dt.metadata().partition_columns
+
+
+def load_asset_schema(asset_name: str) -> pa.Schema:
+    """Schema of a previously saved Delta table, read from its log without scanning data.
+
+    Raises:
+        FileNotFoundError: If no Delta table found
+    """
+    if is_cloud_mode():
+        table_uri = get_delta_table_uri(asset_name)
+        try:
+            dt = DeltaTable(table_uri, storage_options=get_storage_options())
+        except Exception as e:
+            raise FileNotFoundError(f"No Delta table found at {table_uri}") from e
+    else:
+        table_path = Path(get_data_dir()) / "subsets" / asset_name
+        if not table_path.exists():
+            raise FileNotFoundError(f"No Delta table found at {table_path}")
+        dt = DeltaTable(str(table_path))
+    return pa.schema(dt.schema())
 
 
 def _get_raw_path(asset_id: str, extension: str) -> Path:
@@ -310,6 +442,14 @@ def _get_raw_r2_key(asset_id: str, extension: str) -> str:
     return f"{connector}/data/raw/{asset_id}.{extension}"
 
 
+def _get_raw_sha256(asset_id: str, key: str) -> str | None:
+    """Manifest hash for a raw asset, if the manifest entry refers to this key."""
+    entry = get_raw_entry(asset_id)
+    if entry and entry["key"] == key:
+        return entry["sha256"]
+    return None
+
+
 def save_raw_file(content: str | bytes, asset_id: str, extension: str = "txt") -> str:
     """Generic raw saver for CSV, XML, ZIP, etc.
 
@@ -321,25 +461,21 @@ def save_raw_file(content: str | bytes, asset_id: str, extension: str = "txt") -
         asset_id: The identifier for the asset
         extension: File extension (e.g., 'csv', 'xml', 'zip')
     """
+    data = content.encode('utf-8') if isinstance(content, str) else content
+
     if is_cloud_mode():
         key = _get_raw_r2_key(asset_id, extension)
-        if isinstance(content, str):
-            data = content.encode('utf-8')
-        else:
-            data = content
         uri = upload_bytes(data, key)
+        record_raw_asset(asset_id, key, extension, data)
         print(f"  -> R2: Saved {asset_id}.{extension}")
         return uri
     else:
         path = _get_raw_path(asset_id, extension)
 
-        if isinstance(content, str):
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
-        else:
-            with open(path, 'wb') as f:
-                f.write(content)
+        with open(path, 'wb') as f:
+            f.write(data)
 
+        record_raw_asset(asset_id, str(path), extension, data)
         print(f"  -> Raw Cache: Saved {asset_id}.{extension}")
         return str(path)
 
@@ -352,7 +488,7 @@ def load_raw_file(asset_id: str, extension: str = "txt") -> str | bytes:
     """
     if is_cloud_mode():
         key = _get_raw_r2_key(asset_id, extension)
-        data = download_bytes(key)
+        data = download_bytes(key, sha256=_get_raw_sha256(asset_id, key))
         if data is None:
             raise FileNotFoundError(f"Raw asset '{asset_id}.{extension}' not found in R2.")
 
@@ -374,82 +510,133 @@ def load_raw_file(asset_id: str, extension: str = "txt") -> str | bytes:
                 return f.read()
 
 
-def save_raw_json(data: any, asset_id: str, compress: bool = False) -> str:
+RAW_JSON_CODECS = ("json", "json.gz", "ndjson", "ndjson.gz")
+
+
+def _encode_raw_json(data: any, compress: bool, ndjson: bool = False) -> bytes:
+    """Serialize raw JSON to the exact bytes that get stored.
+
+    Compressed output uses a fixed gzip mtime so identical data always hashes
+    to the same manifest checksum.
+    """
+    if ndjson:
+        content = b"".join(json_codec.dumps(record) + b"\n" for record in data)
+    elif compress:
+        content = json_codec.dumps(data)
+    else:
+        content = json_codec.dumps(data, indent=True)
+    return gzip.compress(content, mtime=0) if compress else content
+
+
+def _decode_raw_json(content: bytes, codec: str) -> any:
+    if codec.endswith(".gz"):
+        content = gzip.decompress(content)
+    if codec.startswith("ndjson"):
+        return [json_codec.loads(line) for line in content.splitlines() if line.strip()]
+    return json_codec.loads(content)
+
+
+def save_raw_json(data: any, asset_id: str, compress: bool = False, source: dict = None, ndjson: bool = False) -> str:
     """Save raw JSON data. Accepts Dict or List.
 
     In local mode: writes to DATA_DIR/raw/{asset_id}.json[.gz]
     In cloud mode: uploads directly to R2 (no disk write)
 
     Use compress=True for massive datasets to save storage space.
+    Use ndjson=True to store a list of records one per line (.ndjson[.gz]),
+    which load_raw_table parses natively with pyarrow.json.
+    Pass source (e.g., the API url and params) to record it in the manifest.
     """
-    ext = "json.gz" if compress else "json"
+    if ndjson and not isinstance(data, list):
+        raise ValueError("ndjson=True requires a list of records")
+
+    ext = ("ndjson" if ndjson else "json") + (".gz" if compress else "")
+    content = _encode_raw_json(data, compress, ndjson)
+    record_count = len(data) if isinstance(data, list) else 1
 
     if is_cloud_mode():
         key = _get_raw_r2_key(asset_id, ext)
-        if compress:
-            buffer = io.BytesIO()
-            with gzip.GzipFile(fileobj=buffer, mode='wb') as gz:
-                with io.TextIOWrapper(gz, encoding='utf-8') as f:
-                    json.dump(data, f)
-            content = buffer.getvalue()
-        else:
-            content = json.dumps(data, indent=2).encode('utf-8')
-
         uri = upload_bytes(content, key)
+        record_raw_asset(asset_id, key, ext, content, record_count=record_count, source=source)
         print(f"  -> R2: Saved {asset_id}.{ext}")
         return uri
     else:
         path = _get_raw_path(asset_id, ext)
 
-        if compress:
-            with gzip.open(path, 'wt', encoding='utf-8') as f:
-                json.dump(data, f)
-        else:
-            with open(path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+        with open(path, 'wb') as f:
+            f.write(content)
 
+        record_raw_asset(asset_id, str(path), ext, content, record_count=record_count, source=source)
         print(f"  -> Raw Cache: Saved {asset_id}.{ext}")
         return str(path)
 
 
-def load_raw_json(asset_id: str) -> any:
-    """Load raw JSON data. Auto-detects compression.
+def load_raw_bytes(asset_id: str) -> tuple[bytes, str]:
+    """Load the stored bytes of a raw JSON asset without decoding them.
 
-    In local mode: reads from DATA_DIR/raw/{asset_id}.json[.gz]
-    In cloud mode: downloads from R2
+    Resolves the key and codec from the raw manifest; assets without an entry
+    (written before the manifest existed, or by a run that died before
+    flushing it) fall back to probing each JSON codec's file name, and the
+    asset found is recorded in the manifest so later loads, content hashes
+    and caches see it like any other.
+
+    Returns:
+        (content, codec), e.g. (b'...', 'ndjson.gz')
     """
+    entry = get_raw_entry(asset_id)
+
     if is_cloud_mode():
-        # Try uncompressed first
-        key = _get_raw_r2_key(asset_id, "json")
-        data = download_bytes(key)
-        if data is not None:
-            return json.loads(data.decode('utf-8'))
-
-        # Try compressed
-        key = _get_raw_r2_key(asset_id, "json.gz")
-        data = download_bytes(key)
-        if data is not None:
-            with gzip.GzipFile(fileobj=io.BytesIO(data), mode='rb') as gz:
-                with io.TextIOWrapper(gz, encoding='utf-8') as f:
-                    return json.load(f)
+        if entry:
+            data = download_bytes(entry["key"], sha256=entry["sha256"])
+            if data is not None:
+                return data, entry["codec"]
+
+        for ext in RAW_JSON_CODECS:
+            key = _get_raw_r2_key(asset_id, ext)
+            data = download_bytes(key)
+            if data is not None:
+                record_raw_asset(asset_id, key, ext, data)
+                return data, ext
 
         raise FileNotFoundError(f"Raw asset '{asset_id}' not found in R2.")
     else:
-        # Try uncompressed first
-        path = _get_raw_path(asset_id, "json")
-        if path.exists():
-            with open(path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-
-        # Try compressed
-        path = _get_raw_path(asset_id, "json.gz")
-        if path.exists():
-            with gzip.open(path, 'rt', encoding='utf-8') as f:
-                return json.load(f)
+        if entry and raw_entry_path(entry).exists():
+            with open(raw_entry_path(entry), 'rb') as f:
+                return f.read(), entry["codec"]
+
+        for ext in RAW_JSON_CODECS:
+            path = _get_raw_path(asset_id, ext)
+            if path.exists():
+                with open(path, 'rb') as f:
+                    data = f.read()
+                record_raw_asset(asset_id, str(path), ext, data)
+                return data, ext
 
         raise FileNotFoundError(f"Raw asset '{asset_id}' not found.")
 
 
+def raw_asset_exists(asset_id: str) -> bool:
+    """Whether a raw JSON asset is stored, with or without a manifest entry.
+
+    Probes the same file names as load_raw_bytes without downloading anything.
+    """
+    if get_raw_entry(asset_id):
+        return True
+    if is_cloud_mode():
+        return any(object_exists(_get_raw_r2_key(asset_id, ext)) for ext in RAW_JSON_CODECS)
+    return any((Path(get_data_dir()) / "raw" / f"{asset_id}.{ext}").exists() for ext in RAW_JSON_CODECS)
+
+
+def load_raw_json(asset_id: str) -> any:
+    """Load raw JSON data. Auto-detects compression and NDJSON.
+
+    In local mode: reads from DATA_DIR/raw/{asset_id}.json[.gz]
+    In cloud mode: downloads from R2
+    """
+    content, codec = load_raw_bytes(asset_id)
+    return _decode_raw_json(content, codec)
+
+
 def save_raw_parquet(data: pa.Table, asset_id: str, metadata: dict = None) -> str:
     """Save raw PyArrow table as Parquet with optional metadata.
 
@@ -478,6 +665,8 @@ def save_raw_parquet(data: pa.Table, asset_id: str, metadata: dict = None) -> st
             pq.write_table(data, temp_path, compression='snappy')
             key = _get_raw_r2_key(asset_id, "parquet")
             uri = upload_file(temp_path, key)
+            with open(temp_path, 'rb') as f:
+                record_raw_asset(asset_id, key, "parquet", f.read(), record_count=data.num_rows)
             print(f"  -> R2: Saved {asset_id}.parquet ({data.num_rows:,} rows)")
             return uri
         finally:
@@ -487,6 +676,8 @@ def save_raw_parquet(data: pa.Table, asset_id: str, metadata: dict = None) -> st
     else:
         path = _get_raw_path(asset_id, "parquet")
         pq.write_table(data, path, compression='snappy')
+        with open(path, 'rb') as f:
+            record_raw_asset(asset_id, str(path), "parquet", f.read(), record_count=data.num_rows)
         print(f"  -> Raw Cache: Saved {asset_id}.parquet ({data.num_rows:,} rows)")
         return str(path)
 
@@ -505,7 +696,7 @@ def load_raw_parquet(asset_id: str) -> pa.Table:
     """
     if is_cloud_mode():
         key = _get_raw_r2_key(asset_id, "parquet")
-        data = download_bytes(key)
+        data = download_bytes(key, sha256=_get_raw_sha256(asset_id, key))
         if data is None:
             raise FileNotFoundError(f"Raw parquet asset '{asset_id}' not found in R2")
 
@@ -0,0 +1,159 @@
+"""Pluggable JSON codec.
+
+Uses the fastest installed backend (orjson, then msgspec) and falls back to
+the stdlib json module. All backends take str or bytes for decoding and
+return UTF-8 bytes from encoding, so callers don't care which one is active.
+
+Every backend encodes the same object to the same bytes, so content hashes
+(the raw manifest, memo fingerprints) don't depend on which one is
+installed. The stdlib backend follows orjson and msgspec: no spaces after
+separators in compact output, non-ASCII text unescaped, NaN and infinities
+as null, and floats in their exponent style (1e16, 1e-7, 0.00001).
+
+Configuration:
+    JSON_CODEC: force a backend ('orjson', 'msgspec' or 'json')
+
+Usage:
+    from subsets_utils import json_codec
+
+    data = json_codec.loads(response.content)
+    payload = json_codec.dumps(state, indent=True)
+"""
+
+import os
+import json
+import math
+
+PREFERENCE = ["orjson", "msgspec", "json"]
+
+_backend = None
+
+
+class Backend:
+    """A JSON implementation exposing loads(data) and dumps(obj, indent, sort_keys) -> bytes."""
+
+    def __init__(self, name: str, loads, dumps):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+
+def _make_orjson() -> Backend:
+    import orjson
+
+    def dumps(obj, indent: bool = False, sort_keys: bool = False) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+
+    return Backend("orjson", orjson.loads, dumps)
+
+
+def _make_msgspec() -> Backend:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    sorted_encoder = msgspec.json.Encoder(order="sorted")
+
+    def dumps(obj, indent: bool = False, sort_keys: bool = False) -> bytes:
+        data = (sorted_encoder if sort_keys else encoder).encode(obj)
+        return msgspec.json.format(data, indent=2) if indent else data
+
+    return Backend("msgspec", msgspec.json.decode, dumps)
+
+
+def _float_text(value: float) -> str:
+    """A float as orjson and msgspec write it."""
+    if math.isnan(value) or math.isinf(value):
+        return "null"
+    text = float.__repr__(value)
+    if "e" not in text:
+        return text
+    mantissa, exponent = text.split("e")
+    if int(exponent) == -5:
+        # Written out in full down to 1e-5, where repr switches to an exponent at 1e-4
+        sign, digits = ("-", mantissa[1:]) if mantissa.startswith("-") else ("", mantissa)
+        return f"{sign}0.0000{digits.replace('.', '')}"
+    return f"{mantissa}e{int(exponent)}"
+
+
+class _StdlibEncoder(json.JSONEncoder):
+    """The pure-Python stdlib encoder, writing floats with _float_text."""
+
+    def iterencode(self, o, _one_shot=False):
+        markers = {} if self.check_circular else None
+        return json.encoder._make_iterencode(
+            markers, self.default, json.encoder.py_encode_basestring, self.indent, _float_text,
+            self.key_separator, self.item_separator, self.sort_keys, self.skipkeys, _one_shot,
+        )(o, 0)
+
+
+def _make_stdlib() -> Backend:
+    def dumps(obj, indent: bool = False, sort_keys: bool = False) -> bytes:
+        options = {
+            "indent": 2 if indent else None,
+            "separators": (",", ": ") if indent else (",", ":"),
+            "sort_keys": sort_keys,
+            "ensure_ascii": False,
+        }
+        try:
+            text = json.dumps(obj, allow_nan=False, **options)
+        except ValueError:
+            # NaN or an infinity, which the fast encoder can't write as null
+            text = None
+        # The fast encoder writes floats with repr(); redo the rare payloads where that differs
+        if text is None or "e+" in text or "e-0" in text:
+            text = _StdlibEncoder(**options).encode(obj)
+        return text.encode('utf-8')
+
+    return Backend("json", json.loads, dumps)
+
+
+_FACTORIES = {
+    "orjson": _make_orjson,
+    "msgspec": _make_msgspec,
+    "json": _make_stdlib,
+}
+
+
+def available_backends() -> list[str]:
+    """Names of the backends importable in this environment, fastest first."""
+    available = []
+    for name in PREFERENCE:
+        try:
+            _FACTORIES[name]()
+            available.append(name)
+        except ImportError:
+            pass
+    return available
+
+
+def get_backend(name: str = None) -> Backend:
+    """Get a backend by name, or the active one (JSON_CODEC or fastest installed)."""
+    global _backend
+
+    if name:
+        if name not in _FACTORIES:
+            raise ValueError(f"Unknown JSON codec '{name}'. Must be one of {PREFERENCE}.")
+        return _FACTORIES[name]()
+
+    if _backend is None:
+        forced = os.environ.get('JSON_CODEC')
+        if forced:
+            _backend = get_backend(forced)
+        else:
+            _backend = get_backend(available_backends()[0])
+    return _backend
+
+
+def loads(data: str | bytes):
+    """Decode JSON from str or bytes."""
+    return get_backend().loads(data)
+
+
+def dumps(obj, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Encode an object as UTF-8 JSON bytes."""
+    return get_backend().dumps(obj, indent=indent, sort_keys=sort_keys)
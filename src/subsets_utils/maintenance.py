@@ -0,0 +1,216 @@
+"""Delta table maintenance: compaction, Z-ordering, checkpoints and vacuum.
+
+Every upload_data call adds data files and a commit to the transaction log,
+so tables that are merged into or partially overwritten run after run
+accumulate small files and a long log, and get slower to open and scan.
+maintain() brings a table back into shape:
+
+1. Compacts the partitions that hold more than one small file (under half
+   the target size) into files of about the target size, Z-ordered by the
+   requested columns that the table has (partition columns are skipped;
+   they are already clustered). Partitions whose files are all at about
+   the target size, or that were compacted by the same columns after
+   their last write, are left alone
+2. Vacuums data files that left the table more than the retention ago
+3. If the table has commits since its last checkpoint (new writes, the
+   compaction or the vacuum), writes a log checkpoint and drops log
+   entries past the log retention
+
+and reports how the table's file count and size changed. Each compaction
+commit records the columns and partitions it covered, so the next run can
+tell which partitions are still clustered.
+
+Usage:
+    from subsets_utils.maintenance import maintain_tables
+
+    maintain_tables(["lda_filings", "lda_lobbying_activities"],
+                    z_order_by=["filing_year", "client_id", "issue_code"])
+
+Configuration:
+    DELTA_TARGET_FILE_MB: target size of compacted files (default 128)
+    DELTA_VACUUM_RETENTION_HOURS: how long removed files are kept for readers
+        of older versions before vacuum deletes them (default 168, the
+        minimum; readers and writers of a version can't have its files
+        deleted under them)
+"""
+
+import os
+import json
+from collections import Counter
+import pyarrow as pa
+import pyarrow.compute as pc
+from pathlib import Path
+from deltalake import CommitProperties, DeltaTable
+from .environment import get_data_dir
+from .io import _open_delta_table
+from .r2 import is_cloud_mode, get_connector_name, download_bytes_with_etag
+
+MIN_RETENTION_HOURS = 168
+
+# Commit metadata key recording the columns and partitions a compaction clustered
+_CLUSTERED_BY = "clusteredBy"
+
+
+def _add_actions(dt: DeltaTable) -> pa.RecordBatch:
+    """One row per data file of the table's current version."""
+    return pa.record_batch(dt.get_add_actions(flatten=True))
+
+
+def _file_stats(dt: DeltaTable) -> tuple[int, int]:
+    """(file count, bytes) of the table's current version."""
+    actions = _add_actions(dt)
+    return actions.num_rows, pc.sum(actions.column("size_bytes")).as_py() or 0
+
+
+def _partition_keys(actions: pa.RecordBatch, partition_columns: list[str]) -> list[tuple]:
+    """Partition values of each file, as tuples of strings; () for an unpartitioned table."""
+    if partition_columns:
+        keys = zip(*(actions.column(f"partition.{column}").to_pylist() for column in partition_columns))
+    else:
+        keys = [()] * actions.num_rows
+    return [tuple(None if value is None else str(value) for value in key) for key in keys]
+
+
+def _last_clustered(dt: DeltaTable, columns: list[str]) -> dict[tuple, int]:
+    """Commit time (ms) of the last compaction that clustered each partition by these columns."""
+    clustered = {}
+    for commit in dt.history():
+        if _CLUSTERED_BY not in commit:
+            continue
+        recorded = json.loads(commit[_CLUSTERED_BY])
+        if recorded["columns"] == columns:
+            for key in recorded["partitions"]:
+                # History is newest first
+                clustered.setdefault(tuple(key), commit["timestamp"])
+    return clustered
+
+
+def _partitions_to_compact(dt: DeltaTable, partition_columns: list[str], columns: list[str],
+                           target_size: int) -> tuple[list[tuple], list[tuple]]:
+    """Partitions holding more than one small file and written since they were last clustered by these columns.
+
+    Returns:
+        (those partitions, every partition of the table)
+    """
+    actions = _add_actions(dt)
+    keys = _partition_keys(actions, partition_columns)
+    small = pc.less(actions.column("size_bytes"), target_size // 2).to_pylist()
+    small_files = Counter(key for key, is_small in zip(keys, small) if is_small)
+
+    last_write = {}
+    for key, modified in zip(keys, actions.column("modification_time").to_pylist()):
+        last_write[key] = max(last_write.get(key, modified), modified)
+    clustered = _last_clustered(dt, columns)
+
+    compact = [key for key, count in small_files.items() if count > 1 and last_write[key] > clustered.get(key, -1)]
+    return compact, list(last_write)
+
+
+def _last_checkpoint(dataset_name: str) -> int | None:
+    """Version of the table's last log checkpoint, or None if it has none."""
+    name = f"{dataset_name}/_delta_log/_last_checkpoint"
+    if is_cloud_mode():
+        data, _ = download_bytes_with_etag(f"{get_connector_name()}/data/subsets/{name}")
+    else:
+        path = Path(get_data_dir()) / "subsets" / name
+        data = path.read_bytes() if path.exists() else None
+    return json.loads(data)["version"] if data else None
+
+
+def _format_mb(size: int) -> str:
+    return f"{size / 1024 / 1024:.2f} MB"
+
+
+def maintain(dataset_name: str, z_order_by: list[str] = None, target_file_mb: int = None,
+             retention_hours: int = None) -> dict | None:
+    """Compact, cluster, checkpoint and vacuum one Delta table.
+
+    Args:
+        dataset_name: Name of the dataset
+        z_order_by: Columns to cluster compacted files by; ones the table lacks
+            or is partitioned by are ignored
+        target_file_mb: Target size of compacted files
+        retention_hours: Age past which removed files are vacuumed
+
+    Returns:
+        Dict with files_before, files_after, bytes_before, bytes_after,
+        compacted (partitions rewritten) and vacuumed (files deleted), or
+        None if the table does not exist
+
+    Raises:
+        ValueError: If retention_hours is below MIN_RETENTION_HOURS
+    """
+    if target_file_mb is None:
+        target_file_mb = int(os.environ.get('DELTA_TARGET_FILE_MB', '128'))
+    if retention_hours is None:
+        retention_hours = int(os.environ.get('DELTA_VACUUM_RETENTION_HOURS', str(MIN_RETENTION_HOURS)))
+    if retention_hours < MIN_RETENTION_HOURS:
+        raise ValueError(f"Vacuum retention of {retention_hours} hours is below the minimum of {MIN_RETENTION_HOURS}")
+
+    dt = _open_delta_table(dataset_name)
+    if dt is None:
+        print(f"  {dataset_name}: no table, skipping")
+        return None
+
+    files_before, bytes_before = _file_stats(dt)
+    partition_columns = dt.metadata().partition_columns
+    names = pa.schema(dt.schema()).names
+    columns = [column for column in z_order_by or [] if column in names and column not in partition_columns]
+
+    target_size = target_file_mb * 1024 * 1024
+    compact, partitions = _partitions_to_compact(dt, partition_columns, columns, target_size)
+    if compact:
+        # Rewrite only those partitions where a single-column filter can select them, else the whole table
+        filters = None
+        if len(partition_columns) == 1 and None not in (key[0] for key in compact):
+            filters = [(partition_columns[0], "in", [key[0] for key in compact])]
+        covered = compact if filters else partitions
+        commit = CommitProperties(custom_metadata={_CLUSTERED_BY: json.dumps({"columns": columns, "partitions": covered})})
+        if columns:
+            dt.optimize.z_order(columns, partition_filters=filters, target_size=target_size, commit_properties=commit)
+        else:
+            dt.optimize.compact(partition_filters=filters, target_size=target_size, commit_properties=commit)
+
+    vacuumed = dt.vacuum(retention_hours=retention_hours, dry_run=False)
+
+    # After the vacuum, so the checkpoint covers its commits and an idle table needs none next run
+    checkpointed = dt.version() != _last_checkpoint(dataset_name)
+    if checkpointed:
+        dt.create_checkpoint()
+        dt.cleanup_metadata()
+
+    files_after, bytes_after = _file_stats(dt)
+    clustered = f", z-ordered by {', '.join(columns)}" if compact and columns else ""
+    print(f"  {dataset_name}: {files_before} files ({_format_mb(bytes_before)}) -> "
+          f"{files_after} files ({_format_mb(bytes_after)}), {len(compact)} of {len(partitions)} partitions "
+          f"compacted{clustered}; vacuumed {len(vacuumed)} files" + ("; checkpointed" if checkpointed else ""))
+
+    return {
+        "files_before": files_before,
+        "files_after": files_after,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+        "compacted": len(compact),
+        "vacuumed": len(vacuumed),
+    }
+
+
+def maintain_tables(dataset_names: list[str], z_order_by: list[str] = None, target_file_mb: int = None,
+                    retention_hours: int = None) -> dict[str, dict]:
+    """Run maintain() on each table and print the totals.
+
+    Returns:
+        Dict of dataset_name -> maintain() report, for tables that exist
+    """
+    reports = {}
+    for dataset_name in dataset_names:
+        report = maintain(dataset_name, z_order_by, target_file_mb, retention_hours)
+        if report:
+            reports[dataset_name] = report
+
+    totals = {key: sum(report[key] for report in reports.values())
+              for key in ("files_before", "files_after", "bytes_before", "bytes_after", "compacted", "vacuumed")}
+    print(f"  Total: {totals['files_before']} files ({_format_mb(totals['bytes_before'])}) -> "
+          f"{totals['files_after']} files ({_format_mb(totals['bytes_after'])}), {totals['compacted']} partitions "
+          f"compacted; vacuumed {totals['vacuumed']} files")
+    return reports
@@ -0,0 +1,230 @@
+"""Raw asset manifest.
+
+One JSON document per connector recording what each raw asset contains
+without having to download it: storage key, codec, byte size, record count,
+content hash and the source query that produced it.
+
+In local mode: DATA_DIR/raw/_manifest.json, keys relative to DATA_DIR/raw
+In cloud mode: R2 {connector}/data/raw/_manifest.json, keys are R2 keys
+
+Recorded entries are visible to this process immediately and written to
+storage in batches: after MANIFEST_FLUSH_EVERY pending entries, on
+flush_manifest() (ingest steps call it at the end of their run, and
+stream_assets before handing an asset to the transform side) and at
+interpreter exit. A flush rewrites the manifest as a whole: locally through
+a temp file and os.replace under an exclusive lock on a sibling lock file,
+on R2 as a PUT conditional on the ETag that was read, retried on conflict,
+so concurrent writers (transform workers backfilling entries, see
+io.load_raw_bytes) never drop each other's entries.
+
+Configuration:
+    MANIFEST_FLUSH_EVERY: pending entries that trigger a flush (default 50)
+"""
+
+import os
+import fcntl
+import atexit
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+from . import json_codec
+from .environment import get_data_dir
+from .r2 import is_cloud_mode, get_connector_name, upload_bytes, download_bytes_with_etag, PreconditionFailed
+
+MANIFEST_NAME = "_manifest.json"
+MAX_UPDATE_ATTEMPTS = 5
+
+_manifest = None
+_pending = {}
+_atexit_registered = False
+# A pipelined ingest records from a background thread while the transform side reads
+_lock = threading.RLock()
+
+
+def _get_raw_dir() -> Path:
+    return Path(get_data_dir()) / "raw"
+
+
+def _get_manifest_path() -> Path:
+    return _get_raw_dir() / MANIFEST_NAME
+
+
+def _get_manifest_key() -> str:
+    return f"{get_connector_name()}/data/raw/{MANIFEST_NAME}"
+
+
+def _read_manifest() -> tuple[dict, str | None]:
+    """Read the manifest from storage. Returns (manifest, etag)."""
+    if is_cloud_mode():
+        data, etag = download_bytes_with_etag(_get_manifest_key())
+        if data is None:
+            return {"assets": {}}, None
+        return json_codec.loads(data), etag
+
+    path = _get_manifest_path()
+    if not path.exists():
+        return {"assets": {}}, None
+    with open(path, 'rb') as f:
+        return json_codec.loads(f.read()), None
+
+
+def _write_manifest(manifest: dict, etag: str | None) -> None:
+    data = json_codec.dumps(manifest, indent=True, sort_keys=True)
+
+    if is_cloud_mode():
+        if etag:
+            upload_bytes(data, _get_manifest_key(), if_match=etag)
+        else:
+            upload_bytes(data, _get_manifest_key(), if_none_match='*')
+        return
+
+    path = _get_manifest_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def _storage_lock() -> Iterator[None]:
+    """Hold an exclusive lock on the local manifest across processes (R2 writes are conditional instead)."""
+    if is_cloud_mode():
+        yield
+        return
+    lock_path = _get_manifest_path().with_name(f"{MANIFEST_NAME}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _reload_manifest() -> dict:
+    """Re-read the manifest from storage, keeping this process's unflushed entries."""
+    global _manifest
+    with _lock:
+        _manifest, _ = _read_manifest()
+        _manifest.setdefault("assets", {}).update(_pending)
+        return _manifest
+
+
+def load_manifest() -> dict:
+    """Load the connector's raw manifest (cached for the life of the process)."""
+    if _manifest is None:
+        return _reload_manifest()
+    return _manifest
+
+
+def get_raw_entry(asset_id: str) -> dict | None:
+    """Get the manifest entry for a raw asset, or None if it was never recorded.
+
+    On a miss the manifest is re-read once, so a process that cached it
+    before another process recorded the asset (a transform worker during a
+    pipelined ingest) still finds it.
+    """
+    entry = load_manifest()["assets"].get(asset_id)
+    if entry is None:
+        entry = _reload_manifest()["assets"].get(asset_id)
+    return entry
+
+
+def raw_entry_path(entry: dict) -> Path:
+    """Local file a manifest entry refers to (local mode only).
+
+    Keys are relative to the raw directory; entries recorded before that
+    hold absolute paths, which are returned as they are.
+    """
+    return _get_raw_dir() / entry["key"]
+
+
+def get_raw_hash(asset_id: str) -> str | None:
+    """Get the content hash of a raw asset, or None if it was never recorded.
+
+    Downstream steps compare this with the hash they last processed to skip
+    work on unchanged inputs.
+    """
+    entry = get_raw_entry(asset_id)
+    return entry["sha256"] if entry else None
+
+
+def content_hash(content: bytes) -> str:
+    """SHA-256 hex digest of stored raw bytes."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def record_raw_asset(asset_id: str, key: str, codec: str, content: bytes,
+                     record_count: int = None, source: dict = None) -> dict:
+    """Record a freshly written raw asset in the manifest.
+
+    The entry is visible to get_raw_entry() in this process right away and
+    written to storage with the next flush_manifest().
+
+    Args:
+        asset_id: The identifier for the asset
+        key: Storage key (R2 key in cloud mode, file path in local mode)
+        codec: Storage codec / extension (e.g., 'json', 'json.gz', 'parquet')
+        content: The exact bytes that were stored
+        record_count: Number of records in the asset, if known
+        source: The query that produced the asset (e.g., url and params)
+
+    Returns:
+        The manifest entry that was recorded
+    """
+    global _atexit_registered
+
+    if not is_cloud_mode():
+        # Relative keys survive moving or remounting DATA_DIR
+        path = Path(key)
+        if path.is_relative_to(_get_raw_dir()):
+            key = path.relative_to(_get_raw_dir()).as_posix()
+
+    entry = {
+        "key": key,
+        "codec": codec,
+        "size_bytes": len(content),
+        "record_count": record_count,
+        "sha256": content_hash(content),
+        "source": source,
+        "updated_at": datetime.now().isoformat(),
+        "run_id": os.environ.get('RUN_ID', 'unknown'),
+    }
+
+    with _lock:
+        load_manifest()["assets"][asset_id] = entry
+        _pending[asset_id] = entry
+        if not _atexit_registered:
+            atexit.register(flush_manifest)
+            _atexit_registered = True
+
+        if len(_pending) >= int(os.environ.get('MANIFEST_FLUSH_EVERY', '50')):
+            flush_manifest()
+    return entry
+
+
+def flush_manifest() -> None:
+    """Write the entries recorded since the last flush to storage, in one update."""
+    global _manifest
+    with _lock:
+        if not _pending:
+            return
+
+        for attempt in range(MAX_UPDATE_ATTEMPTS):
+            try:
+                with _storage_lock():
+                    manifest, etag = _read_manifest()
+                    manifest.setdefault("assets", {}).update(_pending)
+                    _write_manifest(manifest, etag)
+                break
+            except PreconditionFailed:
+                if attempt == MAX_UPDATE_ATTEMPTS - 1:
+                    raise
+                print(f"  Manifest changed concurrently, retrying update of {len(_pending)} entries...")
+
+        _pending.clear()
+        _manifest = manifest
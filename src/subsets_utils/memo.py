@@ -0,0 +1,103 @@
+"""Content-addressed fingerprints for memoizing transform outputs.
+
+A builder's output for one raw asset is determined by the asset's content,
+the code that transforms it and the builder's parameters. fingerprint()
+hashes those three together; run_builders() stores the fingerprint of every
+input behind a dataset's last upload in the dataset's state, and skips
+transforming and uploading a dataset whose fingerprints all match. For a
+partitioned dataset it also skips transforming each input whose own
+fingerprint matches, keeping the partitions that input fed.
+
+The code version of a builder is a hash of the source of its module and of
+every project module it imports, directly or through other project
+modules (import statements are read from the source, and modules outside
+the project directory are not followed). Editing any of them changes the
+version; third-party code and the environment do not.
+
+Usage:
+    from subsets_utils.memo import code_version, fingerprint
+
+    fingerprint(get_raw_hash("filings_2024"), code_version(FilingsBuilder), {"mode": "overwrite"})
+"""
+
+import ast
+import sys
+import hashlib
+import inspect
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+from . import json_codec
+
+
+def _project_root(module_name: str) -> Path:
+    """Directory holding the module's top-level package (e.g. src/ for transforms.filings.main)."""
+    path = Path(sys.modules[module_name.split(".")[0]].__file__).resolve()
+    return path.parent.parent if path.name == "__init__.py" else path.parent
+
+
+def _source_file(name: str, root: Path) -> Path | None:
+    """Source of an imported module under root, or None for anything else."""
+    path = getattr(sys.modules.get(name), "__file__", None)
+    if not path or not path.endswith(".py"):
+        return None
+    path = Path(path).resolve()
+    return path if path.is_relative_to(root) else None
+
+
+def _imports(name: str, path: Path) -> Iterator[str]:
+    """Modules a source file imports, and the packages they live in."""
+    package = name if path.name == "__init__.py" else name.rpartition(".")[0]
+    for node in ast.walk(ast.parse(path.read_bytes())):
+        if isinstance(node, ast.Import):
+            targets = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parent = package.rsplit(".", node.level - 1)[0] if node.level > 1 else package
+                base = f"{parent}.{base}" if base else parent
+            # "from package import submodule" imports a module too
+            targets = [base] + [f"{base}.{alias.name}" for alias in node.names]
+        else:
+            continue
+        for target in targets:
+            parts = target.split(".")
+            yield from (".".join(parts[:i]) for i in range(1, len(parts) + 1))
+
+
+@lru_cache(maxsize=None)
+def _module_version(module_name: str) -> str:
+    root = _project_root(module_name)
+    files = {}
+    pending = [module_name]
+    while pending:
+        name = pending.pop()
+        path = _source_file(name, root)
+        if path is None or name in files:
+            continue
+        files[name] = path
+        pending.extend(dependency for dependency in _imports(name, path) if dependency not in files)
+
+    digest = hashlib.sha256()
+    for name in sorted(files):
+        digest.update(name.encode("utf-8") + b"\0" + files[name].read_bytes() + b"\0")
+    return digest.hexdigest()
+
+
+def code_version(obj) -> str:
+    """Hash of the project source an object (a class, function or instance) is built from."""
+    if not inspect.isclass(obj) and not callable(obj):
+        obj = type(obj)
+    return _module_version(obj.__module__)
+
+
+def fingerprint(raw_hash: str | None, code: str, params: dict) -> str | None:
+    """Fingerprint of one output built from one raw asset.
+
+    Returns:
+        Hex digest, or None if the raw asset has no content hash (such an
+        output never counts as unchanged)
+    """
+    if raw_hash is None:
+        return None
+    return hashlib.sha256(json_codec.dumps([raw_hash, code, params], sort_keys=True)).hexdigest()
@@ -0,0 +1,83 @@
+"""Pipelined ingest and transform.
+
+stream_assets() runs an ingest step in a background thread and yields the
+ids of the raw assets it saves, as each one lands. Handing that iterator to
+run_builders() transforms an asset while the ingest step is still fetching
+the next one, instead of waiting for the whole ingest to finish.
+
+The hand-off is a bounded queue: once `max_pending` saved assets are waiting
+for the transform side, the ingest step blocks on its next hand-off until
+one is consumed, so a slow transform throttles ingest rather than letting
+work pile up. An exception in the ingest step is re-raised in the consumer
+after the assets saved before it have been yielded.
+
+Usage:
+    from subsets_utils.pipeline import stream_assets
+
+    # The ingest step calls on_asset(asset_id) after each raw asset is saved
+    assets = stream_assets(lambda on_asset: ingest_filings.run(on_asset=on_asset))
+    run_builders(assets, [FilingsBuilder()], loader=load_filings)
+
+Configuration:
+    PIPELINE_MAX_PENDING: saved assets waiting for the transform side before
+        ingest blocks (default 2)
+"""
+
+import os
+import queue
+import threading
+from typing import Any, Callable, Iterator
+from .manifest import flush_manifest
+
+_DONE = object()
+
+
+def stream_assets(ingest: Callable[[Callable[[str], None]], Any], max_pending: int = None,
+                  name: str = "ingest") -> Iterator[str]:
+    """Start an ingest step in the background and iterate over the assets it saves.
+
+    The ingest step starts immediately, not on the first next(), so it can
+    run ahead while the caller is busy with something else.
+
+    Args:
+        ingest: Runs the ingest step, calling its argument with each asset id it saves
+        max_pending: Saved assets buffered for the consumer before ingest blocks
+        name: Name of the background thread
+
+    Returns:
+        Iterator over asset ids in the order they were saved
+    """
+    if max_pending is None:
+        max_pending = int(os.environ.get('PIPELINE_MAX_PENDING', '2'))
+
+    handoff = queue.Queue(maxsize=max(max_pending, 1))
+    errors = []
+
+    def hand_off(asset_id: str) -> None:
+        # Transform workers are other processes and read the manifest from storage
+        flush_manifest()
+        handoff.put(asset_id)
+
+    def run():
+        try:
+            ingest(hand_off)
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            handoff.put(_DONE)
+
+    # Daemon, so an abandoned consumer doesn't keep the process alive on a blocked put
+    thread = threading.Thread(target=run, name=name, daemon=True)
+    thread.start()
+    return _drain(handoff, thread, errors)
+
+
+def _drain(handoff: queue.Queue, thread: threading.Thread, errors: list) -> Iterator[str]:
+    while True:
+        item = handoff.get()
+        if item is _DONE:
+            break
+        yield item
+    thread.join()
+    if errors:
+        raise errors[0]
@@ -2,13 +2,34 @@
 
 Lazily initializes boto3 S3 client only when needed (CI=true).
 Provides helper functions for R2 upload/download operations.
+
+Transfer tuning (environment, or configure_r2() at runtime):
+    R2_MAX_POOL_CONNECTIONS: HTTP connection pool size (default 32)
+    R2_RETRY_MODE / R2_MAX_ATTEMPTS: botocore retry policy (default adaptive / 10)
+    R2_CHUNK_MB: multipart part size and ranged GET size (default 16)
+    R2_MAX_CONCURRENCY: parallel parts / ranges per object (default 8)
 """
 
 import os
 import io
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
+from .disk_cache import get_disk_cache
+from .concurrency import run_concurrently
 
 _s3_client = None
+_transfer_config = {
+    'max_pool_connections': int(os.environ.get('R2_MAX_POOL_CONNECTIONS', '32')),
+    'retry_mode': os.environ.get('R2_RETRY_MODE', 'adaptive'),
+    'max_attempts': int(os.environ.get('R2_MAX_ATTEMPTS', '10')),
+    'chunk_size': int(os.environ.get('R2_CHUNK_MB', '16')) * 1024 * 1024,
+    'max_concurrency': int(os.environ.get('R2_MAX_CONCURRENCY', '8')),
+}
+
+
+class PreconditionFailed(Exception):
+    """Raised when a conditional write is rejected because the object changed."""
 
 
 def is_cloud_mode() -> bool:
@@ -37,6 +58,7 @@ def get_s3_client():
 
     if _s3_client is None:
         import boto3
+        from botocore.config import Config
 
         config = _get_r2_config()
         endpoint_url = f"https://{config['account_id']}.r2.cloudflarestorage.com"
@@ -46,37 +68,90 @@ def get_s3_client():
             endpoint_url=endpoint_url,
             aws_access_key_id=config['access_key_id'],
             aws_secret_access_key=config['secret_access_key'],
-            region_name='auto'
+            region_name='auto',
+            config=Config(
+                max_pool_connections=_transfer_config['max_pool_connections'],
+                retries={
+                    'mode': _transfer_config['retry_mode'],
+                    'max_attempts': _transfer_config['max_attempts'],
+                },
+                tcp_keepalive=True,
+            )
         )
 
     return _s3_client
 
 
+def configure_r2(**config):
+    """Override transfer settings (see module docstring) and reset the client."""
+    global _transfer_config, _s3_client
+    _transfer_config.update(config)
+    _s3_client = None
+
+
+def get_transfer_config():
+    """boto3 TransferConfig for multipart uploads using the configured chunking."""
+    from boto3.s3.transfer import TransferConfig
+
+    return TransferConfig(
+        multipart_threshold=_transfer_config['chunk_size'],
+        multipart_chunksize=_transfer_config['chunk_size'],
+        max_concurrency=_transfer_config['max_concurrency'],
+        use_threads=True,
+    )
+
+
 def get_bucket_name() -> str:
     """Get the R2 bucket name."""
     return os.environ['R2_BUCKET_NAME']
 
 
-def upload_bytes(data: bytes, key: str) -> str:
+def upload_bytes(data: bytes, key: str, if_match: str = None, if_none_match: str = None) -> str:
     """Upload bytes to R2.
 
     Args:
         data: Bytes to upload
         key: Full key path in bucket (e.g., 'data/raw/asset.json')
+        if_match: Only write if the current object has this ETag
+        if_none_match: Use '*' to only write if the object does not exist yet
 
     Returns:
         S3 URI of uploaded object
+
+    Raises:
+        PreconditionFailed: If a conditional write was rejected
+    """
+    upload_bytes_with_etag(data, key, if_match=if_match, if_none_match=if_none_match)
+    return f"s3://{get_bucket_name()}/{key}"
+
+
+def upload_bytes_with_etag(data: bytes, key: str, if_match: str = None, if_none_match: str = None) -> str:
+    """Upload bytes to R2 and return the new object's ETag.
+
+    Same conditions as upload_bytes, for callers that chain conditional writes.
     """
     client = get_s3_client()
     bucket = get_bucket_name()
 
-    client.put_object(
-        Bucket=bucket,
-        Key=key,
-        Body=data
-    )
+    conditions = {}
+    if if_match:
+        conditions['IfMatch'] = if_match
+    if if_none_match:
+        conditions['IfNoneMatch'] = if_none_match
 
-    return f"s3://{bucket}/{key}"
+    try:
+        response = client.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=data,
+            **conditions
+        )
+    except client.exceptions.ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('PreconditionFailed', '412'):
+            raise PreconditionFailed(f"Conditional write to {key} rejected") from e
+        raise
+
+    return response['ETag']
 
 
 def upload_file(file_path: str, key: str) -> str:
@@ -92,7 +167,7 @@ def upload_file(file_path: str, key: str) -> str:
     client = get_s3_client()
     bucket = get_bucket_name()
 
-    client.upload_file(file_path, bucket, key)
+    client.upload_file(file_path, bucket, key, Config=get_transfer_config())
 
     return f"s3://{bucket}/{key}"
 
@@ -110,28 +185,124 @@ def upload_fileobj(fileobj: io.IOBase, key: str) -> str:
     client = get_s3_client()
     bucket = get_bucket_name()
 
-    client.upload_fileobj(fileobj, bucket, key)
+    client.upload_fileobj(fileobj, bucket, key, Config=get_transfer_config())
 
     return f"s3://{bucket}/{key}"
 
 
-def download_bytes(key: str) -> Optional[bytes]:
-    """Download bytes from R2.
+def _get_range(client, bucket: str, key: str, start: int, end: int, etag: str) -> bytes:
+    response = client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}", IfMatch=etag)
+    return response['Body'].read()
+
+
+def download_bytes(key: str, sha256: str = None) -> Optional[bytes]:
+    """Download bytes from R2 through the local disk cache.
+
+    A cached copy is returned without a request when its hash matches
+    sha256 (e.g., from the raw manifest). Otherwise the cached copy is
+    revalidated with a conditional GET on its ETag.
+
+    The first GET asks for one chunk; objects larger than that fetch their
+    remaining chunks as parallel ranged GETs pinned to the same ETag.
 
     Args:
         key: Full key path in bucket
+        sha256: Expected content hash, if known
 
     Returns:
         Bytes content, or None if key doesn't exist
     """
     client = get_s3_client()
     bucket = get_bucket_name()
+    cache = get_disk_cache()
+    chunk_size = _transfer_config['chunk_size']
+
+    cached = cache.get(key) if cache else None
+    conditions = {}
+    if cached:
+        content, entry = cached
+        if sha256 and entry["sha256"] == sha256:
+            return content
+        if entry.get("etag"):
+            conditions['IfNoneMatch'] = entry["etag"]
 
     try:
-        response = client.get_object(Bucket=bucket, Key=key)
-        return response['Body'].read()
+        response = client.get_object(Bucket=bucket, Key=key, Range=f"bytes=0-{chunk_size - 1}", **conditions)
     except client.exceptions.NoSuchKey:
         return None
+    except client.exceptions.ClientError as e:
+        code = e.response.get('Error', {}).get('Code')
+        if cached and code in ('304', 'NotModified'):
+            return cached[0]
+        if code != 'InvalidRange':
+            raise
+        # Empty objects reject any range
+        response = client.get_object(Bucket=bucket, Key=key)
+
+    etag = response['ETag']
+    first = response['Body'].read()
+    match = re.match(r"bytes \d+-\d+/(\d+)", response.get('ContentRange') or '')
+    total = int(match.group(1)) if match else len(first)
+
+    if total > len(first):
+        ranges = [(start, min(start + chunk_size, total) - 1) for start in range(len(first), total, chunk_size)]
+        with ThreadPoolExecutor(max_workers=_transfer_config['max_concurrency']) as executor:
+            parts = list(executor.map(lambda r: _get_range(client, bucket, key, r[0], r[1], etag), ranges))
+        content = b"".join([first, *parts])
+    else:
+        content = first
+
+    if cache:
+        cache.put(key, content, etag=etag)
+    return content
+
+
+def download_many(keys: list[str], max_workers: int = None) -> dict[str, Optional[bytes]]:
+    """Download many keys concurrently.
+
+    Returns:
+        Dict of key -> bytes (None for keys that don't exist)
+    """
+    results = run_concurrently(download_bytes, keys, max_workers=max_workers)
+    for key, _, error in results:
+        if error:
+            raise error
+    return {key: content for key, content, _ in results}
+
+
+def upload_many(files: list[tuple[str, str]], max_workers: int = None) -> list[str]:
+    """Upload many local files concurrently.
+
+    Args:
+        files: List of (file_path, key)
+
+    Returns:
+        S3 URIs in input order
+    """
+    results = run_concurrently(lambda f: upload_file(f[0], f[1]), files, max_workers=max_workers)
+    for _, _, error in results:
+        if error:
+            raise error
+    return [uri for _, uri, _ in results]
+
+
+def download_bytes_with_etag(key: str) -> tuple[Optional[bytes], Optional[str]]:
+    """Download bytes from R2 together with the object's ETag.
+
+    Args:
+        key: Full key path in bucket
+
+    Returns:
+        (content, etag), or (None, None) if key doesn't exist
+    """
+    client = get_s3_client()
+    bucket = get_bucket_name()
+
+    try:
+        response = client.get_object(Bucket=bucket, Key=key)
+        return response['Body'].read(), response['ETag']
+    except client.exceptions.NoSuchKey:
+        return None, None
 
 
 def object_exists(key: str) -> bool:
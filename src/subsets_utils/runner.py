@@ -23,6 +23,7 @@ from zoneinfo import ZoneInfo
 from pathlib import Path
 
 from .r2 import upload_bytes, upload_file, is_cloud_mode
+from .concurrency import run_concurrently
 from . import debug
 
 
@@ -99,15 +100,18 @@ def upload_logs(log_dir: Path, run_id: str, connector_name: str):
         return
 
     print(f"Uploading logs to R2...")
-    for log_file in log_dir.rglob('*'):
-        if not log_file.is_file():
-            continue
-        try:
-            key = f"{connector_name}/logs/{run_id}/{log_file.relative_to(log_dir)}"
-            upload_file(str(log_file), key)
+    uploads = [
+        (log_file, f"{connector_name}/logs/{run_id}/{log_file.relative_to(log_dir)}")
+        for log_file in log_dir.rglob('*')
+        if log_file.is_file()
+    ]
+
+    results = run_concurrently(lambda upload: upload_file(str(upload[0]), upload[1]), uploads)
+    for (log_file, key), _, error in results:
+        if error:
+            print(f"  Failed to upload {log_file.name}: {error}")
+        else:
             print(f"  -> {key}")
-        except Exception as e:
-            print(f"  Failed to upload {log_file.name}: {e}")
 
 
 def write_error_log(log_dir: Path, exit_code: int, output_file: Path, tail_lines: int = 100):
@@ -0,0 +1,395 @@
+"""Near-duplicate detection: MinHash signatures, LSH banding and union-find.
+
+Comparing every pair of texts is quadratic. Instead each text gets a short
+MinHash signature whose agreement with another signature estimates the
+Jaccard similarity of their shingle sets. LSH splits signatures into bands
+and only texts sharing a whole band become candidates, and only candidates
+are scored. Matches are merged into clusters with union-find.
+
+Signatures use one-permutation hashing: every shingle is hashed once and
+binned, and each bin keeps its minimum, so cost is linear in text length
+rather than in the number of hash functions. Hashes come from blake2b, so
+signatures (and clusters) are the same in every process and every run.
+
+To cluster a growing collection without re-hashing it every run, a
+signature can be packed into one uint64 word per LSH band (band_words())
+and stored next to the text: each word keeps the low 16 bits of the band's
+bins, so two texts share a band exactly when their words are equal, and
+equal 16-bit lanes estimate similarity like equal bins do (b-bit minwise
+hashing; unequal bins collide with probability 1/65536).
+cluster_incremental() then hashes only the new texts, finds their
+candidates among the stored words with Arrow kernels, and leaves existing
+labels as they are.
+
+Short strings such as names are better served by resolve_incremental(),
+which blocks character trigrams with an exact prefix-filtering inverted
+index and scores candidates with exact Jaccard similarity. It looks up
+candidates for the new strings only, so already-labelled strings are
+indexed but never re-scored or relabelled.
+
+Usage:
+    from subsets_utils.similarity import cluster_near_duplicates, cluster_incremental, resolve_incremental
+
+    labels = cluster_near_duplicates(descriptions, threshold=0.8)
+    # labels[i] == labels[j] when descriptions i and j are near-duplicates
+
+    words = [band_words(text) for text in new_descriptions]
+    new_labels = cluster_incremental(stored_words, stored_labels, words, new_keys)
+
+    new_labels = resolve_incremental(known_names, known_ids, new_names, new_keys)
+"""
+
+import re
+import math
+import hashlib
+from collections import defaultdict
+from typing import Iterable, Sequence
+import pyarrow as pa
+import pyarrow.compute as pc
+
+_TOKEN = re.compile(r"\w+")
+_MAX_HASH = (1 << 64) - 1
+_LANE_BITS = 16
+_LANE_MASK = (1 << _LANE_BITS) - 1
+
+
+class UnionFind:
+    """Disjoint sets over 0..n-1 with path halving and union by size."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> int:
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return a
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        return a
+
+    def labels(self) -> list[int]:
+        """Cluster label per element: the smallest element index in its set."""
+        smallest = {}
+        roots = [self.find(x) for x in range(len(self.parent))]
+        for x, root in enumerate(roots):
+            smallest.setdefault(root, x)
+        return [smallest[root] for root in roots]
+
+
+def tokens(text: str) -> list[str]:
+    """Lowercased word tokens."""
+    return _TOKEN.findall(text.lower())
+
+
+def word_shingles(text: str, k: int = 3) -> set[str]:
+    """Set of k-word shingles (the whole text if it has fewer than k words)."""
+    words = tokens(text)
+    if len(words) <= k:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + k]) for i in range(len(words) - k + 1)}
+
+
+def char_ngrams(text: str, n: int = 3) -> set[str]:
+    """Set of character n-grams of the text, padded with a space on each side."""
+    text = f" {text} "
+    if len(text) <= n:
+        return {text}
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def minhash(shingles: Iterable[str], num_perm: int = 64) -> tuple[int, ...]:
+    """One-permutation MinHash signature of a shingle set.
+
+    Empty bins are filled from the next non-empty bin (rotation
+    densification), so short texts still get comparable signatures. An
+    empty shingle set gets an all-max signature.
+    """
+    bins = [_MAX_HASH] * num_perm
+    for shingle in shingles:
+        h = _hash64(shingle)
+        b, value = h % num_perm, h // num_perm
+        if value < bins[b]:
+            bins[b] = value
+
+    filled = [i for i, v in enumerate(bins) if v != _MAX_HASH]
+    if not filled or len(filled) == num_perm:
+        return tuple(bins)
+
+    signature = list(bins)
+    for i in range(num_perm):
+        if signature[i] == _MAX_HASH:
+            offset = 1
+            while bins[(i + offset) % num_perm] == _MAX_HASH:
+                offset += 1
+            # Mix in the distance so borrowed values don't collide with real ones
+            signature[i] = bins[(i + offset) % num_perm] + offset * (_MAX_HASH // num_perm // num_perm)
+    return tuple(signature)
+
+
+def similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return sum(x == y for x, y in zip(a, b)) / len(a)
+
+
+def lsh_buckets(signatures: Sequence[Sequence[int]], bands: int) -> Iterable[list[int]]:
+    """Groups of signature indices that share at least one whole band.
+
+    Yields each bucket with two or more members; a pair may share several buckets.
+    """
+    if not signatures:
+        return
+    rows = len(signatures[0]) // bands
+    for band in range(bands):
+        buckets = defaultdict(list)
+        start = band * rows
+        for i, signature in enumerate(signatures):
+            buckets[tuple(signature[start:start + rows])].append(i)
+        for members in buckets.values():
+            if len(members) > 1:
+                yield members
+
+
+def cluster_signatures(signatures: Sequence[Sequence[int]], threshold: float = 0.8, bands: int = 16) -> list[int]:
+    """Cluster MinHash signatures whose estimated similarity reaches threshold.
+
+    Returns:
+        Cluster label per signature (index of the cluster's first member)
+    """
+    uf = UnionFind(len(signatures))
+    for members in lsh_buckets(signatures, bands):
+        # Score each candidate against the bucket's first member only; union
+        # makes the result transitive without scoring every pair
+        head = members[0]
+        for other in members[1:]:
+            if uf.find(head) != uf.find(other) and similarity(signatures[head], signatures[other]) >= threshold:
+                uf.union(head, other)
+    return uf.labels()
+
+
+def cluster_near_duplicates(texts: Sequence[str], threshold: float = 0.8, num_perm: int = 64,
+                            bands: int = 16, shingle_size: int = 3) -> list[int]:
+    """Cluster texts whose word-shingle Jaccard similarity is about threshold or more.
+
+    With the defaults (64 bins in 16 bands of 4), pairs at 0.8 similarity
+    become candidates with probability > 0.999 and pairs below 0.3 almost
+    never do.
+
+    Returns:
+        Cluster label per text (index of the cluster's first member)
+    """
+    signatures = [minhash(word_shingles(text or "", shingle_size), num_perm) for text in texts]
+    return cluster_signatures(signatures, threshold, bands)
+
+
+def band_words(text: str, num_perm: int = 64, bands: int = 16, shingle_size: int = 3) -> list[int]:
+    """MinHash signature of a text's word shingles, packed as one uint64 word per LSH band.
+
+    Each word holds the low 16 bits of the band's num_perm / bands bins
+    (at most 4), first bin in the lowest lane.
+    """
+    rows = num_perm // bands
+    if rows * _LANE_BITS > 64:
+        raise ValueError(f"{rows} bins per band don't fit a 64-bit word")
+    signature = minhash(word_shingles(text or "", shingle_size), num_perm)
+    return [
+        sum((signature[band * rows + row] & _LANE_MASK) << (_LANE_BITS * row) for row in range(rows))
+        for band in range(bands)
+    ]
+
+
+def band_similarity(a: Sequence[int], b: Sequence[int], rows: int = 4) -> float:
+    """Estimated Jaccard similarity of two band_words() signatures: the share of equal lanes."""
+    equal = 0
+    for x, y in zip(a, b):
+        diff = x ^ y
+        equal += sum(not (diff >> (_LANE_BITS * row)) & _LANE_MASK for row in range(rows))
+    return equal / (len(a) * rows)
+
+
+def _band_candidates(known: pa.ListArray, new: Sequence[Sequence[int]]) -> list[tuple[int, int]]:
+    """Pairs (new index, other index) sharing a band word, others indexed known first, then new.
+
+    Known rows are matched with is_in against the new words and a hash join,
+    so their signatures are scanned but never decoded to Python.
+    """
+    bands = len(new[0])
+    offset = len(known)
+    new_words = pa.array([word for words in new for word in words], pa.uint64())
+    words = pa.concat_arrays([pc.list_flatten(known).cast(pa.uint64(), safe=False), new_words])
+
+    # Positions are row * bands + band, as every signature has one word per band
+    position = pc.indices_nonzero(pc.is_in(words, value_set=new_words)).cast(pa.int64())
+    row = pc.divide(position, bands)
+    hits = pa.table({
+        "row": row,
+        "band": pc.subtract(position, pc.multiply(row, bands)),
+        "word": pc.take(words, position),
+    })
+    new_hits = hits.filter(pc.greater_equal(hits["row"], offset)).rename_columns(["new_row", "band", "word"])
+    pairs = hits.join(new_hits, ["band", "word"], join_type="inner", use_threads=False)
+    pairs = pairs.filter(pc.not_equal(pairs["row"], pairs["new_row"]))
+    pairs = pairs.group_by(["new_row", "row"], use_threads=False).aggregate([]).sort_by([("new_row", "ascending"), ("row", "ascending")])
+    return [(new_row - offset, row) for new_row, row in zip(pairs["new_row"].to_pylist(), pairs["row"].to_pylist())]
+
+
+def cluster_incremental(known: pa.ListArray, known_labels: Sequence[int], new: Sequence[Sequence[int]],
+                        new_labels: Sequence[int], threshold: float = 0.8, rows: int = 4) -> list[int]:
+    """Label new band_words() signatures by matching them against labelled ones and each other.
+
+    Candidates share a whole band word; each candidate pair involving a new
+    signature is scored with band_similarity(). A new signature whose best
+    known match reaches threshold takes that label. New signatures matching
+    each other form clusters with union-find; a cluster takes the label of a
+    member attached to a known label (the smallest, if several), or else its
+    smallest new label. Known labels never change and known clusters are
+    never merged.
+
+    Args:
+        known: Signatures already labelled, as a list<uint64> (or list<int64>
+            holding the same bits) array with one word per band
+        known_labels: Label of each known signature
+        new: Signatures to label, one word per band each
+        new_labels: Label each new signature gets if it matches nothing
+        rows: Bins per band (num_perm / bands of band_words())
+
+    Returns:
+        Label per new signature
+    """
+    if not new:
+        return []
+    known = known.combine_chunks() if isinstance(known, pa.ChunkedArray) else known
+    lengths = pc.list_value_length(known)
+    if len(known) and (pc.min(lengths).as_py() != len(new[0]) or pc.max(lengths).as_py() != len(new[0])):
+        raise ValueError(f"Known signatures must all have {len(new[0])} band words")
+
+    pairs = _band_candidates(known, new)
+    offset = len(known)
+    known_rows = sorted({other for _, other in pairs if other < offset})
+    known_words = dict(zip(known_rows, pc.take(known, pa.array(known_rows, pa.int64())).cast(pa.list_(pa.uint64()), safe=False).to_pylist()))
+
+    attached = [None] * len(new)
+    best_score = [threshold] * len(new)
+    uf = UnionFind(len(new))
+    for n, other in pairs:
+        if other < offset:
+            score = band_similarity(new[n], known_words[other], rows)
+            if score >= best_score[n] and (attached[n] is None or score > best_score[n]):
+                attached[n], best_score[n] = known_labels[other], score
+        elif n < other - offset and band_similarity(new[n], new[other - offset], rows) >= threshold:
+            # Each new pair is scored once, from its earlier member
+            uf.union(n, other - offset)
+    return _cluster_labels(uf, attached, new_labels)
+
+
+def _cluster_labels(uf: UnionFind, attached: Sequence, new_labels: Sequence[int]) -> list[int]:
+    """One label per new-only cluster: a known one if any member matched, else its smallest new label."""
+    cluster_label = {}
+    for n in range(len(new_labels)):
+        root = uf.find(n)
+        label = (0, attached[n]) if attached[n] is not None else (1, new_labels[n])
+        if root not in cluster_label or label < cluster_label[root]:
+            cluster_label[root] = label
+    return [cluster_label[uf.find(n)][1] for n in range(len(new_labels))]
+
+
+def _prefix_length(size: int, threshold: float) -> int:
+    # Tolerance keeps float error (0.8 * 5 = 4.000000000000001) from shortening the prefix
+    return size - math.ceil(threshold * size - 1e-9) + 1
+
+
+def _prefix_index(grams: Sequence[set], threshold: float) -> tuple[list[frozenset], dict[int, list[int]]]:
+    """Prefix-filtering index over n-gram sets (the AllPairs blocking scheme).
+
+    N-grams are renumbered by frequency, rarest first. Two sets with
+    Jaccard similarity >= threshold must share an n-gram within the first
+    len - ceil(threshold * len) + 1 of either numbering, so only those
+    prefixes are indexed. Blocks on rare n-grams are small, and no match
+    above threshold is missed.
+
+    Returns:
+        (each set renumbered, inverted index of prefix n-gram -> set indices)
+    """
+    frequency = defaultdict(int)
+    for g in grams:
+        for gram in g:
+            frequency[gram] += 1
+    rank = {gram: r for r, gram in enumerate(sorted(frequency, key=lambda gram: (frequency[gram], gram)))}
+
+    ranked = []
+    index = defaultdict(list)
+    for i, g in enumerate(grams):
+        ordered = sorted(rank[gram] for gram in g)
+        for r in ordered[:_prefix_length(len(ordered), threshold)]:
+            index[r].append(i)
+        ranked.append(frozenset(ordered))
+    return ranked, index
+
+
+def resolve_incremental(known: Sequence[str], known_labels: Sequence[int], new: Sequence[str],
+                        new_labels: Sequence[int], threshold: float = 0.8) -> list[int]:
+    """Label new strings by matching them against labelled ones and each other.
+
+    Candidates share an indexed prefix trigram (see _prefix_index) and have
+    compatible sizes; only pairs involving a new string are scored, by
+    exact character-trigram Jaccard similarity. A new string whose best
+    known match reaches threshold takes that label. New strings matching
+    each other form clusters with union-find; a cluster takes the label of
+    a member attached to a known label (the smallest, if several), or else
+    its smallest new label. Known labels never change and known clusters
+    are never merged.
+
+    Args:
+        known: Strings already labelled
+        known_labels: Label of each known string
+        new: Strings to label
+        new_labels: Label each new string gets if it matches nothing
+
+    Returns:
+        Label per new string
+    """
+    texts = list(known) + list(new)
+    offset = len(known)
+    grams, index = _prefix_index([char_ngrams(text) for text in texts], threshold)
+
+    attached = [None] * len(new)
+    uf = UnionFind(len(new))
+    for n in range(len(new)):
+        i = offset + n
+        mine = grams[i]
+        size = len(mine)
+        candidates = {j for r in sorted(mine)[:_prefix_length(size, threshold)] for j in index[r]}
+        best, best_score = None, threshold
+        for j in sorted(candidates):
+            # Each new pair is scored once, from its earlier member
+            if offset <= j <= i:
+                continue
+            other = grams[j]
+            # Sizes too far apart cannot reach threshold
+            if not threshold * size <= len(other) <= size / threshold:
+                continue
+            overlap = len(mine & other)
+            score = overlap / (size + len(other) - overlap)
+            if score < threshold:
+                continue
+            if j < offset:
+                if best is None or score > best_score:
+                    best, best_score = known_labels[j], score
+            else:
+                uf.union(n, j - offset)
+        attached[n] = best
+
+    return _cluster_labels(uf, attached, new_labels)
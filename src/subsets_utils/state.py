@@ -0,0 +1,156 @@
+"""Write-through state store.
+
+State is read from storage once per asset and then served from memory.
+Saves update the in-memory copy immediately and are flushed to storage in
+batches: after STATE_FLUSH_EVERY pending saves, by a background timer
+STATE_FLUSH_SECONDS after the first pending save (so a last few saves don't
+wait for another save to go out), on flush_state(), and at interpreter exit.
+Debug diffs are computed against the in-memory copy, so a save never costs
+a read.
+
+On R2 every flush is a PUT conditional on the ETag last read or written, so
+two shards updating the same state cannot silently overwrite each other;
+the loser gets a StateConflict instead. Within a process, loads, saves and
+flushes hold one lock, so threads (a pipelined ingest saves from a
+background thread) never flush concurrently from the same ETag.
+
+In local mode: DATA_DIR/state/{asset}.json, written through on every save
+In cloud mode: R2 {connector}/data/state/{asset}.json, batched
+
+Configuration:
+    STATE_FLUSH_EVERY: pending saves that trigger a flush (default 10, cloud only)
+    STATE_FLUSH_SECONDS: max seconds a save stays pending (default 60, cloud only)
+"""
+
+import os
+import copy
+import atexit
+import threading
+from datetime import datetime
+from pathlib import Path
+from . import debug, json_codec
+from .environment import get_data_dir
+from .r2 import is_cloud_mode, get_connector_name, get_bucket_name, upload_bytes_with_etag, download_bytes_with_etag, PreconditionFailed
+
+_store = None
+_store_lock = threading.Lock()
+
+
+class StateConflict(Exception):
+    """Raised when state changed in storage since this process last read or wrote it."""
+
+
+class StateStore:
+    def __init__(self, flush_every: int, flush_seconds: float):
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self._states = {}
+        self._etags = {}
+        self._dirty = set()
+        self._pending_saves = 0
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def _key(self, asset: str) -> str:
+        return f"{get_connector_name()}/data/state/{asset}.json"
+
+    def _path(self, asset: str) -> Path:
+        return Path(get_data_dir()) / "state" / f"{asset}.json"
+
+    def _read(self, asset: str) -> dict:
+        if is_cloud_mode():
+            data, etag = download_bytes_with_etag(self._key(asset))
+            self._etags[asset] = etag
+            return json_codec.loads(data) if data is not None else {}
+
+        state_file = self._path(asset)
+        if state_file.exists():
+            with open(state_file, 'rb') as f:
+                return json_codec.loads(f.read())
+        return {}
+
+    def _write(self, asset: str) -> None:
+        state_data = self._states[asset]
+
+        if is_cloud_mode():
+            etag = self._etags.get(asset)
+            conditions = {'if_match': etag} if etag else {'if_none_match': '*'}
+            try:
+                # Chain from the new ETag so the next flush stays conditional
+                self._etags[asset] = upload_bytes_with_etag(json_codec.dumps(state_data), self._key(asset), **conditions)
+            except PreconditionFailed as e:
+                raise StateConflict(
+                    f"State '{asset}' was modified by another run since it was read; refusing to overwrite"
+                ) from e
+            return
+
+        state_file = self._path(asset)
+        state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = state_file.with_name(f"{state_file.name}.{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(json_codec.dumps(state_data, indent=True))
+        os.replace(tmp_file, state_file)
+
+    def location(self, asset: str) -> str:
+        if is_cloud_mode():
+            return f"s3://{get_bucket_name()}/{self._key(asset)}"
+        return str(self._path(asset))
+
+    def load(self, asset: str) -> dict:
+        with self._lock:
+            if asset not in self._states:
+                self._states[asset] = self._read(asset)
+            return copy.deepcopy(self._states[asset])
+
+    def save(self, asset: str, state_data: dict) -> str:
+        state_data = copy.deepcopy(state_data)
+        state_data['_metadata'] = {
+            'updated_at': datetime.now().isoformat(),
+            'run_id': os.environ.get('RUN_ID', 'unknown')
+        }
+
+        with self._lock:
+            old_state = self.load(asset)
+            self._states[asset] = state_data
+            self._dirty.add(asset)
+            self._pending_saves += 1
+            debug.log_state_change(asset, old_state, state_data)
+
+            if not is_cloud_mode() or self._pending_saves >= self.flush_every:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        return self.location(asset)
+
+    def flush(self) -> None:
+        """Write all pending state to storage."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            for asset in sorted(self._dirty):
+                self._write(asset)
+                self._dirty.discard(asset)
+            self._pending_saves = 0
+
+
+def get_state_store() -> StateStore:
+    """Get the process-wide state store."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = StateStore(
+                flush_every=int(os.environ.get('STATE_FLUSH_EVERY', '10')),
+                flush_seconds=float(os.environ.get('STATE_FLUSH_SECONDS', '60')),
+            )
+            atexit.register(flush_state)
+    return _store
+
+
+def flush_state() -> None:
+    """Flush pending state saves to storage."""
+    if _store is not None:
+        _store.flush()
@@ -68,7 +68,10 @@ def assert_valid_week(table: pa.Table, column: str) -> None:
 
 
 def assert_valid_date(table: pa.Table, column: str) -> None:
-    """Assert all non-null values are valid dates (YYYY-MM-DD format)."""
+    """Assert all non-null values are valid dates (YYYY-MM-DD format, or a date/timestamp column)."""
+    column_type = table.schema.field(column).type
+    if pa.types.is_date(column_type) or pa.types.is_timestamp(column_type):
+        return  # Valid by construction
     values = [v for v in table.column(column).to_pylist() if v is not None]
     pattern = re.compile(r"^\d{4}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01])$")
     invalid = [v for v in values if not pattern.match(str(v))]
@@ -94,23 +97,23 @@ def assert_valid_date_any(table: pa.Table, column: str) -> None:
 # =============================================================================
 
 def assert_max_length(table: pa.Table, column: str, max_len: int) -> None:
-    """Assert all non-null string values have length <= max_len."""
+    """Assert all non-null string (or binary) values have length <= max_len."""
     values = [v for v in table.column(column).to_pylist() if v is not None]
-    invalid = [v for v in values if len(str(v)) > max_len]
+    invalid = [v for v in values if len(v if isinstance(v, (str, bytes)) else str(v)) > max_len]
     assert not invalid, f"Column '{column}' has values exceeding {max_len} chars: {invalid[:5]}..."
 
 
 def assert_min_length(table: pa.Table, column: str, min_len: int) -> None:
-    """Assert all non-null string values have length >= min_len."""
+    """Assert all non-null string (or binary) values have length >= min_len."""
     values = [v for v in table.column(column).to_pylist() if v is not None]
-    invalid = [v for v in values if len(str(v)) < min_len]
+    invalid = [v for v in values if len(v if isinstance(v, (str, bytes)) else str(v)) < min_len]
     assert not invalid, f"Column '{column}' has values shorter than {min_len} chars: {invalid[:5]}..."
 
 
 def assert_length(table: pa.Table, column: str, exact_len: int) -> None:
-    """Assert all non-null string values have exactly the specified length."""
+    """Assert all non-null string (or binary) values have exactly the specified length."""
     values = [v for v in table.column(column).to_pylist() if v is not None]
-    invalid = [v for v in values if len(str(v)) != exact_len]
+    invalid = [v for v in values if len(v if isinstance(v, (str, bytes)) else str(v)) != exact_len]
     assert not invalid, f"Column '{column}' has values not exactly {exact_len} chars: {invalid[:5]}..."
 
 
@@ -130,6 +133,18 @@ def assert_in_set(table: pa.Table, column: str, valid_values: set) -> None:
     assert not invalid, f"Column '{column}' has unexpected values: {invalid[:5]}..."
 
 
+def assert_valid_uuid(table: pa.Table, column: str) -> None:
+    """Assert all non-null values are UUIDs: 16-byte binary, or canonical 36-char strings."""
+    column_type = table.schema.field(column).type
+    values = [v for v in table.column(column).to_pylist() if v is not None]
+    if pa.types.is_binary(column_type) or pa.types.is_fixed_size_binary(column_type):
+        invalid = [v for v in values if len(v) != 16]
+    else:
+        pattern = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+        invalid = [v for v in values if not pattern.match(str(v))]
+    assert not invalid, f"Column '{column}' has invalid UUID values: {invalid[:5]}..."
+
+
 # =============================================================================
 # Numeric Validators
 # =============================================================================
@@ -173,7 +188,10 @@ def validate(table: pa.Table, schema: dict) -> None:
     Args:
         table: PyArrow table to validate
         schema: Validation schema with optional keys:
-            - columns: dict of {column_name: expected_type_substring}
+            - columns: dict of {column_name: expected_type_substring}, e.g.
+              "string", "int", "date", "decimal", "binary" (matches 16-byte
+              UUIDs); dictionary columns match on their value type (or on
+              "dictionary")
             - not_null: list of column names that must not have nulls
             - unique: list of column names that form a unique key (composite if multiple)
             - min_rows: minimum expected row count
@@ -195,7 +213,11 @@ def validate(table: pa.Table, schema: dict) -> None:
 
         for col, expected_type in columns.items():
             assert col in table_columns, f"Missing column: {col}"
-            actual_type = str(table.schema.field(col).type)
+            field_type = table.schema.field(col).type
+            actual_type = str(field_type)
+            # Dictionary columns are checked against their value type
+            if pa.types.is_dictionary(field_type) and expected_type != "dictionary":
+                actual_type = str(field_type.value_type)
             assert expected_type in actual_type, (
                 f"Column '{col}': expected type containing '{expected_type}', got '{actual_type}'"
             )
@@ -0,0 +1,404 @@
+"""Single-pass transforms over a shared raw source.
+
+Several dataset builders register against the same raw assets. Each asset
+is loaded and decoded once and handed to every builder, so all tables
+derived from one source are built in a single scan.
+
+Usage:
+    from subsets_utils.transform import Builder, run_builders
+
+    class FilingsBuilder(Builder):
+        dataset_id = "lda_filings"
+        metadata = METADATA
+        schema = SCHEMA
+
+        def transform(self, data, asset_id):
+            return [...]  # list of row dicts, or a pa.Table
+
+        def test(self, table):
+            test(table)
+
+    run_builders([f"filings_{year}" for year in YEARS], [FilingsBuilder(), ActivitiesBuilder()])
+
+Builders that derive from the same intermediate result (e.g. the current
+version of each filing) share it through a @per_asset function, which is
+computed once per loaded asset however many builders call it.
+
+With more than one worker, each asset is transformed in a process pool. A
+worker writes its per-builder results as Arrow IPC files and the parent
+memory-maps and concatenates them, so results reach the parent without
+pickling or copying. Builders and the loader must therefore be importable
+module-level objects.
+
+Configuration:
+    TRANSFORM_WORKERS: worker processes (default: CPU count; 1 runs in-process)
+    TRANSFORM_WORKER_MEMORY_MB: per-worker heap limit (default 0 = unlimited)
+"""
+
+import os
+import functools
+import resource
+import tempfile
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+import pyarrow as pa
+import pyarrow.compute as pc
+from .arrow_cache import load_raw_table, read_ipc, write_ipc
+from .concurrency import prefetch
+from .io import upload_data, decode_dictionaries, load_state, save_state, load_asset, load_asset_schema, load_asset_partitioning
+from .manifest import get_raw_hash
+from .memo import code_version, fingerprint
+from .publish import publish
+
+
+def per_asset(function: Callable[[Any, str], Any]) -> Callable[[Any, str], Any]:
+    """Memoize a function of (loaded asset, asset_id) for the asset being built.
+
+    run_builders hands every builder the same loaded object for an asset, so
+    builders calling the wrapped function on it share one result. Only the
+    latest asset's result is kept; it is recomputed for any other object.
+    """
+    last = []
+
+    @functools.wraps(function)
+    def wrapper(data: Any, asset_id: str) -> Any:
+        if not (last and last[0] is data and last[1] == asset_id):
+            last[:] = [data, asset_id, function(data, asset_id)]
+        return last[2]
+
+    return wrapper
+
+
+class Builder:
+    """A dataset built from one raw asset at a time.
+
+    Subclasses set dataset_id, metadata and schema, and implement transform().
+    mode is the upload_data mode used for the combined result; builders that
+    rebuild the whole dataset every run use "overwrite", dimension tables use
+    "merge" with merge_key (a column, or a list of columns for a composite key).
+
+    An "overwrite" or "merge" builder whose partitions are each fed by a
+    single raw asset can set partition_by (e.g. "filing_year"). Its table is
+    then partitioned on that column, and run_builders sets partitions to the
+    partition values fed by inputs whose fingerprint changed since the last
+    upload, so only those partitions are rewritten (overwrite) or merged,
+    with their rows the new data lacks deleted (merge).
+
+    A "merge" builder whose combine() reduces any set of per-asset tables
+    to one row per merge_key (a single column) can set keep_parts.
+    run_builders then keeps each input's transform() output in an
+    unpublished companion table, {dataset_id}_parts, partitioned by input.
+    Only the keys that changed inputs have or had are combined, from the
+    new outputs and the other inputs' stored parts, and merged; the rest of
+    the table is left as stored.
+
+    Each input's fingerprint combines the raw asset's content hash, the
+    builder's code version and params() (see subsets_utils.memo). When
+    every fingerprint matches the last upload, run_builders skips the
+    builder without transforming or uploading anything. A partitioned
+    builder whose table is stored also skips each input whose own
+    fingerprint matches: its partitions are kept as stored and test() sees
+    them alongside the rebuilt ones. An asset no builder needs is not loaded.
+    """
+
+    dataset_id: str = None
+    metadata: dict = None
+    schema: pa.Schema = None
+    mode: str = "append"
+    merge_key: str | list[str] = None
+    partition_by: str | list[str] = None
+    partitions: list = None
+    keep_parts: bool = False
+
+    def transform(self, data: Any, asset_id: str) -> list[dict] | pa.Table:
+        """Turn one loaded raw asset into output rows."""
+        raise NotImplementedError
+
+    def params(self) -> dict:
+        """Settings that shape the output, part of every input's fingerprint.
+
+        Module-level constants are covered by the code version; override
+        this to add settings that live elsewhere, such as instance attributes.
+        """
+        return {
+            "dataset_id": self.dataset_id,
+            "schema": str(self.schema),
+            "mode": self.mode,
+            "merge_key": self.merge_key,
+            "partition_by": self.partition_by,
+        }
+
+    def build(self, data: Any, asset_id: str) -> pa.Table:
+        """Run transform() and normalize its output to a table with the builder's schema."""
+        result = self.transform(data, asset_id)
+        if isinstance(result, pa.Table):
+            return result.cast(self.schema) if self.schema else result
+        return pa.Table.from_pylist(result, schema=self.schema)
+
+    def combine(self, tables: list[pa.Table]) -> pa.Table:
+        """Merge per-asset tables into the final dataset."""
+        if not tables:
+            return self.schema.empty_table() if self.schema else pa.table({})
+        return pa.concat_tables(tables)
+
+    def test(self, table: pa.Table) -> None:
+        """Validate the final dataset. Raises AssertionError on failure."""
+
+    def upload(self, table: pa.Table) -> None:
+        upload_data(table, self.dataset_id, mode=self.mode, merge_key=self.merge_key,
+                    partition_by=self.partition_by, partitions=self.partitions)
+        publish(self.dataset_id, self.metadata)
+
+
+def _fingerprint(builder: Builder, asset_id: str) -> str | None:
+    return fingerprint(get_raw_hash(asset_id), code_version(builder), builder.params())
+
+
+def _is_memoized(builder: Builder, asset_ids: list[str], uploaded: dict[str, str]) -> bool:
+    """Whether the builder's last upload came from exactly these inputs, code and parameters."""
+    current = {asset_id: _fingerprint(builder, asset_id) for asset_id in asset_ids}
+    if not current or None in current.values() or current != uploaded:
+        return False
+    try:
+        load_asset_schema(builder.dataset_id)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _partition_columns(builder: Builder) -> list[str]:
+    return [builder.partition_by] if isinstance(builder.partition_by, str) else list(builder.partition_by)
+
+
+def _keeps_partitions(builder: Builder) -> bool:
+    """Whether an upload writes only the builder's given partitions, leaving the stored ones of unchanged inputs."""
+    if not (builder.partition_by and builder.mode in ("overwrite", "merge") and builder.schema is not None):
+        return False
+    try:
+        return (load_asset_schema(builder.dataset_id).names == builder.schema.names
+                and load_asset_partitioning(builder.dataset_id) == _partition_columns(builder))
+    except FileNotFoundError:
+        return False
+
+
+def _parts_dataset(builder: Builder) -> str:
+    return f"{builder.dataset_id}_parts"
+
+
+def _keeps_parts(builder: Builder) -> bool:
+    """Whether the builder's table and its inputs' stored parts can be updated for changed inputs alone."""
+    if not (builder.keep_parts and builder.mode == "merge" and builder.schema is not None):
+        return False
+    try:
+        return (load_asset_schema(builder.dataset_id).names == builder.schema.names
+                and load_asset_schema(_parts_dataset(builder)).names == [*builder.schema.names, "input"])
+    except FileNotFoundError:
+        return False
+
+
+def _combine_changed_keys(builder: Builder, parts: list[tuple[str, pa.Table]]) -> pa.Table:
+    """Combine the keys the changed inputs have or had, from their new outputs and the other inputs' stored parts."""
+    key = builder.merge_key
+    changed = pa.array([asset_id for asset_id, _ in parts], pa.string())
+    stored = load_asset(_parts_dataset(builder), columns=[key, "input"])
+    had = stored[key].filter(pc.is_in(stored["input"], value_set=changed))
+    touched = pc.unique(pa.chunked_array([*(table[key] for _, table in parts), had]).cast(stored.schema.field(key).type))
+
+    others = load_asset(_parts_dataset(builder), filters=pc.field(key).isin(touched) & ~pc.field("input").isin(changed))
+    print(f"  {builder.dataset_id}: {len(touched):,} keys of {len(parts)} changed inputs, "
+          f"{len(others):,} stored rows of other inputs")
+    return builder.combine([table for _, table in parts] + [others.drop_columns(["input"]).cast(builder.schema)])
+
+
+def _with_stored_keys(builder: Builder, table: pa.Table) -> pa.Table:
+    """The builder's table as its merge will leave it: its rows, then the stored rows of other keys."""
+    key = builder.merge_key
+    table = decode_dictionaries(table)
+    stored = load_asset(builder.dataset_id, columns=table.column_names)
+    kept = stored.filter(pc.invert(pc.is_in(stored[key], value_set=table[key].combine_chunks())))
+    return pa.concat_tables([table, kept.cast(table.schema)])
+
+
+def _upload_parts(builder: Builder, parts: list[tuple[str, pa.Table]], replace_only_changed: bool) -> None:
+    """Store each input's output in the builder's parts table, replacing its inputs' previous parts."""
+    tables = [decode_dictionaries(table).append_column("input", pa.repeat(asset_id, len(table)).cast(pa.string()))
+              for asset_id, table in parts]
+    if tables:
+        partitions = [(asset_id,) for asset_id, _ in parts] if replace_only_changed else None
+        upload_data(pa.concat_tables(tables), _parts_dataset(builder), mode="overwrite",
+                    partition_by="input", partitions=partitions)
+
+
+def _with_stored_partitions(builder: Builder, table: pa.Table) -> pa.Table:
+    """The builder's table as its upload will leave it: the rows of its partitions, then the stored rows of the others."""
+    columns = _partition_columns(builder)
+    table = decode_dictionaries(table)
+    rewritten = pa.table({
+        column: pa.array([key[i] for key in builder.partitions], table.schema.field(column).type)
+        for i, column in enumerate(columns)
+    })
+    stored = load_asset(builder.dataset_id, columns=table.column_names)
+    # Joins can't carry nested columns, so anti-join the partition keys and take the rows they point at
+    keys = stored.select(columns).append_column("row", pa.array(range(len(stored)), pa.int64()))
+    kept = keys.join(rewritten.cast(keys.select(columns).schema), columns, join_type="left anti", use_threads=False)
+    return pa.concat_tables([table, stored.take(kept["row"]).cast(table.schema)])
+
+
+def _changed_partitions(builder: Builder, parts: list[tuple[str, pa.Table]], fingerprints: dict[str, str],
+                        uploaded: dict[str, str]) -> list[tuple]:
+    """Partition values in the builder's output for inputs whose fingerprint changed since its last upload."""
+    columns = _partition_columns(builder)
+
+    changed = [table for asset_id, table in parts
+               if fingerprints[asset_id] is None or uploaded.get(asset_id) != fingerprints[asset_id]]
+    partitions = {}
+    for table in changed:
+        keys = decode_dictionaries(table.select(columns)).group_by(columns).aggregate([])
+        partitions.update(dict.fromkeys(tuple(row.values()) for row in keys.to_pylist()))
+    print(f"  {builder.dataset_id}: {len(changed)} of {len(fingerprints)} inputs changed, {len(partitions)} partitions to rewrite")
+    return list(partitions)
+
+
+def _init_worker(memory_mb: int) -> None:
+    if memory_mb > 0:
+        limit = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_DATA, (limit, limit))
+
+
+def _build_to_ipc(asset_id: str, builders: list[Builder], loader: Callable[[str], Any], out_dir: str) -> dict[str, str]:
+    """Worker: build one asset for every builder, writing each result as an IPC file."""
+    data = loader(asset_id)
+    paths = {}
+    for builder in builders:
+        path = Path(out_dir) / f"{asset_id}.{builder.dataset_id}.arrow"
+        write_ipc(builder.build(data, asset_id), path)
+        paths[builder.dataset_id] = str(path)
+    return paths
+
+
+def _build_in_process(asset_ids: Iterable[str], builders: Callable[[str], list[Builder]],
+                      loader: Callable[[str], Any]) -> Iterator[tuple[str, dict[str, pa.Table]]]:
+    for asset_id, data in prefetch(asset_ids, loader):
+        yield asset_id, {builder.dataset_id: builder.build(data, asset_id) for builder in builders(asset_id)}
+
+
+def _build_in_pool(asset_ids: Iterable[str], builders: Callable[[str], list[Builder]], loader: Callable[[str], Any],
+                   workers: int, memory_mb: int, out_dir: str) -> Iterator[tuple[str, dict[str, pa.Table]]]:
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker, initargs=(memory_mb,)) as executor:
+        # Submit as asset ids arrive (they may come from a pipelined ingest),
+        # hand back finished assets in order, and keep at most one asset per
+        # worker queued behind the running ones
+        pending = deque()
+        for asset_id in asset_ids:
+            pending.append((asset_id, executor.submit(_build_to_ipc, asset_id, builders(asset_id), loader, out_dir)))
+            while pending and (len(pending) >= 2 * workers or pending[0][1].done()):
+                yield _read_built(*pending.popleft())
+        while pending:
+            yield _read_built(*pending.popleft())
+
+
+def _read_built(asset_id: str, future) -> tuple[str, dict[str, pa.Table]]:
+    paths = future.result()
+    return asset_id, {dataset_id: read_ipc(Path(path)) for dataset_id, path in paths.items()}
+
+
+def run_builders(asset_ids: Iterable[str], builders: list[Builder],
+                 loader: Callable[[str], Any] = load_raw_table, workers: int = None,
+                 worker_memory_mb: int = None) -> dict[str, pa.Table]:
+    """Scan raw assets once, feeding each to every builder, then validate and upload.
+
+    Args:
+        asset_ids: Raw assets to scan, in order; may be a lazy iterator such as
+            subsets_utils.pipeline.stream_assets(), consumed as ids arrive
+        builders: Builders sharing this source
+        loader: Loads one raw asset (default: memory-mapped Arrow table)
+        workers: Worker processes for per-asset transforms (1 = in-process)
+        worker_memory_mb: Heap limit per worker process (0 = unlimited)
+
+    Returns:
+        Dict of dataset_id -> final table, for the builders that were not skipped
+    """
+    if workers is None:
+        workers = int(os.environ.get('TRANSFORM_WORKERS', os.cpu_count() or 1))
+    if worker_memory_mb is None:
+        worker_memory_mb = int(os.environ.get('TRANSFORM_WORKER_MEMORY_MB', '0'))
+
+    results = {}
+    uploaded = {builder.dataset_id: load_state(builder.dataset_id).get("fingerprints", {}) for builder in builders}
+
+    # Skipping whole builders needs every input up front; a lazy iterator is only skipped per asset
+    if isinstance(asset_ids, (list, tuple)):
+        memoized = [builder for builder in builders
+                    if _is_memoized(builder, asset_ids, uploaded[builder.dataset_id])]
+        for builder in memoized:
+            print(f"  {builder.dataset_id}: inputs, code and parameters unchanged, skipping")
+        builders = [builder for builder in builders if builder not in memoized]
+        if not builders:
+            return results
+
+    partial = {builder.dataset_id for builder in builders if _keeps_partitions(builder) or _keeps_parts(builder)}
+    parts = {builder.dataset_id: [] for builder in builders}
+    fingerprints = {builder.dataset_id: {} for builder in builders}
+    needed = {}
+
+    def to_build(asset_ids: Iterable[str]) -> Iterator[str]:
+        """Fingerprint each asset as it arrives and pass on the ones some builder has to transform."""
+        for asset_id in asset_ids:
+            needed[asset_id] = []
+            for builder in builders:
+                current = _fingerprint(builder, asset_id)
+                fingerprints[builder.dataset_id][asset_id] = current
+                if not (builder.dataset_id in partial and current is not None
+                        and uploaded[builder.dataset_id].get(asset_id) == current):
+                    needed[asset_id].append(builder)
+            if needed[asset_id]:
+                yield asset_id
+            else:
+                del needed[asset_id]
+                print(f"  Skipped {asset_id}: unchanged for every builder")
+
+    # Worker outputs are memory-mapped until upload, so keep them until then
+    with tempfile.TemporaryDirectory(prefix="transform-") as out_dir:
+        if workers > 1:
+            print(f"  Transforming with {workers} worker processes")
+            built = _build_in_pool(to_build(asset_ids), needed.pop, loader, workers, worker_memory_mb, out_dir)
+        else:
+            built = _build_in_process(to_build(asset_ids), needed.pop, loader)
+
+        for asset_id, tables in built:
+            print(f"  Processed {asset_id}")
+            for dataset_id, table in tables.items():
+                parts[dataset_id].append((asset_id, table))
+                print(f"    -> {dataset_id}: {len(table):,} rows")
+
+        for builder in builders:
+            built_parts = parts.pop(builder.dataset_id)
+            kept = len(fingerprints[builder.dataset_id]) - len(built_parts)
+            if builder.dataset_id in partial and not built_parts:
+                print(f"  {builder.dataset_id}: inputs, code and parameters unchanged, skipping")
+                continue
+            by_key = builder.keep_parts and builder.dataset_id in partial
+            if by_key:
+                table = _combine_changed_keys(builder, built_parts)
+            else:
+                table = builder.combine([part for _, part in built_parts])
+            print(f"  {builder.dataset_id} total: {len(table):,} records" + (f" from {len(built_parts)} changed inputs" if kept else ""))
+            if builder.partition_by and builder.mode in ("overwrite", "merge"):
+                builder.partitions = _changed_partitions(builder, built_parts, fingerprints[builder.dataset_id],
+                                                         uploaded[builder.dataset_id])
+            if by_key:
+                builder.test(_with_stored_keys(builder, table))
+            else:
+                builder.test(_with_stored_partitions(builder, table) if kept else table)
+            builder.upload(table)
+            if builder.keep_parts:
+                _upload_parts(builder, built_parts, by_key)
+            save_state(builder.dataset_id, {"fingerprints": fingerprints[builder.dataset_id]})
+            results[builder.dataset_id] = table
+
+    return results
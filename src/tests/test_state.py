@@ -0,0 +1,113 @@
+"""StateStore flushes and concurrent saves.
+
+Run from the repository root with the dev dependencies: uv run pytest
+"""
+
+import threading
+import time
+from subsets_utils import json_codec, state
+from subsets_utils.r2 import PreconditionFailed
+
+SAVES_PER_THREAD = 200
+
+
+class FakeBucket:
+    """In-memory object store with R2's conditional PUT semantics."""
+
+    def __init__(self):
+        self.objects = {}
+        self.version = 0
+        self.lock = threading.Lock()
+
+    def upload_bytes_with_etag(self, data: bytes, key: str, if_match: str = None, if_none_match: str = None) -> str:
+        # Widen the window between sending the request and its commit, as a real PUT would
+        time.sleep(0.0005)
+        with self.lock:
+            current = self.objects.get(key)
+            etag = current[1] if current else None
+            if (if_match and etag != if_match) or (if_none_match == '*' and etag is not None):
+                raise PreconditionFailed(key)
+            self.version += 1
+            self.objects[key] = (data, f"etag-{self.version}")
+            return self.objects[key][1]
+
+    def download_bytes_with_etag(self, key: str):
+        with self.lock:
+            return self.objects.get(key, (None, None))
+
+
+def _save_concurrently(store: state.StateStore) -> list[BaseException]:
+    """Save from two threads, each to its own asset and to a shared one; return what they raised."""
+    errors = []
+    start = threading.Barrier(2)
+
+    def worker(name: str) -> None:
+        try:
+            start.wait()
+            for i in range(SAVES_PER_THREAD):
+                store.save(name, {"count": i})
+                store.save("shared", {"writer": name, "count": i})
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def test_concurrent_saves_local(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATA_DIR", str(tmp_path))
+    monkeypatch.delenv("CI", raising=False)
+    store = state.StateStore(flush_every=10, flush_seconds=60)
+
+    assert _save_concurrently(store) == []
+
+    for name in ("a", "b"):
+        with open(tmp_path / "state" / f"{name}.json", 'rb') as f:
+            assert json_codec.loads(f.read())["count"] == SAVES_PER_THREAD - 1
+    with open(tmp_path / "state" / "shared.json", 'rb') as f:
+        assert json_codec.loads(f.read())["count"] == SAVES_PER_THREAD - 1
+    assert not list((tmp_path / "state").glob("*.tmp"))
+
+
+def _cloud_bucket(monkeypatch) -> FakeBucket:
+    """Point the state module at an in-memory bucket, as in cloud mode."""
+    bucket = FakeBucket()
+    monkeypatch.setattr(state, "is_cloud_mode", lambda: True)
+    monkeypatch.setattr(state, "get_connector_name", lambda: "test")
+    monkeypatch.setattr(state, "get_bucket_name", lambda: "bucket")
+    monkeypatch.setattr(state, "upload_bytes_with_etag", bucket.upload_bytes_with_etag)
+    monkeypatch.setattr(state, "download_bytes_with_etag", bucket.download_bytes_with_etag)
+    return bucket
+
+
+def test_concurrent_saves_cloud(monkeypatch):
+    bucket = _cloud_bucket(monkeypatch)
+    store = state.StateStore(flush_every=3, flush_seconds=60)
+
+    # Unlocked, two flushes race from the same ETag and the loser raises StateConflict
+    assert _save_concurrently(store) == []
+    store.flush()
+
+    for name in ("a", "b"):
+        data, _ = bucket.download_bytes_with_etag(f"test/data/state/{name}.json")
+        assert json_codec.loads(data)["count"] == SAVES_PER_THREAD - 1
+    data, _ = bucket.download_bytes_with_etag("test/data/state/shared.json")
+    assert json_codec.loads(data) == store.load("shared")
+
+
+def test_pending_saves_flush_on_timer(monkeypatch):
+    bucket = _cloud_bucket(monkeypatch)
+    store = state.StateStore(flush_every=100, flush_seconds=0.05)
+
+    store.save("a", {"count": 1})
+    assert bucket.download_bytes_with_etag("test/data/state/a.json") == (None, None)
+
+    # No further save comes, so only the timer can write it
+    time.sleep(0.5)
+    data, _ = bucket.download_bytes_with_etag("test/data/state/a.json")
+    assert json_codec.loads(data)["count"] == 1
+    assert store._timer is None
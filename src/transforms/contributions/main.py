@@ -0,0 +1,192 @@
+"""Transform LDA contribution reports into lda_contributions and lda_contribution_items.
+
+LD-203 reports are filed semiannually by every registrant and lobbyist,
+listing FECA, honorary and presidential-library contributions. Each report
+becomes one row in lda_contributions; each contribution item listed on a
+report becomes one row in lda_contribution_items.
+"""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from subsets_utils import raw_column, raw_list
+from subsets_utils.transform import Builder, run_builders
+from utils import (
+    CONTRIBUTION_YEARS, CATEGORY, AMOUNT_TYPE, UUID_TYPE, load_contributions,
+    parse_amount, parse_date, parse_uuid, full_name, list_positions,
+)
+from .test import test, test_items
+
+DATASET_ID = "lda_contributions"
+ITEMS_DATASET_ID = "lda_contribution_items"
+
+METADATA = {
+    "id": DATASET_ID,
+    "title": "LDA Contribution Reports",
+    "description": "LD-203 contribution reports from the US Senate. Each row is one semiannual report filed by a registrant or an individual lobbyist, with the number and total of the contributions it lists. Reports with no contributions are included.",
+    "column_descriptions": {
+        "filing_uuid": "Unique identifier for the report (UUID as 16 raw bytes)",
+        "filing_year": "Year of the report",
+        "filing_period": "Reporting period (mid_year or year_end)",
+        "filing_type": "Filing type code (MM=Mid-Year, YY=Year-End, amendments end in A)",
+        "filing_type_display": "Human-readable filing type",
+        "filer_type": "Who filed the report (lobbyist or organization)",
+        "posted_date": "Date the report was posted",
+        "registrant_id": "Unique ID of the registrant (lobbying firm)",
+        "registrant_name": "Name of the registrant (lobbying firm)",
+        "lobbyist_id": "Unique ID of the filing lobbyist (null for organization reports)",
+        "lobbyist_name": "Name of the filing lobbyist",
+        "no_contributions": "True if the filer reported no contributions",
+        "pacs": "PACs established or controlled by the filer",
+        "item_count": "Number of contribution items listed on the report",
+        "total_amount": "Sum of the listed contribution amounts in USD (null if none listed)",
+    }
+}
+
+ITEMS_METADATA = {
+    "id": ITEMS_DATASET_ID,
+    "title": "LDA Contribution Items",
+    "description": "Individual contributions listed on LD-203 reports. Each row is one contribution, with payee, honoree, amount, date and contribution type. Join to lda_contributions on filing_uuid for the filer.",
+    "column_descriptions": {
+        "filing_uuid": "Unique identifier of the parent report (UUID as 16 raw bytes)",
+        "item_index": "Position of the item on its report (0-based)",
+        "filing_year": "Year of the report",
+        "registrant_id": "Unique ID of the registrant (lobbying firm)",
+        "lobbyist_id": "Unique ID of the filing lobbyist (null for organization reports)",
+        "contribution_type": "Contribution type code (feca, he=honorary expense, pic=presidential library/inaugural)",
+        "contribution_type_display": "Human-readable contribution type",
+        "contributor_name": "Name of the contributor",
+        "payee_name": "Name of the recipient",
+        "honoree_name": "Name of the person honored or the candidate supported",
+        "amount": "Amount in USD",
+        "contribution_date": "Date of the contribution",
+    }
+}
+
+SCHEMA = pa.schema([
+    ("filing_uuid", UUID_TYPE),
+    ("filing_year", pa.int16()),
+    ("filing_period", CATEGORY),
+    ("filing_type", CATEGORY),
+    ("filing_type_display", CATEGORY),
+    ("filer_type", CATEGORY),
+    ("posted_date", pa.date32()),
+    ("registrant_id", pa.int64()),
+    ("registrant_name", CATEGORY),
+    ("lobbyist_id", pa.int64()),
+    ("lobbyist_name", pa.string()),
+    ("no_contributions", pa.bool_()),
+    ("pacs", pa.list_(pa.string())),
+    ("item_count", pa.int32()),
+    ("total_amount", AMOUNT_TYPE),
+])
+
+ITEMS_SCHEMA = pa.schema([
+    ("filing_uuid", UUID_TYPE),
+    ("item_index", pa.int32()),
+    ("filing_year", pa.int16()),
+    ("registrant_id", pa.int64()),
+    ("lobbyist_id", pa.int64()),
+    ("contribution_type", CATEGORY),
+    ("contribution_type_display", CATEGORY),
+    ("contributor_name", pa.string()),
+    ("payee_name", CATEGORY),
+    ("honoree_name", CATEGORY),
+    ("amount", AMOUNT_TYPE),
+    ("contribution_date", pa.date32()),
+])
+
+
+class ContributionsBuilder(Builder):
+    """One row per LD-203 report, built from a raw contributions_{year} table."""
+
+    dataset_id = DATASET_ID
+    metadata = METADATA
+    schema = SCHEMA
+    mode = "overwrite"
+    partition_by = "filing_year"
+
+    def transform(self, reports: pa.Table, asset_id: str) -> pa.Table:
+        lobbyist_name, has_name = full_name(
+            raw_column(reports, "lobbyist.first_name"), raw_column(reports, "lobbyist.last_name")
+        )
+
+        # Per-report count and total, aggregated from the exploded items
+        items_column = raw_column(reports, "contribution_items")
+        parents, items = raw_list(reports, "contribution_items")
+        totals = (
+            pa.table({"report": parents, "amount": parse_amount(raw_column(items, "amount"))})
+            .group_by("report")
+            .aggregate([("amount", "sum")])
+        )
+        total_amount = pa.nulls(len(reports), AMOUNT_TYPE)
+        if len(totals):
+            positions = pc.index_in(pa.array(range(len(reports)), pa.int64()), value_set=totals["report"])
+            total_amount = pc.take(totals["amount_sum"], positions)
+
+        return pa.table({
+            "filing_uuid": parse_uuid(raw_column(reports, "filing_uuid")),
+            "filing_year": raw_column(reports, "filing_year"),
+            "filing_period": raw_column(reports, "filing_period"),
+            "filing_type": raw_column(reports, "filing_type"),
+            "filing_type_display": raw_column(reports, "filing_type_display"),
+            "filer_type": raw_column(reports, "filer_type"),
+            "posted_date": parse_date(raw_column(reports, "dt_posted")),
+            "registrant_id": raw_column(reports, "registrant.id"),
+            "registrant_name": raw_column(reports, "registrant.name"),
+            "lobbyist_id": raw_column(reports, "lobbyist.id"),
+            "lobbyist_name": pc.if_else(has_name, lobbyist_name, None),
+            "no_contributions": raw_column(reports, "no_contributions"),
+            "pacs": raw_column(reports, "pacs"),
+            "item_count": pc.fill_null(pc.list_value_length(items_column), 0),
+            "total_amount": total_amount,
+        })
+
+    def test(self, table: pa.Table) -> None:
+        test(table)
+
+
+class ContributionItemsBuilder(Builder):
+    """One row per contribution item, exploded from a raw contributions_{year} table."""
+
+    dataset_id = ITEMS_DATASET_ID
+    metadata = ITEMS_METADATA
+    schema = ITEMS_SCHEMA
+    mode = "overwrite"
+    partition_by = "filing_year"
+
+    def transform(self, reports: pa.Table, asset_id: str) -> pa.Table:
+        # One row per item, with the index of its parent report
+        parents, items = raw_list(reports, "contribution_items")
+        if not len(parents):
+            return self.schema.empty_table()
+
+        return pa.table({
+            "filing_uuid": pc.take(parse_uuid(raw_column(reports, "filing_uuid")), parents),
+            "item_index": list_positions(raw_column(reports, "contribution_items")),
+            "filing_year": pc.take(raw_column(reports, "filing_year"), parents),
+            "registrant_id": pc.take(raw_column(reports, "registrant.id"), parents),
+            "lobbyist_id": pc.take(raw_column(reports, "lobbyist.id"), parents),
+            "contribution_type": raw_column(items, "contribution_type"),
+            "contribution_type_display": raw_column(items, "contribution_type_display"),
+            "contributor_name": raw_column(items, "contributor_name"),
+            "payee_name": raw_column(items, "payee_name"),
+            "honoree_name": raw_column(items, "honoree_name"),
+            "amount": parse_amount(raw_column(items, "amount")),
+            "contribution_date": parse_date(raw_column(items, "date")),
+        })
+
+    def test(self, table: pa.Table) -> None:
+        test_items(table)
+
+
+def run():
+    """Transform, validate, and upload both datasets."""
+    run_builders(
+        [f"contributions_{year}" for year in CONTRIBUTION_YEARS],
+        [ContributionsBuilder(), ContributionItemsBuilder()],
+        loader=load_contributions,
+    )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,72 @@
+"""Validation for LDA contribution datasets."""
+
+import pyarrow as pa
+from subsets_utils import validate
+from subsets_utils.testing import assert_valid_uuid, assert_in_range, assert_positive
+
+
+def test(table: pa.Table) -> None:
+    """Validate LDA contribution reports output."""
+    validate(table, {
+        "columns": {
+            "filing_uuid": "binary",
+            "filing_year": "int",
+            "filing_period": "string",
+            "filing_type": "string",
+            "filing_type_display": "string",
+            "filer_type": "string",
+            "posted_date": "date",
+            "registrant_id": "int",
+            "registrant_name": "string",
+            "lobbyist_id": "int",
+            "lobbyist_name": "string",
+            "no_contributions": "bool",
+            "pacs": "list",
+            "item_count": "int",
+            "total_amount": "decimal",
+        },
+        "not_null": ["filing_uuid", "filing_year", "filing_type", "item_count"],
+        "unique": ["filing_uuid"],
+        "min_rows": 100,
+    })
+
+    assert_valid_uuid(table, "filing_uuid")
+
+    # LD-203 reporting started in 2008
+    assert_in_range(table, "filing_year", 2008, 2030)
+
+    assert_positive(table, "item_count")
+
+    print(f"    Validated {len(table):,} contribution reports")
+
+
+def test_items(table: pa.Table) -> None:
+    """Validate LDA contribution items output."""
+    validate(table, {
+        "columns": {
+            "filing_uuid": "binary",
+            "item_index": "int",
+            "filing_year": "int",
+            "registrant_id": "int",
+            "lobbyist_id": "int",
+            "contribution_type": "string",
+            "contribution_type_display": "string",
+            "contributor_name": "string",
+            "payee_name": "string",
+            "honoree_name": "string",
+            "amount": "decimal",
+            "contribution_date": "date",
+        },
+        "not_null": ["filing_uuid", "item_index", "filing_year"],
+        "unique": ["filing_uuid", "item_index"],
+        "min_rows": 100,
+    })
+
+    assert_in_range(table, "filing_year", 2008, 2030)
+
+    # Contribution types are short codes
+    types = set(table.column("contribution_type").to_pylist())
+    types.discard(None)
+    assert all(len(t) <= 10 for t in types), f"Unexpected contribution types: {types}"
+
+    print(f"    Validated {len(table):,} contribution items across {len(types)} types")
@@ -0,0 +1,161 @@
+"""Transform LDA filings into lda_current_filings dataset.
+
+Amendments are filed as separate filings (1A-4A, MA, YA, RA) next to the
+report they amend, so summing lda_filings counts a period's income or
+expenses once per version. lda_current_filings keeps only the latest
+version of each filing: one row per registrant, client, year, period and
+kind (registration or report), chosen by posted date with amendments
+winning ties.
+
+Each key is hashed to version_key. Every year is reduced to its latest
+versions with a hash aggregation (once per year; current_versions() is
+shared with the builders that count only current filings), and combine()
+reduces across years the same way. The key includes the filing year, so
+the table is partitioned by filing_year and only the years whose raw input
+changed are transformed. Their rows are merged on version_key in one
+commit: a stored row is rewritten only if its row_hash differs (a new
+version, a re-fetched filing whose fields changed, a name resolved to
+another organization), and stored keys of those years that no longer
+occur are deleted. A run that adds a few amendments rewrites a few rows
+rather than the whole table.
+"""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from subsets_utils import raw_column, upload_data, decode_dictionaries
+from subsets_utils.publish import publish
+from subsets_utils.transform import Builder, per_asset, run_builders
+from utils import YEARS, load_filings, text_key
+from transforms.filings.main import FilingsBuilder, filings_table, SCHEMA as FILINGS_SCHEMA
+from .test import test
+
+DATASET_ID = "lda_current_filings"
+
+METADATA = {
+    "id": DATASET_ID,
+    "title": "LDA Current Filings",
+    "description": "Latest version of each LDA filing. Amendments replace the filing they amend, so each registrant, client, year and period (registrations and reports separately) has exactly one row. Use this instead of lda_filings when summing income or expenses.",
+    "column_descriptions": {
+        "version_key": "Hash of registrant, client, year, period and kind; one row per key",
+        **FilingsBuilder.metadata["column_descriptions"],
+        "is_amendment": "True if the current version is an amendment",
+        "version_count": "Number of versions (original plus amendments) filed for this key",
+        "row_hash": "Hash of every other column except version_key; changes whenever the row does",
+    }
+}
+
+SCHEMA = pa.schema([
+    ("version_key", pa.int64()),
+    *FILINGS_SCHEMA,
+    ("is_amendment", pa.bool_()),
+    ("version_count", pa.int64()),
+    ("row_hash", pa.int64()),
+])
+
+def _version_key(filings: pa.Table) -> pa.ChunkedArray:
+    """Hash of (registrant, client, year, period, registration or report) per filing."""
+    kind = pc.if_else(pc.starts_with(pc.fill_null(raw_column(filings, "filing_type"), ""), "R"), "registration", "report")
+    parts = [
+        raw_column(filings, "registrant.id"),
+        raw_column(filings, "client.id"),
+        raw_column(filings, "filing_year"),
+        raw_column(filings, "filing_period"),
+        kind,
+    ]
+    return text_key(pc.binary_join_element_wise(*(pc.fill_null(pc.cast(p, pa.string()), "") for p in parts), "|"))
+
+
+def _reduce(versions: pa.Table) -> pa.Table:
+    """Keep the latest version per version_key and count the versions.
+
+    Args:
+        versions: SCHEMA rows, several per version_key allowed
+    """
+    # Newest first (nulls last), amendments before originals posted the same day
+    versions = versions.sort_by([
+        ("posted_date", "descending"), ("is_amendment", "descending"), ("filing_uuid", "descending"),
+    ])
+    # Aggregate row positions rather than every column; "first" has no decimal kernel
+    rows = pa.table({
+        "version_key": versions["version_key"],
+        "row": pc.subtract(pc.cumulative_sum(pa.repeat(1, len(versions)).cast(pa.int64())), 1),
+        "version_count": versions["version_count"],
+    })
+    reduced = rows.group_by("version_key", use_threads=False).aggregate([("row", "first"), ("version_count", "sum")])
+    current = versions.take(reduced["row_first"])
+    return current.set_column(current.schema.get_field_index("version_count"), "version_count", reduced["version_count_sum"])
+
+
+def _row_hash(current: pa.Table) -> pa.ChunkedArray:
+    """Hash of each row's columns other than version_key and row_hash."""
+    columns = decode_dictionaries(current.drop_columns(["version_key", "row_hash"]))
+    values = [
+        column.cast(pa.binary()) if pa.types.is_binary(column.type) or pa.types.is_fixed_size_binary(column.type)
+        else column.cast(pa.string()).cast(pa.binary())
+        for column in columns.columns
+    ]
+    # Nulls become a byte no text or number starts with, so null and "" hash apart
+    joined = pc.binary_join_element_wise(*values, b"\x1f", null_handling="replace", null_replacement=b"\x00")
+    return text_key(joined)
+
+
+@per_asset
+def current_versions(filings: pa.Table, asset_id: str) -> tuple[pa.Table, pa.Table]:
+    """Reduce a raw filings_{year} table to the current version of each filing.
+
+    Computed once per loaded year and shared by CurrentFilingsBuilder and
+    the builders that count only current versions.
+
+    Returns:
+        (raw filings that are current versions, their lda_current_filings
+        rows in the same order, with row_hash left null)
+    """
+    versions = filings_table(filings, asset_id)
+    versions = versions.add_column(0, "version_key", _version_key(filings)).append_column(
+        "is_amendment", pc.ends_with(pc.fill_null(raw_column(filings, "filing_type"), ""), "A")
+    ).append_column("version_count", pa.repeat(1, len(versions)).cast(pa.int64())
+    ).append_column("row_hash", pa.nulls(len(versions), pa.int64()))
+    current = _reduce(versions.filter(pc.is_valid(versions["filing_uuid"])))
+
+    is_current = pc.is_in(versions["filing_uuid"], value_set=current["filing_uuid"])
+    filings = filings.filter(is_current)
+    current = current.take(pc.index_in(versions["filing_uuid"].filter(is_current), value_set=current["filing_uuid"]))
+    return filings, current
+
+
+class CurrentFilingsBuilder(Builder):
+    """One row per filing key, reduced per raw filings_{year} table and again across years."""
+
+    dataset_id = DATASET_ID
+    metadata = METADATA
+    schema = SCHEMA
+    mode = "merge"
+    merge_key = "version_key"
+    partition_by = "filing_year"
+
+    def transform(self, filings: pa.Table, asset_id: str) -> pa.Table:
+        return current_versions(filings, asset_id)[1]
+
+    def combine(self, tables: list[pa.Table]) -> pa.Table:
+        if not tables:
+            return self.schema.empty_table()
+        # Hashed once versions are reduced, since version_count can change across years
+        current = _reduce(pa.concat_tables(tables).unify_dictionaries())
+        return current.set_column(current.schema.get_field_index("row_hash"), "row_hash", _row_hash(current))
+
+    def test(self, table: pa.Table) -> None:
+        test(table)
+
+    def upload(self, table: pa.Table) -> None:
+        upload_data(table, self.dataset_id, mode=self.mode, merge_key=self.merge_key,
+                    partition_by=self.partition_by, partitions=self.partitions, compare="row_hash")
+        publish(self.dataset_id, self.metadata)
+
+
+def run():
+    """Transform, validate, and upload dataset."""
+    run_builders([f"filings_{year}" for year in YEARS], [CurrentFilingsBuilder()], loader=load_filings)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,37 @@
+"""Validation for LDA current filings dataset."""
+
+import pyarrow as pa
+from subsets_utils import validate
+from subsets_utils.testing import assert_valid_uuid, assert_in_range, assert_positive
+
+
+def test(table: pa.Table) -> None:
+    """Validate LDA current filings output."""
+    validate(table, {
+        "columns": {
+            "version_key": "int64",
+            "filing_uuid": "binary",
+            "filing_year": "int",
+            "filing_quarter": "string",
+            "filing_type": "string",
+            "posted_date": "date",
+            "registrant_id": "int",
+            "client_id": "int",
+            "client_organization_id": "int64",
+            "income": "decimal",
+            "expenses": "decimal",
+            "is_amendment": "bool",
+            "version_count": "int64",
+            "row_hash": "int64",
+        },
+        "not_null": ["version_key", "filing_uuid", "filing_year", "filing_type", "version_count", "row_hash"],
+        "unique": ["version_key"],
+        "min_rows": 100,
+    })
+
+    assert_in_range(table, "filing_year", 1999, 2030)
+    assert_valid_uuid(table, "filing_uuid")
+    assert_positive(table, "version_count", allow_zero=False)
+
+    amended = table.filter(table["is_amendment"]).num_rows
+    print(f"    Validated {len(table):,} current filings ({amended:,} amended)")
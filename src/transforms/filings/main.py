@@ -5,8 +5,9 @@ Each row represents one lobbying disclosure filing.
 """
 
 import pyarrow as pa
-from subsets_utils import load_raw_json, upload_data, publish
-from utils import YEARS
+from subsets_utils import raw_column
+from subsets_utils.transform import Builder, per_asset, run_builders
+from utils import YEARS, CATEGORY, AMOUNT_TYPE, UUID_TYPE, load_filings, parse_amount, parse_date, parse_uuid, extract_quarter, organization_id
 from .test import test
 
 DATASET_ID = "lda_filings"
@@ -16,18 +17,20 @@ METADATA = {
     "title": "LDA Lobbying Filings",
     "description": "Lobbying Disclosure Act filings from the US Senate. Each row is one filing (LD-1 registration or LD-2 quarterly report). Contains registrant (lobbying firm), client (who paid), and reported amounts. Foreign entities are excluded from this table.",
     "column_descriptions": {
-        "filing_uuid": "Unique identifier for the filing",
+        "filing_uuid": "Unique identifier for the filing (UUID as 16 raw bytes)",
         "filing_year": "Year of the filing",
         "filing_quarter": "Quarter (Q1, Q2, Q3, Q4, or null for registrations)",
         "filing_type": "Filing type code (RR=Registration, Q1-Q4=Quarterly, etc.)",
         "filing_type_display": "Human-readable filing type",
-        "posted_date": "Date the filing was posted (YYYY-MM-DD)",
-        "termination_date": "Date of termination if applicable (YYYY-MM-DD)",
+        "posted_date": "Date the filing was posted",
+        "termination_date": "Date of termination if applicable",
         "registrant_id": "Unique ID of the registrant (lobbying firm)",
         "registrant_name": "Name of the registrant (lobbying firm)",
+        "registrant_organization_id": "Canonical organization of the registrant across name spellings; joins to lda_organization_names",
         "registrant_state": "State where registrant is located (2-letter)",
         "client_id": "Unique ID of the client",
         "client_name": "Name of the client (who paid for lobbying)",
+        "client_organization_id": "Canonical organization of the client across name spellings; joins to lda_organization_names",
         "client_state": "State where client is located (2-letter)",
         "client_country": "Country where client is located (2-letter ISO)",
         "income": "Income reported in USD (for firms lobbying on behalf of clients)",
@@ -35,82 +38,73 @@ METADATA = {
     }
 }
 
-
-def parse_amount(val: str | None) -> float | None:
-    """Parse amount string to float."""
-    if not val:
-        return None
-    try:
-        return float(val.replace(",", ""))
-    except (ValueError, TypeError):
-        return None
-
-
-def parse_date(dt_str: str | None) -> str | None:
-    """Extract YYYY-MM-DD from ISO datetime string."""
-    if not dt_str:
-        return None
-    return dt_str[:10]
-
-
-def extract_quarter(period: str | None) -> str | None:
-    """Extract quarter from filing_period."""
-    if not period:
-        return None
-    mapping = {
-        "first_quarter": "Q1",
-        "second_quarter": "Q2",
-        "third_quarter": "Q3",
-        "fourth_quarter": "Q4",
-        "mid_year": None,  # Registrations
-    }
-    return mapping.get(period)
+SCHEMA = pa.schema([
+    ("filing_uuid", UUID_TYPE),
+    ("filing_year", pa.int16()),
+    ("filing_quarter", CATEGORY),
+    ("filing_type", CATEGORY),
+    ("filing_type_display", CATEGORY),
+    ("posted_date", pa.date32()),
+    ("termination_date", pa.date32()),
+    ("registrant_id", pa.int64()),
+    ("registrant_name", CATEGORY),
+    ("registrant_organization_id", pa.int64()),
+    ("registrant_state", CATEGORY),
+    ("client_id", pa.int64()),
+    ("client_name", CATEGORY),
+    ("client_organization_id", pa.int64()),
+    ("client_state", CATEGORY),
+    ("client_country", CATEGORY),
+    ("income", AMOUNT_TYPE),
+    ("expenses", AMOUNT_TYPE),
+])
+
+
+@per_asset
+def filings_table(filings: pa.Table, asset_id: str) -> pa.Table:
+    """lda_filings rows of a raw filings_{year} table, in raw order (shared by the builders derived from it)."""
+    # Whole-column kernels over the cached Arrow table; no per-filing Python
+    return pa.table({
+        "filing_uuid": parse_uuid(raw_column(filings, "filing_uuid")),
+        "filing_year": raw_column(filings, "filing_year"),
+        "filing_quarter": extract_quarter(raw_column(filings, "filing_period")),
+        "filing_type": raw_column(filings, "filing_type"),
+        "filing_type_display": raw_column(filings, "filing_type_display"),
+        "posted_date": parse_date(raw_column(filings, "dt_posted")),
+        "termination_date": parse_date(raw_column(filings, "termination_date")),
+        "registrant_id": raw_column(filings, "registrant.id"),
+        "registrant_name": raw_column(filings, "registrant.name"),
+        "registrant_organization_id": organization_id(raw_column(filings, "registrant.name")),
+        "registrant_state": raw_column(filings, "registrant.state"),
+        "client_id": raw_column(filings, "client.id"),
+        "client_name": raw_column(filings, "client.name"),
+        "client_organization_id": organization_id(raw_column(filings, "client.name")),
+        "client_state": raw_column(filings, "client.state"),
+        "client_country": raw_column(filings, "client.country"),
+        "income": parse_amount(raw_column(filings, "income")),
+        "expenses": parse_amount(raw_column(filings, "expenses")),
+    }).cast(SCHEMA)
+
+
+class FilingsBuilder(Builder):
+    """One row per filing, built from a raw filings_{year} table."""
+
+    dataset_id = DATASET_ID
+    metadata = METADATA
+    schema = SCHEMA
+    mode = "overwrite"
+    partition_by = "filing_year"
+
+    def transform(self, filings: pa.Table, asset_id: str) -> pa.Table:
+        return filings_table(filings, asset_id)
+
+    def test(self, table: pa.Table) -> None:
+        test(table)
 
 
 def run():
     """Transform, validate, and upload dataset."""
-    all_records = []
-
-    # Process all years
-    for year in YEARS:
-        print(f"  Processing filings_{year}...")
-
-        filings = load_raw_json(f"filings_{year}")
-
-        for filing in filings:
-            registrant = filing.get("registrant") or {}
-            client = filing.get("client") or {}
-
-            record = {
-                "filing_uuid": filing.get("filing_uuid"),
-                "filing_year": filing.get("filing_year"),
-                "filing_quarter": extract_quarter(filing.get("filing_period")),
-                "filing_type": filing.get("filing_type"),
-                "filing_type_display": filing.get("filing_type_display"),
-                "posted_date": parse_date(filing.get("dt_posted")),
-                "termination_date": filing.get("termination_date"),
-                "registrant_id": registrant.get("id"),
-                "registrant_name": registrant.get("name"),
-                "registrant_state": registrant.get("state"),
-                "client_id": client.get("id"),
-                "client_name": client.get("name"),
-                "client_state": client.get("state"),
-                "client_country": client.get("country"),
-                "income": parse_amount(filing.get("income")),
-                "expenses": parse_amount(filing.get("expenses")),
-            }
-            all_records.append(record)
-
-        print(f"    -> {len(filings):,} filings")
-
-    print(f"  Total: {len(all_records):,} records")
-
-    table = pa.Table.from_pylist(all_records)
-
-    test(table)
-
-    upload_data(table, DATASET_ID)
-    publish(DATASET_ID, METADATA)
+    run_builders([f"filings_{year}" for year in YEARS], [FilingsBuilder()], loader=load_filings)
 
 
 if __name__ == "__main__":
@@ -2,29 +2,31 @@
 
 import pyarrow as pa
 from subsets_utils import validate
-from subsets_utils.testing import assert_valid_date, assert_max_length, assert_in_range
+from subsets_utils.testing import assert_valid_date, assert_valid_uuid, assert_max_length, assert_in_range
 
 
 def test(table: pa.Table) -> None:
     """Validate LDA filings output."""
     validate(table, {
         "columns": {
-            "filing_uuid": "string",
+            "filing_uuid": "binary",
             "filing_year": "int",
             "filing_quarter": "string",
             "filing_type": "string",
             "filing_type_display": "string",
-            "posted_date": "string",
-            "termination_date": "string",
+            "posted_date": "date",
+            "termination_date": "date",
             "registrant_id": "int",
             "registrant_name": "string",
+            "registrant_organization_id": "int64",
             "registrant_state": "string",
             "client_id": "int",
             "client_name": "string",
+            "client_organization_id": "int64",
             "client_state": "string",
             "client_country": "string",
-            "income": "double",
-            "expenses": "double",
+            "income": "decimal",
+            "expenses": "decimal",
         },
         "not_null": ["filing_uuid", "filing_year", "filing_type"],
         "unique": ["filing_uuid"],
@@ -34,6 +36,9 @@ def test(table: pa.Table) -> None:
     # Filing year should be reasonable
     assert_in_range(table, "filing_year", 1999, 2030)
 
+    # UUIDs stored as 16 raw bytes
+    assert_valid_uuid(table, "filing_uuid")
+
     # Posted date format
     assert_valid_date(table, "posted_date")
 
@@ -0,0 +1,160 @@
+"""Transform LDA filings into lda_government_entities and lda_activity_government_entities.
+
+lda_government_entities is a small dimension with one row per government
+entity ID (House, Senate, agencies). lda_activity_government_entities is a
+bridge of integer keys linking each lobbying activity to the entities
+lobbied, so "all lobbying of the FCC" is a filtered key join rather than an
+unnest of the government_entities list column.
+
+Like lda_lobbyists, the dimension is reduced per year with a hash
+aggregation, reduced again across years, and merged into Delta on
+entity_id; only the entities of years whose raw input changed are
+re-reduced and merged.
+"""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from subsets_utils import raw_column, raw_list
+from subsets_utils.transform import Builder, run_builders
+from utils import YEARS, load_filings, explode_activities
+from .test import test, test_bridge
+
+DATASET_ID = "lda_government_entities"
+BRIDGE_DATASET_ID = "lda_activity_government_entities"
+
+METADATA = {
+    "id": DATASET_ID,
+    "title": "LDA Government Entities",
+    "description": "Government entities (chambers of Congress, agencies, departments) named as lobbied on LDA activity reports. Each row is one entity ID. Join to lda_activity_government_entities on entity_id for the activities that lobbied it.",
+    "column_descriptions": {
+        "entity_id": "Unique ID of the government entity",
+        "name": "Name of the government entity (as most recently reported)",
+        "first_filing_year": "Earliest filing year the entity was lobbied",
+        "last_filing_year": "Latest filing year the entity was lobbied",
+    }
+}
+
+BRIDGE_METADATA = {
+    "id": BRIDGE_DATASET_ID,
+    "title": "LDA Activity Government Entities",
+    "description": "Bridge between lobbying activities and the government entities they lobbied. Each row links one activity_id (lda_lobbying_activities) to one entity_id (lda_government_entities).",
+    "column_descriptions": {
+        "activity_id": "Key of the lobbying activity",
+        "entity_id": "Key of the government entity",
+        "filing_year": "Year of the filing",
+    }
+}
+
+SCHEMA = pa.schema([
+    ("entity_id", pa.int64()),
+    ("name", pa.string()),
+    ("first_filing_year", pa.int16()),
+    ("last_filing_year", pa.int16()),
+])
+
+BRIDGE_SCHEMA = pa.schema([
+    ("activity_id", pa.int64()),
+    ("entity_id", pa.int64()),
+    ("filing_year", pa.int16()),
+])
+
+
+def _mentions(filings: pa.Table) -> pa.Table:
+    """One row per government entity listed on an activity, with its activity_id and filing year."""
+    filing_index, activities, activity_id = explode_activities(filings)
+    activity_index, entities = raw_list(activities, "government_entities")
+    if not len(activity_index):
+        return pa.table({
+            "activity_id": pa.array([], pa.int64()),
+            "entity_id": pa.array([], pa.int64()),
+            "filing_year": pa.array([], pa.int64()),
+            "name": pa.array([], pa.string()),
+        })
+
+    table = pa.table({
+        "activity_id": pc.take(activity_id, activity_index),
+        "entity_id": raw_column(entities, "id"),
+        "filing_year": pc.take(pc.take(raw_column(filings, "filing_year"), filing_index), activity_index),
+        "name": raw_column(entities, "name"),
+    })
+    return table.filter(pc.is_valid(table["entity_id"]))
+
+
+def _reduce(entities: pa.Table) -> pa.Table:
+    """Collapse entity rows (entity_id, name, first/last_filing_year) to one per entity_id."""
+    # Latest appearance first, so "first" picks the most recently reported name
+    entities = entities.sort_by([("last_filing_year", "descending")])
+    reduced = entities.group_by("entity_id", use_threads=False).aggregate([
+        ("name", "first"), ("first_filing_year", "min"), ("last_filing_year", "max"),
+    ])
+    return pa.table({
+        "entity_id": reduced["entity_id"],
+        "name": reduced["name_first"],
+        "first_filing_year": reduced["first_filing_year_min"],
+        "last_filing_year": reduced["last_filing_year_max"],
+    })
+
+
+class GovernmentEntitiesBuilder(Builder):
+    """One row per government entity, reduced per raw filings_{year} table and again across years."""
+
+    dataset_id = DATASET_ID
+    metadata = METADATA
+    schema = SCHEMA
+    mode = "merge"
+    merge_key = "entity_id"
+    keep_parts = True
+
+    def transform(self, filings: pa.Table, asset_id: str) -> pa.Table:
+        mentions = _mentions(filings)
+        return _reduce(pa.table({
+            "entity_id": mentions["entity_id"],
+            "name": mentions["name"],
+            "first_filing_year": mentions["filing_year"],
+            "last_filing_year": mentions["filing_year"],
+        }))
+
+    def combine(self, tables: list[pa.Table]) -> pa.Table:
+        if not tables:
+            return self.schema.empty_table()
+        return _reduce(pa.concat_tables(tables)).cast(self.schema)
+
+    def test(self, table: pa.Table) -> None:
+        test(table)
+
+
+class ActivityGovernmentEntitiesBuilder(Builder):
+    """One row per (activity, entity) pair, built from a raw filings_{year} table."""
+
+    dataset_id = BRIDGE_DATASET_ID
+    metadata = BRIDGE_METADATA
+    schema = BRIDGE_SCHEMA
+    mode = "overwrite"
+    partition_by = "filing_year"
+
+    def transform(self, filings: pa.Table, asset_id: str) -> pa.Table:
+        mentions = _mentions(filings)
+
+        # An entity listed twice on one activity yields one bridge row
+        pairs = mentions.group_by(["activity_id", "entity_id"], use_threads=False).aggregate([("filing_year", "first")])
+        return pa.table({
+            "activity_id": pairs["activity_id"],
+            "entity_id": pairs["entity_id"],
+            "filing_year": pairs["filing_year_first"],
+        })
+
+    def test(self, table: pa.Table) -> None:
+        test_bridge(table)
+
+
+def run():
+    """Transform, validate, and upload both datasets."""
+    run_builders(
+        [f"filings_{year}" for year in YEARS],
+        [GovernmentEntitiesBuilder(), ActivityGovernmentEntitiesBuilder()],
+        loader=load_filings,
+    )
+
+
+if __name__ == "__main__":
+    run()
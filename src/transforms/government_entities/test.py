@@ -0,0 +1,47 @@
+"""Validation for LDA government entity datasets."""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from subsets_utils import validate
+from subsets_utils.testing import assert_in_range
+
+
+def test(table: pa.Table) -> None:
+    """Validate LDA government entities dimension."""
+    validate(table, {
+        "columns": {
+            "entity_id": "int64",
+            "name": "string",
+            "first_filing_year": "int",
+            "last_filing_year": "int",
+        },
+        "not_null": ["entity_id", "first_filing_year", "last_filing_year"],
+        "unique": ["entity_id"],
+        "min_rows": 2,
+    })
+
+    assert_in_range(table, "first_filing_year", 1999, 2030)
+    assert_in_range(table, "last_filing_year", 1999, 2030)
+
+    inverted = pc.sum(pc.greater(table["first_filing_year"], table["last_filing_year"])).as_py()
+    assert not inverted, f"{inverted} entities have first_filing_year after last_filing_year"
+
+    print(f"    Validated {len(table):,} government entities")
+
+
+def test_bridge(table: pa.Table) -> None:
+    """Validate LDA activity-government entity bridge."""
+    validate(table, {
+        "columns": {
+            "activity_id": "int64",
+            "entity_id": "int64",
+            "filing_year": "int",
+        },
+        "not_null": ["activity_id", "entity_id", "filing_year"],
+        "unique": ["activity_id", "entity_id"],
+        "min_rows": 100,
+    })
+
+    assert_in_range(table, "filing_year", 1999, 2030)
+
+    print(f"    Validated {len(table):,} activity-entity links")
@@ -0,0 +1,311 @@
+"""Transform LDA filings into a lobbying network graph.
+
+Nodes are clients, registrants (both as canonical organizations from
+lda_organization_names), lobbyists and government entities. Directed edges
+follow the flow of lobbying, per filing year:
+
+    client -> registrant             filings, with income/expenses as amount
+    registrant -> lobbyist           filings listing the lobbyist
+    lobbyist -> government_entity    filings where the lobbyist's activity
+                                     lobbied the entity
+
+Only the current version of each filing is counted (see
+lda_current_filings), so amendments don't double the weights.
+
+Three tables are written:
+    lda_graph_nodes: dense node_id (0..n-1) for every node
+    lda_graph_edges: edges sorted by (filing_year, src, dst), with
+        edge_index numbering each year's edges from 0
+    lda_graph_adjacency: compressed sparse row pointers; a node's
+        out-edges in a year are edge_index edge_start .. edge_start +
+        degree - 1 of that year, so neighbor lookups cost O(degree)
+
+node_id is dense within one export and is reassigned every run; join on
+node_type and source_id to relate nodes across exports.
+"""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from subsets_utils import raw_column, raw_list, upload_data
+from subsets_utils.publish import publish
+from subsets_utils.transform import Builder, run_builders
+from utils import YEARS, CATEGORY, AMOUNT_TYPE, load_filings, full_name, explode_activities
+from transforms.current_filings.main import current_versions
+from .test import test_nodes, test_edges, test_adjacency
+
+NODES_DATASET_ID = "lda_graph_nodes"
+EDGES_DATASET_ID = "lda_graph_edges"
+ADJACENCY_DATASET_ID = "lda_graph_adjacency"
+
+NODES_METADATA = {
+    "id": NODES_DATASET_ID,
+    "title": "LDA Lobbying Network Nodes",
+    "description": "Nodes of the lobbying network: clients, registrants, lobbyists and government entities, each with a dense integer node_id used by lda_graph_edges and lda_graph_adjacency. node_id is reassigned on every export.",
+    "column_descriptions": {
+        "node_id": "Dense integer ID of the node within this export",
+        "node_type": "client, registrant, lobbyist or government_entity",
+        "source_id": "organization_id (clients, registrants), lobbyist_id or entity_id of the node",
+        "label": "Name of the node",
+    }
+}
+
+EDGES_METADATA = {
+    "id": EDGES_DATASET_ID,
+    "title": "LDA Lobbying Network Edges",
+    "description": "Directed edges of the lobbying network per filing year (client -> registrant -> lobbyist -> government entity), sorted by source node. Use lda_graph_adjacency to find a node's edges by edge_index.",
+    "column_descriptions": {
+        "filing_year": "Year of the filings behind the edge",
+        "edge_index": "Position of the edge in the year's edge list, sorted by (src, dst)",
+        "src": "node_id of the source node",
+        "dst": "node_id of the destination node",
+        "edge_type": "client_registrant, registrant_lobbyist or lobbyist_government_entity",
+        "filing_count": "Number of filings behind the edge",
+        "amount": "Income or expenses reported on those filings in USD (client_registrant edges only)",
+    }
+}
+
+ADJACENCY_METADATA = {
+    "id": ADJACENCY_DATASET_ID,
+    "title": "LDA Lobbying Network Adjacency",
+    "description": "Compressed sparse row index of lda_graph_edges. Each row gives the range of a node's out-edges in one year: edge_index edge_start through edge_start + degree - 1.",
+    "column_descriptions": {
+        "filing_year": "Year of the edges",
+        "node_id": "Source node",
+        "edge_start": "edge_index of the node's first out-edge in that year",
+        "degree": "Number of out-edges of the node in that year",
+    }
+}
+
+# Per-year edges between (type, source_id) nodes, before dense ids are assigned
+KEYED_EDGES_SCHEMA = pa.schema([
+    ("filing_year", pa.int16()),
+    ("src_type", pa.string()),
+    ("src_key", pa.int64()),
+    ("src_label", pa.string()),
+    ("dst_type", pa.string()),
+    ("dst_key", pa.int64()),
+    ("dst_label", pa.string()),
+    ("filing_count", pa.int64()),
+    ("amount", AMOUNT_TYPE),
+])
+
+NODES_SCHEMA = pa.schema([
+    ("node_id", pa.int64()),
+    ("node_type", CATEGORY),
+    ("source_id", pa.int64()),
+    ("label", pa.string()),
+])
+
+EDGES_SCHEMA = pa.schema([
+    ("filing_year", pa.int16()),
+    ("edge_index", pa.int64()),
+    ("src", pa.int64()),
+    ("dst", pa.int64()),
+    ("edge_type", CATEGORY),
+    ("filing_count", pa.int64()),
+    ("amount", AMOUNT_TYPE),
+])
+
+ADJACENCY_SCHEMA = pa.schema([
+    ("filing_year", pa.int16()),
+    ("node_id", pa.int64()),
+    ("edge_start", pa.int64()),
+    ("degree", pa.int64()),
+])
+
+
+def _row_number(n: int) -> pa.Array:
+    return pa.array(range(n), pa.int64())
+
+
+def _links(filing: pa.Array, src_type: str, src_key, src_label, dst_type: str, dst_key, dst_label, year) -> pa.Table:
+    """Edges as (filing, src, dst) rows, one per filing that links them."""
+    links = pa.table({
+        "filing": filing,
+        "filing_year": year,
+        "src_type": pa.repeat(src_type, len(filing)),
+        "src_key": src_key,
+        "src_label": src_label,
+        "dst_type": pa.repeat(dst_type, len(filing)),
+        "dst_key": dst_key,
+        "dst_label": dst_label,
+    })
+    links = links.filter(pc.and_(pc.is_valid(links["src_key"]), pc.is_valid(links["dst_key"])))
+    # A pair linked several times on one filing counts once
+    return links.group_by(["filing", "src_type", "src_key", "dst_type", "dst_key"], use_threads=False).aggregate([
+        ("filing_year", "first"), ("src_label", "first"), ("dst_label", "first"),
+    ]).rename_columns(["filing", "src_type", "src_key", "dst_type", "dst_key", "filing_year", "src_label", "dst_label"])
+
+
+def _reduce(edges: pa.Table) -> pa.Table:
+    """One row per (year, src, dst) edge, summing weights."""
+    keys = ["filing_year", "src_type", "src_key", "dst_type", "dst_key"]
+    reduced = edges.group_by(keys, use_threads=False).aggregate([
+        ("src_label", "first"), ("dst_label", "first"), ("filing_count", "sum"), ("amount", "sum"),
+    ])
+    return pa.table({
+        **{key: reduced[key] for key in keys},
+        "src_label": reduced["src_label_first"],
+        "dst_label": reduced["dst_label_first"],
+        "filing_count": reduced["filing_count_sum"],
+        "amount": reduced["amount_sum"],
+    }).select(KEYED_EDGES_SCHEMA.names).cast(KEYED_EDGES_SCHEMA)
+
+
+def _keyed_edges(filings: pa.Table, asset_id: str) -> pa.Table:
+    """All edges of one raw filings year, keyed by (node type, source id)."""
+    filings, current = current_versions(filings, asset_id)
+    year = current["filing_year"]
+    filing = _row_number(len(current))
+
+    # Client -> registrant, weighted by the filing's income (firms) or expenses (self-filers)
+    client_registrant = pa.table({
+        "filing_year": year,
+        "src_type": pa.repeat("client", len(current)),
+        "src_key": current["client_organization_id"],
+        "src_label": current["client_name"].cast(pa.string()),
+        "dst_type": pa.repeat("registrant", len(current)),
+        "dst_key": current["registrant_organization_id"],
+        "dst_label": current["registrant_name"].cast(pa.string()),
+        "filing_count": pa.repeat(1, len(current)).cast(pa.int64()),
+        "amount": pc.coalesce(current["income"], current["expenses"]),
+    })
+    client_registrant = client_registrant.filter(
+        pc.and_(pc.is_valid(client_registrant["src_key"]), pc.is_valid(client_registrant["dst_key"]))
+    )
+
+    filing_index, activities, activity_id = explode_activities(filings)
+
+    # Registrant -> lobbyist
+    activity_index, lobbyists = raw_list(activities, "lobbyists")
+    lobbyist_filing = pc.take(filing_index, activity_index)
+    lobbyist_names, _ = full_name(raw_column(lobbyists, "lobbyist.first_name"), raw_column(lobbyists, "lobbyist.last_name"))
+    registrant_lobbyist = _links(
+        lobbyist_filing,
+        "registrant", pc.take(current["registrant_organization_id"], lobbyist_filing),
+        pc.take(current["registrant_name"], lobbyist_filing).cast(pa.string()),
+        "lobbyist", raw_column(lobbyists, "lobbyist.id"), lobbyist_names,
+        pc.take(year, lobbyist_filing),
+    )
+
+    # Lobbyist -> government entity, through the activities they share
+    entity_activity, entities = raw_list(activities, "government_entities")
+    on_activity = pa.table({
+        "activity_id": pc.take(activity_id, activity_index),
+        "filing": lobbyist_filing,
+        "lobbyist_id": raw_column(lobbyists, "lobbyist.id"),
+        "lobbyist_name": lobbyist_names,
+    }).join(pa.table({
+        "activity_id": pc.take(activity_id, entity_activity),
+        "entity_id": raw_column(entities, "id"),
+        "entity_name": raw_column(entities, "name"),
+    }), "activity_id", join_type="inner", use_threads=False)
+    lobbyist_entity = _links(
+        on_activity["filing"],
+        "lobbyist", on_activity["lobbyist_id"], on_activity["lobbyist_name"],
+        "government_entity", on_activity["entity_id"], on_activity["entity_name"],
+        pc.take(year, on_activity["filing"]),
+    )
+
+    per_filing = [
+        links.drop_columns(["filing"]).append_column("filing_count", pa.repeat(1, len(links)).cast(pa.int64()))
+        .append_column("amount", pa.nulls(len(links), AMOUNT_TYPE))
+        for links in (registrant_lobbyist, lobbyist_entity)
+    ]
+    return _reduce(pa.concat_tables([client_registrant.cast(KEYED_EDGES_SCHEMA)]
+                                    + [t.select(KEYED_EDGES_SCHEMA.names).cast(KEYED_EDGES_SCHEMA) for t in per_filing]))
+
+
+def _nodes(edges: pa.Table) -> pa.Table:
+    """Every node of the edges, numbered densely in (node_type, source_id) order."""
+    ends = pa.concat_tables([
+        pa.table({"node_type": edges[f"{end}_type"], "source_id": edges[f"{end}_key"], "label": edges[f"{end}_label"]})
+        for end in ("src", "dst")
+    ])
+    nodes = ends.group_by(["node_type", "source_id"], use_threads=False).aggregate([("label", "first")])
+    nodes = nodes.rename_columns(["node_type", "source_id", "label"]).sort_by([("node_type", "ascending"), ("source_id", "ascending")])
+    return nodes.add_column(0, "node_id", _row_number(len(nodes))).cast(NODES_SCHEMA)
+
+
+def _node_ids(nodes: pa.Table, types: pa.ChunkedArray, keys: pa.ChunkedArray) -> pa.ChunkedArray:
+    """node_id of each (type, source_id) pair."""
+    lookup = pa.table({"node_type": types, "source_id": keys, "row": _row_number(len(keys))}).join(
+        nodes.select(["node_type", "source_id", "node_id"]), ["node_type", "source_id"], use_threads=False,
+    ).sort_by("row")
+    return lookup["node_id"]
+
+
+def _dense_edges(edges: pa.Table, nodes: pa.Table) -> pa.Table:
+    """Edges with dense node ids, sorted by (year, src, dst), numbered within each year."""
+    dense = pa.table({
+        "filing_year": edges["filing_year"],
+        "src": _node_ids(nodes, edges["src_type"], edges["src_key"]),
+        "dst": _node_ids(nodes, edges["dst_type"], edges["dst_key"]),
+        "edge_type": pc.binary_join_element_wise(edges["src_type"], edges["dst_type"], "_"),
+        "filing_count": edges["filing_count"],
+        "amount": edges["amount"],
+    }).sort_by([("filing_year", "ascending"), ("src", "ascending"), ("dst", "ascending")])
+
+    # edge_index restarts at 0 for each year: row number minus the year's first row
+    row = _row_number(len(dense))
+    starts = pa.table({"filing_year": dense["filing_year"], "row": row}).group_by("filing_year", use_threads=False).aggregate([("row", "min")])
+    year_start = pc.take(starts["row_min"], pc.index_in(dense["filing_year"], value_set=starts["filing_year"]))
+    return dense.add_column(1, "edge_index", pc.subtract(row, year_start)).cast(EDGES_SCHEMA)
+
+
+def _adjacency(edges: pa.Table) -> pa.Table:
+    """CSR row pointers: the first edge_index and out-degree of each source node per year."""
+    rows = edges.group_by(["filing_year", "src"], use_threads=False).aggregate([("edge_index", "min"), ("edge_index", "count")])
+    return pa.table({
+        "filing_year": rows["filing_year"],
+        "node_id": rows["src"],
+        "edge_start": rows["edge_index_min"],
+        "degree": rows["edge_index_count"],
+    }).sort_by([("filing_year", "ascending"), ("node_id", "ascending")]).cast(ADJACENCY_SCHEMA)
+
+
+class GraphBuilder(Builder):
+    """Network edges per raw filings_{year} table; nodes, dense ids and CSR pointers in combine().
+
+    combine() returns the edge table and keeps the node and adjacency
+    tables derived with it on the builder, so test() and upload() cover
+    all three datasets.
+    """
+
+    dataset_id = EDGES_DATASET_ID
+    metadata = EDGES_METADATA
+    schema = KEYED_EDGES_SCHEMA
+    mode = "overwrite"
+
+    def transform(self, filings: pa.Table, asset_id: str) -> pa.Table:
+        return _keyed_edges(filings, asset_id)
+
+    def combine(self, tables: list[pa.Table]) -> pa.Table:
+        edges = _reduce(pa.concat_tables(tables)) if tables else KEYED_EDGES_SCHEMA.empty_table()
+        self.nodes = _nodes(edges)
+        dense = _dense_edges(edges, self.nodes)
+        self.adjacency = _adjacency(dense)
+        return dense
+
+    def test(self, table: pa.Table) -> None:
+        test_nodes(self.nodes)
+        test_edges(table, len(self.nodes))
+        test_adjacency(self.adjacency, table)
+
+    def upload(self, table: pa.Table) -> None:
+        for dataset_id, metadata, data in (
+            (NODES_DATASET_ID, NODES_METADATA, self.nodes),
+            (EDGES_DATASET_ID, EDGES_METADATA, table),
+            (ADJACENCY_DATASET_ID, ADJACENCY_METADATA, self.adjacency),
+        ):
+            upload_data(data, dataset_id, mode=self.mode)
+            publish(dataset_id, metadata)
+
+
+def run():
+    """Transform, validate, and upload the graph datasets."""
+    run_builders([f"filings_{year}" for year in YEARS], [GraphBuilder()], loader=load_filings)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,75 @@
+"""Validation for the LDA lobbying network graph datasets."""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from subsets_utils import validate
+from subsets_utils.testing import assert_in_set, assert_in_range, assert_positive
+
+NODE_TYPES = {"client", "registrant", "lobbyist", "government_entity"}
+EDGE_TYPES = {"client_registrant", "registrant_lobbyist", "lobbyist_government_entity"}
+
+
+def test_nodes(table: pa.Table) -> None:
+    """Validate lda_graph_nodes output."""
+    validate(table, {
+        "columns": {
+            "node_id": "int64",
+            "node_type": "string",
+            "source_id": "int64",
+            "label": "string",
+        },
+        "not_null": ["node_id", "node_type", "source_id"],
+        "unique": ["node_type", "source_id"],
+        "min_rows": 10,
+    })
+
+    # Dense ids: exactly 0..n-1
+    assert table["node_id"].to_pylist() == list(range(len(table))), "node_id must be dense and in order"
+    assert_in_set(table, "node_type", NODE_TYPES)
+
+    print(f"    Validated {len(table):,} graph nodes")
+
+
+def test_edges(table: pa.Table, node_count: int) -> None:
+    """Validate lda_graph_edges output."""
+    validate(table, {
+        "columns": {
+            "filing_year": "int",
+            "edge_index": "int64",
+            "src": "int64",
+            "dst": "int64",
+            "edge_type": "string",
+            "filing_count": "int64",
+            "amount": "decimal",
+        },
+        "not_null": ["filing_year", "edge_index", "src", "dst", "edge_type", "filing_count"],
+        "unique": ["filing_year", "edge_index"],
+        "min_rows": 100,
+    })
+
+    assert_in_range(table, "filing_year", 1999, 2030)
+    assert_in_range(table, "src", 0, node_count - 1)
+    assert_in_range(table, "dst", 0, node_count - 1)
+    assert_positive(table, "filing_count", allow_zero=False)
+    assert_in_set(table, "edge_type", EDGE_TYPES)
+
+    print(f"    Validated {len(table):,} graph edges")
+
+
+def test_adjacency(table: pa.Table, edges: pa.Table) -> None:
+    """Validate lda_graph_adjacency against the edges it indexes."""
+    validate(table, {
+        "columns": {
+            "filing_year": "int",
+            "node_id": "int64",
+            "edge_start": "int64",
+            "degree": "int64",
+        },
+        "not_null": ["filing_year", "node_id", "edge_start", "degree"],
+        "unique": ["filing_year", "node_id"],
+    })
+
+    # Every edge is covered by exactly one node's range
+    assert pc.sum(table["degree"]).as_py() == len(edges), "Degrees must add up to the edge count"
+
+    print(f"    Validated adjacency for {len(table):,} (year, node) pairs")
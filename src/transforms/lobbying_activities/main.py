@@ -1,88 +1,337 @@
-"""Transform LDA filings into lda_lobbying_activities dataset.
+"""Transform LDA filings into lda_lobbying_activities and its side tables.
 
 Normalizes lobbying activities from filings. Each row represents one
 lobbying activity (issue code + description) from a filing.
+
+Registrants carry the same description text from quarter to quarter, so the
+text is stored once per distinct value in lda_activity_descriptions, keyed by
+a content hash that activity rows point at. Descriptions that differ only
+slightly (a bill number added, a date changed) share a cluster_id, found
+with MinHash/LSH over word shingles. Each description's signature is stored
+with it as one 64-bit word per LSH band, so a run hashes only descriptions
+it has not stored yet, matches them against the stored words, and leaves
+stored cluster_ids as they are.
+
+lda_issue_cooccurrence answers "which issues are lobbied together" without
+a self-join over all activities: for each year and period it holds, per
+pair of issue codes on the same filing, the number of filings and their
+reported spend. Each year's cells depend only on that year's filings, so
+the table is partitioned by filing_year and a run rewrites only the years
+whose filings changed; cells that a changed year no longer has go with it.
 """
 
 import pyarrow as pa
-from subsets_utils import load_raw_json, upload_data, publish
-from utils import YEARS
-from .test import test
+import pyarrow.compute as pc
+from subsets_utils import raw_column, raw_list, decode_dictionaries, load_asset, load_asset_schema, upload_data
+from subsets_utils.publish import publish
+from subsets_utils.similarity import band_words, cluster_incremental
+from subsets_utils.transform import Builder, run_builders
+from utils import YEARS, CATEGORY, UUID_TYPE, AMOUNT_TYPE, load_filings, parse_uuid, full_name, regroup, explode_activities, text_key, organization_id, extract_period
+from transforms.current_filings.main import current_versions
+from .test import test, test_descriptions, test_cooccurrence
 
 DATASET_ID = "lda_lobbying_activities"
+DESCRIPTIONS_DATASET_ID = "lda_activity_descriptions"
+COOCCURRENCE_DATASET_ID = "lda_issue_cooccurrence"
+
+# Estimated word-shingle Jaccard similarity at which descriptions share a cluster
+DESCRIPTION_SIMILARITY = 0.8
 
 METADATA = {
     "id": DATASET_ID,
     "title": "LDA Lobbying Activities",
-    "description": "Lobbying activities from LDA filings. Each row is one lobbying activity from a filing, with issue code, description, and lobbyists involved. Use this to search for lobbying on specific issues.",
+    "description": "Lobbying activities from LDA filings. Each row is one lobbying activity from a filing, with issue code, description key, and lobbyists involved. Use this to search for lobbying on specific issues; join to lda_activity_descriptions on description_id for the text.",
     "column_descriptions": {
-        "filing_uuid": "Unique identifier of the parent filing",
+        "activity_id": "Stable integer key of the activity; joins to lda_activity_lobbyists and lda_activity_government_entities",
+        "filing_uuid": "Unique identifier of the parent filing (UUID as 16 raw bytes)",
         "filing_year": "Year of the filing",
         "registrant_name": "Name of the lobbying firm",
+        "registrant_organization_id": "Canonical organization of the lobbying firm; joins to lda_organization_names",
         "client_name": "Name of the client",
+        "client_organization_id": "Canonical organization of the client; joins to lda_organization_names",
         "issue_code": "General issue area code (e.g., HCR for Healthcare)",
         "issue_area": "Human-readable issue area name",
-        "description": "Description of the specific lobbying activity",
+        "description_id": "Content hash of the activity description; joins to lda_activity_descriptions",
         "lobbyist_names": "Names of lobbyists who worked on this activity",
         "government_entities": "Government entities lobbied (if specified)",
     }
 }
 
+DESCRIPTIONS_METADATA = {
+    "id": DESCRIPTIONS_DATASET_ID,
+    "title": "LDA Activity Descriptions",
+    "description": "Distinct lobbying activity descriptions. Each row is one description text, stored once however many activities repeat it, with a cluster of near-identical texts (the same issue carried forward with small edits). Join to lda_lobbying_activities on description_id.",
+    "column_descriptions": {
+        "description_id": "Content hash of the description text",
+        "description": "Description of the specific lobbying activity",
+        "cluster_id": "description_id of the cluster's representative; near-duplicate descriptions share it",
+        "activity_count": "Number of activities with this exact description",
+        "first_filing_year": "Earliest filing year the description appears in",
+        "last_filing_year": "Latest filing year the description appears in",
+        "lsh_bands": "MinHash signature of the description, one 64-bit word per LSH band (for clustering new descriptions)",
+    }
+}
+
+
+COOCCURRENCE_METADATA = {
+    "id": COOCCURRENCE_DATASET_ID,
+    "title": "LDA Issue Co-occurrence",
+    "description": "How often pairs of issue codes are lobbied on the same filing, per year and period, counting only the current version of each filing. Each pair appears once with issue_code_a <= issue_code_b; rows with issue_code_a = issue_code_b give the totals for a single issue.",
+    "column_descriptions": {
+        "filing_year": "Year of the filings",
+        "filing_period": "Q1-Q4, or H1/H2 for semiannual reports (before 2008)",
+        "issue_code_a": "First issue code of the pair (alphabetically)",
+        "issue_code_b": "Second issue code of the pair (equal to issue_code_a for single-issue totals)",
+        "filing_count": "Number of filings listing both issue codes",
+        "amount": "Total income or expenses reported on those filings in USD (a filing's full amount counts toward every pair on it)",
+    }
+}
+
+COOCCURRENCE_KEY = ["filing_year", "filing_period", "issue_code_a", "issue_code_b"]
+
+SCHEMA = pa.schema([
+    ("activity_id", pa.int64()),
+    ("filing_uuid", UUID_TYPE),
+    ("filing_year", pa.int16()),
+    ("registrant_name", CATEGORY),
+    ("registrant_organization_id", pa.int64()),
+    ("client_name", CATEGORY),
+    ("client_organization_id", pa.int64()),
+    ("issue_code", CATEGORY),
+    ("issue_area", CATEGORY),
+    ("description_id", pa.int64()),
+    ("lobbyist_names", pa.list_(pa.string())),
+    ("government_entities", pa.list_(pa.string())),
+])
+
+DESCRIPTIONS_SCHEMA = pa.schema([
+    ("description_id", pa.int64()),
+    ("description", pa.string()),
+    ("cluster_id", pa.int64()),
+    ("activity_count", pa.int64()),
+    ("first_filing_year", pa.int16()),
+    ("last_filing_year", pa.int16()),
+    # Delta has no unsigned types; the words' bits are stored as int64
+    ("lsh_bands", pa.list_(pa.int64())),
+])
+
+STORED_DESCRIPTION_COLUMNS = ["description_id", "cluster_id", "lsh_bands"]
+
+
+COOCCURRENCE_SCHEMA = pa.schema([
+    ("filing_year", pa.int16()),
+    ("filing_period", CATEGORY),
+    ("issue_code_a", CATEGORY),
+    ("issue_code_b", CATEGORY),
+    ("filing_count", pa.int64()),
+    ("amount", AMOUNT_TYPE),
+])
+
+
+def _description(activities: pa.Table) -> pa.ChunkedArray:
+    """Activity description text, with blank descriptions as null."""
+    text = raw_column(activities, "description")
+    return pc.if_else(pc.equal(pc.utf8_trim_whitespace(text), ""), None, text)
+
+
+def _reduce_descriptions(descriptions: pa.Table) -> pa.Table:
+    """Collapse description rows to one per description_id with a hash aggregation."""
+    reduced = descriptions.group_by("description_id", use_threads=False).aggregate([
+        ("description", "first"), ("activity_count", "sum"),
+        ("first_filing_year", "min"), ("last_filing_year", "max"),
+    ])
+    return pa.table({
+        "description_id": reduced["description_id"],
+        "description": reduced["description_first"],
+        "cluster_id": pa.nulls(len(reduced), pa.int64()),
+        "activity_count": reduced["activity_count_sum"],
+        "first_filing_year": reduced["first_filing_year_min"],
+        "last_filing_year": reduced["last_filing_year_max"],
+        "lsh_bands": pa.nulls(len(reduced), pa.list_(pa.int64())),
+    })
+
+
+class ActivitiesBuilder(Builder):
+    """One row per lobbying activity, built from a raw filings_{year} table."""
+
+    dataset_id = DATASET_ID
+    metadata = METADATA
+    schema = SCHEMA
+    mode = "overwrite"
+    partition_by = "filing_year"
+
+    def transform(self, filings: pa.Table, asset_id: str) -> pa.Table:
+        # One row per activity, with the index of its parent filing
+        filing_index, activities, activity_id = explode_activities(filings)
+
+        # Lobbyist names, regrouped by activity after dropping blank names
+        _, lobbyists = raw_list(activities, "lobbyists")
+        names, keep = full_name(raw_column(lobbyists, "lobbyist.first_name"), raw_column(lobbyists, "lobbyist.last_name"))
+        lobbyist_names = regroup(raw_column(activities, "lobbyists"), names.combine_chunks(), keep.combine_chunks())
+
+        # Government entity names, regrouped by activity after dropping blanks
+        _, entities = raw_list(activities, "government_entities")
+        entity_names = raw_column(entities, "name")
+        keep = pc.not_equal(pc.fill_null(entity_names, ""), "")
+        gov_names = regroup(raw_column(activities, "government_entities"), entity_names.combine_chunks(), keep.combine_chunks())
+
+        return pa.table({
+            "activity_id": activity_id,
+            "filing_uuid": pc.take(parse_uuid(raw_column(filings, "filing_uuid")), filing_index),
+            "filing_year": pc.take(raw_column(filings, "filing_year"), filing_index),
+            # Encode per filing before repeating per activity, so repeats are just indices
+            "registrant_name": pc.take(pc.dictionary_encode(raw_column(filings, "registrant.name")), filing_index),
+            "registrant_organization_id": pc.take(organization_id(raw_column(filings, "registrant.name")), filing_index),
+            "client_name": pc.take(pc.dictionary_encode(raw_column(filings, "client.name")), filing_index),
+            "client_organization_id": pc.take(organization_id(raw_column(filings, "client.name")), filing_index),
+            "issue_code": raw_column(activities, "general_issue_code"),
+            "issue_area": raw_column(activities, "general_issue_code_display"),
+            "description_id": text_key(_description(activities)),
+            "lobbyist_names": lobbyist_names,
+            "government_entities": gov_names,
+        })
+
+    def test(self, table: pa.Table) -> None:
+        test(table)
+
+
+def _stored_descriptions() -> pa.Table:
+    """Stored description ids, clusters and signatures; empty if none are stored or stored without signatures."""
+    try:
+        if "lsh_bands" in load_asset_schema(DESCRIPTIONS_DATASET_ID).names:
+            return load_asset(DESCRIPTIONS_DATASET_ID, columns=STORED_DESCRIPTION_COLUMNS)
+    except FileNotFoundError:
+        pass
+    return DESCRIPTIONS_SCHEMA.empty_table().select(STORED_DESCRIPTION_COLUMNS)
+
+
+class DescriptionsBuilder(Builder):
+    """One row per distinct description, reduced per raw filings_{year} table and again across years.
+
+    Clusters are assigned in combine(), once every year's descriptions are
+    known: stored descriptions keep their cluster_id and new ones are
+    matched against them (subsets_utils.similarity.cluster_incremental).
+    The Delta table is merged on description_id, so descriptions no longer
+    present in the raw data are kept. Only the descriptions of years whose
+    raw input changed are re-reduced and merged (keep_parts).
+    """
+
+    dataset_id = DESCRIPTIONS_DATASET_ID
+    metadata = DESCRIPTIONS_METADATA
+    schema = DESCRIPTIONS_SCHEMA
+    mode = "merge"
+    merge_key = "description_id"
+    keep_parts = True
+
+    def transform(self, filings: pa.Table, asset_id: str) -> pa.Table:
+        filing_index, activities, _ = explode_activities(filings)
+        description = _description(activities)
+        year = pc.take(raw_column(filings, "filing_year"), filing_index)
+        descriptions = pa.table({
+            "description_id": text_key(description),
+            "description": description,
+            "activity_count": pa.repeat(1, len(description)).cast(pa.int64()),
+            "first_filing_year": year,
+            "last_filing_year": year,
+        })
+        return _reduce_descriptions(descriptions.filter(pc.is_valid(descriptions["description_id"])))
+
+    def combine(self, tables: list[pa.Table]) -> pa.Table:
+        if not tables:
+            return self.schema.empty_table()
+        # Sorted by key, so a new cluster's label (its smallest new member) doesn't depend on year order
+        descriptions = _reduce_descriptions(pa.concat_tables(tables)).sort_by("description_id")
+        stored = _stored_descriptions()
+
+        position = pc.index_in(descriptions["description_id"], value_set=stored["description_id"])
+        is_new = pc.is_null(position)
+        new = descriptions.filter(is_new)
+        print(f"  Clustering {len(new):,} new descriptions against {len(stored):,} stored")
+        words = [band_words(text) for text in new["description"].to_pylist()]
+        labels = cluster_incremental(
+            stored["lsh_bands"], stored["cluster_id"].to_pylist(), words, new["description_id"].to_pylist(),
+            threshold=DESCRIPTION_SIMILARITY,
+        )
+
+        known_position = position.filter(pc.invert(is_new))
+        known = descriptions.filter(pc.invert(is_new))
+        known = known.set_column(2, "cluster_id", pc.take(stored["cluster_id"], known_position)).set_column(
+            6, "lsh_bands", pc.take(stored["lsh_bands"], known_position))
+        new = new.set_column(2, "cluster_id", pa.array(labels, pa.int64())).set_column(
+            6, "lsh_bands", pa.array(words, pa.list_(pa.uint64())).cast(pa.list_(pa.int64()), safe=False))
+        return pa.concat_tables([known.cast(self.schema), new.cast(self.schema)]).sort_by("description_id")
+
+    def test(self, table: pa.Table) -> None:
+        test_descriptions(table)
+
+    def upload(self, table: pa.Table) -> None:
+        try:
+            # Tables stored before the signature column are re-clustered in full and rewritten
+            mode = self.mode if load_asset_schema(self.dataset_id).names == table.column_names else "overwrite"
+        except FileNotFoundError:
+            mode = self.mode
+        upload_data(table, self.dataset_id, mode=mode, merge_key=self.merge_key)
+        publish(self.dataset_id, self.metadata)
+
+
+def _reduce_cooccurrence(cells: pa.Table) -> pa.Table:
+    """Sum filing counts and spend per (year, period, code pair) cell."""
+    reduced = cells.group_by(COOCCURRENCE_KEY, use_threads=False).aggregate([("filing_count", "sum"), ("amount", "sum")])
+    return pa.table({
+        **{key: reduced[key] for key in COOCCURRENCE_KEY},
+        "filing_count": reduced["filing_count_sum"],
+        "amount": reduced["amount_sum"],
+    })
+
+
+class IssueCooccurrenceBuilder(Builder):
+    """Issue-code pair counts per year and period, from a raw filings_{year} table."""
+
+    dataset_id = COOCCURRENCE_DATASET_ID
+    metadata = COOCCURRENCE_METADATA
+    schema = COOCCURRENCE_SCHEMA
+    mode = "overwrite"
+    partition_by = "filing_year"
+
+    def transform(self, filings: pa.Table, asset_id: str) -> pa.Table:
+        filings, current = current_versions(filings, asset_id)
+        filing_index, activities, _ = explode_activities(filings)
+
+        # Distinct issue codes per filing, then every pair a <= b on the same filing
+        codes = pa.table({"filing": filing_index, "code": raw_column(activities, "general_issue_code")})
+        codes = codes.filter(pc.is_valid(codes["code"])).group_by(["filing", "code"], use_threads=False).aggregate([])
+        pairs = codes.join(codes.rename_columns(["filing", "code_b"]), "filing", use_threads=False)
+        pairs = pairs.filter(pc.less_equal(pairs["code"], pairs["code_b"]))
+
+        filing = pairs["filing"]
+        cells = pa.table({
+            "filing_year": pc.take(current["filing_year"], filing),
+            "filing_period": pc.take(extract_period(raw_column(filings, "filing_period")), filing),
+            "issue_code_a": pairs["code"],
+            "issue_code_b": pairs["code_b"],
+            "filing_count": pa.repeat(1, len(pairs)).cast(pa.int64()),
+            "amount": pc.take(pc.coalesce(current["income"], current["expenses"]), filing),
+        })
+        # The period is part of the cell key, so it can't be null (the API always sets it)
+        return _reduce_cooccurrence(cells.filter(pc.is_valid(cells["filing_period"])))
+
+    def combine(self, tables: list[pa.Table]) -> pa.Table:
+        if not tables:
+            return self.schema.empty_table()
+        # Group keys must share one dictionary across years; reduce on plain strings
+        return _reduce_cooccurrence(decode_dictionaries(pa.concat_tables(tables))).cast(self.schema)
+
+    def test(self, table: pa.Table) -> None:
+        test_cooccurrence(table)
+
 
 def run():
-    """Transform, validate, and upload dataset."""
-    all_records = []
-
-    for year in YEARS:
-        print(f"  Processing filings_{year}...")
-
-        filings = load_raw_json(f"filings_{year}")
-
-        file_records = 0
-        for filing in filings:
-            activities = filing.get("lobbying_activities") or []
-            registrant = filing.get("registrant") or {}
-            client = filing.get("client") or {}
-
-            for activity in activities:
-                # Extract lobbyist names
-                lobbyist_entries = activity.get("lobbyists") or []
-                lobbyist_names = []
-                for entry in lobbyist_entries:
-                    lobbyist = entry.get("lobbyist") or {}
-                    first = lobbyist.get("first_name") or ""
-                    last = lobbyist.get("last_name") or ""
-                    if first or last:
-                        lobbyist_names.append(f"{first} {last}".strip())
-
-                # Extract government entities
-                gov_entities = activity.get("government_entities") or []
-                gov_names = [e.get("name") for e in gov_entities if e.get("name")]
-
-                record = {
-                    "filing_uuid": filing.get("filing_uuid"),
-                    "filing_year": filing.get("filing_year"),
-                    "registrant_name": registrant.get("name"),
-                    "client_name": client.get("name"),
-                    "issue_code": activity.get("general_issue_code"),
-                    "issue_area": activity.get("general_issue_code_display"),
-                    "description": activity.get("description"),
-                    "lobbyist_names": lobbyist_names if lobbyist_names else None,
-                    "government_entities": gov_names if gov_names else None,
-                }
-                all_records.append(record)
-                file_records += 1
-
-        print(f"    -> {file_records:,} activities")
-
-    print(f"  Total: {len(all_records):,} records")
-
-    table = pa.Table.from_pylist(all_records)
-
-    test(table)
-
-    upload_data(table, DATASET_ID)
-    publish(DATASET_ID, METADATA)
+    """Transform, validate, and upload all activity datasets."""
+    run_builders(
+        [f"filings_{year}" for year in YEARS],
+        [ActivitiesBuilder(), DescriptionsBuilder(), IssueCooccurrenceBuilder()],
+        loader=load_filings,
+    )
 
 
 if __name__ == "__main__":
@@ -1,25 +1,30 @@
 """Validation for LDA lobbying activities dataset."""
 
 import pyarrow as pa
+import pyarrow.compute as pc
 from subsets_utils import validate
-from subsets_utils.testing import assert_max_length, assert_in_range
+from subsets_utils.testing import assert_max_length, assert_in_range, assert_positive, assert_in_set
 
 
 def test(table: pa.Table) -> None:
     """Validate LDA lobbying activities output."""
     validate(table, {
         "columns": {
-            "filing_uuid": "string",
+            "activity_id": "int64",
+            "filing_uuid": "binary",
             "filing_year": "int",
             "registrant_name": "string",
+            "registrant_organization_id": "int64",
             "client_name": "string",
+            "client_organization_id": "int64",
             "issue_code": "string",
             "issue_area": "string",
-            "description": "string",
+            "description_id": "int64",
             "lobbyist_names": "list",
             "government_entities": "list",
         },
-        "not_null": ["filing_uuid", "filing_year", "issue_code"],
+        "not_null": ["activity_id", "filing_uuid", "filing_year", "issue_code"],
+        "unique": ["activity_id"],
         "min_rows": 100,
     })
 
@@ -35,3 +40,62 @@ def test(table: pa.Table) -> None:
     assert len(issue_areas) > 10, f"Expected more unique issue areas, got {len(issue_areas)}"
 
     print(f"    Validated {len(table):,} activities across {len(issue_areas)} issue areas")
+
+
+def test_descriptions(table: pa.Table) -> None:
+    """Validate LDA activity descriptions output."""
+    validate(table, {
+        "columns": {
+            "description_id": "int64",
+            "description": "string",
+            "cluster_id": "int64",
+            "activity_count": "int64",
+            "first_filing_year": "int",
+            "last_filing_year": "int",
+            "lsh_bands": "list",
+        },
+        "not_null": ["description_id", "description", "cluster_id", "activity_count", "lsh_bands"],
+        "unique": ["description_id"],
+        "min_rows": 100,
+    })
+
+    assert_positive(table, "activity_count", allow_zero=False)
+    assert_in_range(table, "first_filing_year", 1999, 2030)
+    assert_in_range(table, "last_filing_year", 1999, 2030)
+
+    # Every cluster is labelled by one of its own members; the label may be a
+    # stored description this run no longer sees, but one it sees is in its own cluster
+    labels = dict(zip(table.column("description_id").to_pylist(), table.column("cluster_id").to_pylist()))
+    clusters = set(labels.values())
+    assert all(labels[cluster] == cluster for cluster in clusters if cluster in labels), \
+        "A description labelling a cluster must belong to it"
+    assert all(len(bands) == 16 for bands in table.column("lsh_bands").to_pylist()), "Expected 16 LSH band words"
+
+    print(f"    Validated {len(table):,} descriptions in {len(clusters):,} clusters")
+
+
+def test_cooccurrence(table: pa.Table) -> None:
+    """Validate LDA issue co-occurrence output."""
+    validate(table, {
+        "columns": {
+            "filing_year": "int",
+            "filing_period": "string",
+            "issue_code_a": "string",
+            "issue_code_b": "string",
+            "filing_count": "int64",
+            "amount": "decimal",
+        },
+        "not_null": ["filing_year", "filing_period", "issue_code_a", "issue_code_b", "filing_count"],
+        "unique": ["filing_year", "filing_period", "issue_code_a", "issue_code_b"],
+        "min_rows": 100,
+    })
+
+    assert_in_range(table, "filing_year", 1999, 2030)
+    assert_in_set(table, "filing_period", {"Q1", "Q2", "Q3", "Q4", "H1", "H2"})
+    assert_positive(table, "filing_count", allow_zero=False)
+
+    # Pairs are stored once, in order
+    a, b = table["issue_code_a"].cast(pa.string()), table["issue_code_b"].cast(pa.string())
+    assert pc.all(pc.less_equal(a, b)).as_py() is not False, "issue_code_a must sort before issue_code_b"
+
+    print(f"    Validated {len(table):,} issue co-occurrence cells")
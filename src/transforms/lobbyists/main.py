@@ -0,0 +1,215 @@
+"""Transform LDA filings into lda_lobbyists and lda_activity_lobbyists.
+
+lda_lobbyists is a dimension with one row per lobbyist ID. lda_activity_lobbyists
+is a bridge of integer keys linking each lobbying activity to the lobbyists
+listed on it, so "every activity of lobbyist X" is a key join rather than a
+scan over the lobbyist_names list column.
+
+The dimension is deduplicated with hash aggregation as it streams: each
+year's appearances are reduced to one row per lobbyist, combine() reduces
+the per-year rows the same way, and the Delta table is merged on
+lobbyist_id so lobbyists absent from the current raw data are kept. The
+per-year rows are kept (keep_parts), so a run re-reduces and merges only
+the lobbyists of years whose raw input changed.
+"""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from subsets_utils import raw_column, raw_list, decode_dictionaries
+from subsets_utils.transform import Builder, run_builders
+from utils import YEARS, CATEGORY, load_filings, full_name, explode_activities
+from .test import test, test_bridge
+
+DATASET_ID = "lda_lobbyists"
+BRIDGE_DATASET_ID = "lda_activity_lobbyists"
+
+METADATA = {
+    "id": DATASET_ID,
+    "title": "LDA Lobbyists",
+    "description": "Lobbyists named on LDA quarterly activity reports. Each row is one lobbyist ID, with the most recently reported name and every covered (former government) position disclosed. Join to lda_activity_lobbyists on lobbyist_id for their activities.",
+    "column_descriptions": {
+        "lobbyist_id": "Unique ID of the lobbyist",
+        "full_name": "First and last name",
+        "prefix": "Name prefix (e.g., Mr., Ms.)",
+        "first_name": "First name",
+        "nickname": "Nickname",
+        "middle_name": "Middle name",
+        "last_name": "Last name",
+        "suffix": "Name suffix (e.g., Jr.)",
+        "covered_positions": "Covered executive or legislative branch positions disclosed for the lobbyist",
+        "first_filing_year": "Earliest filing year the lobbyist appears in",
+        "last_filing_year": "Latest filing year the lobbyist appears in",
+    }
+}
+
+BRIDGE_METADATA = {
+    "id": BRIDGE_DATASET_ID,
+    "title": "LDA Activity Lobbyists",
+    "description": "Bridge between lobbying activities and the lobbyists who worked on them. Each row links one activity_id (lda_lobbying_activities) to one lobbyist_id (lda_lobbyists).",
+    "column_descriptions": {
+        "activity_id": "Key of the lobbying activity",
+        "lobbyist_id": "Key of the lobbyist",
+        "filing_year": "Year of the filing",
+        "covered_position": "Covered position disclosed on this activity, if any",
+        "is_new": "True if the lobbyist was newly added on this filing",
+    }
+}
+
+NAME_COLUMNS = ["full_name", "prefix", "first_name", "nickname", "middle_name", "last_name", "suffix"]
+
+SCHEMA = pa.schema([
+    ("lobbyist_id", pa.int64()),
+    ("full_name", pa.string()),
+    ("prefix", CATEGORY),
+    ("first_name", pa.string()),
+    ("nickname", pa.string()),
+    ("middle_name", pa.string()),
+    ("last_name", pa.string()),
+    ("suffix", CATEGORY),
+    ("covered_positions", pa.list_(pa.string())),
+    ("first_filing_year", pa.int16()),
+    ("last_filing_year", pa.int16()),
+])
+
+BRIDGE_SCHEMA = pa.schema([
+    ("activity_id", pa.int64()),
+    ("lobbyist_id", pa.int64()),
+    ("filing_year", pa.int16()),
+    ("covered_position", pa.string()),
+    ("is_new", pa.bool_()),
+])
+
+
+def _appearances(filings: pa.Table) -> pa.Table:
+    """One row per lobbyist listed on an activity, with its activity_id and filing year."""
+    filing_index, activities, activity_id = explode_activities(filings)
+    activity_index, entries = raw_list(activities, "lobbyists")
+    if not len(activity_index):
+        return pa.table({"activity_id": pa.array([], pa.int64()), "lobbyist_id": pa.array([], pa.int64())})
+
+    names, _ = full_name(raw_column(entries, "lobbyist.first_name"), raw_column(entries, "lobbyist.last_name"))
+    position = pc.utf8_trim_whitespace(raw_column(entries, "covered_position"))
+    table = pa.table({
+        "activity_id": pc.take(activity_id, activity_index),
+        "lobbyist_id": raw_column(entries, "lobbyist.id"),
+        "filing_year": pc.take(pc.take(raw_column(filings, "filing_year"), filing_index), activity_index),
+        "full_name": pc.if_else(pc.equal(names, ""), None, names),
+        "prefix": raw_column(entries, "lobbyist.prefix"),
+        "first_name": raw_column(entries, "lobbyist.first_name"),
+        "nickname": raw_column(entries, "lobbyist.nickname"),
+        "middle_name": raw_column(entries, "lobbyist.middle_name"),
+        "last_name": raw_column(entries, "lobbyist.last_name"),
+        "suffix": raw_column(entries, "lobbyist.suffix"),
+        "covered_position": pc.if_else(pc.equal(position, ""), None, position),
+        "is_new": raw_column(entries, "new"),
+    })
+    return table.filter(pc.is_valid(table["lobbyist_id"]))
+
+
+def _reduce(people: pa.Table, positions: pa.Table) -> pa.Table:
+    """Collapse lobbyist rows to one per lobbyist_id with a hash aggregation.
+
+    Args:
+        people: lobbyist_id, name columns, first_filing_year, last_filing_year
+            (several rows per lobbyist allowed)
+        positions: lobbyist_id, covered_position pairs (duplicates allowed)
+    """
+    # Latest appearance first, so "first" picks the most recently reported name
+    people = people.sort_by([("last_filing_year", "descending")])
+    reduced = people.group_by("lobbyist_id", use_threads=False).aggregate(
+        [(name, "first") for name in NAME_COLUMNS]
+        + [("first_filing_year", "min"), ("last_filing_year", "max")]
+    )
+
+    positions = positions.filter(pc.is_valid(positions["covered_position"]))
+    distinct = positions.group_by("lobbyist_id", use_threads=False).aggregate([("covered_position", "distinct")])
+    covered = pc.take(distinct["covered_position_distinct"], pc.index_in(reduced["lobbyist_id"], value_set=distinct["lobbyist_id"]))
+
+    return pa.table({
+        "lobbyist_id": reduced["lobbyist_id"],
+        **{name: reduced[f"{name}_first"] for name in NAME_COLUMNS},
+        "covered_positions": covered,
+        "first_filing_year": reduced["first_filing_year_min"],
+        "last_filing_year": reduced["last_filing_year_max"],
+    })
+
+
+class LobbyistsBuilder(Builder):
+    """One row per lobbyist, reduced per raw filings_{year} table and again across years."""
+
+    dataset_id = DATASET_ID
+    metadata = METADATA
+    schema = SCHEMA
+    mode = "merge"
+    merge_key = "lobbyist_id"
+    keep_parts = True
+
+    def transform(self, filings: pa.Table, asset_id: str) -> pa.Table:
+        appearances = _appearances(filings)
+        if not len(appearances):
+            return self.schema.empty_table()
+
+        people = appearances.select(["lobbyist_id", *NAME_COLUMNS]).append_column(
+            "first_filing_year", appearances["filing_year"]
+        ).append_column("last_filing_year", appearances["filing_year"])
+        return _reduce(people, appearances.select(["lobbyist_id", "covered_position"]))
+
+    def combine(self, tables: list[pa.Table]) -> pa.Table:
+        if not tables:
+            return self.schema.empty_table()
+        # Hash "first" has no dictionary kernel; compare plain strings across years
+        lobbyists = decode_dictionaries(pa.concat_tables(tables))
+
+        # Re-explode the per-year position lists so they merge like any other rows
+        positions_column = lobbyists["covered_positions"]
+        positions = pa.table({
+            "lobbyist_id": pc.take(lobbyists["lobbyist_id"], pc.list_parent_indices(positions_column)),
+            "covered_position": pc.list_flatten(positions_column),
+        })
+        return _reduce(lobbyists.drop_columns(["covered_positions"]), positions).cast(self.schema)
+
+    def test(self, table: pa.Table) -> None:
+        test(table)
+
+
+class ActivityLobbyistsBuilder(Builder):
+    """One row per (activity, lobbyist) pair, built from a raw filings_{year} table."""
+
+    dataset_id = BRIDGE_DATASET_ID
+    metadata = BRIDGE_METADATA
+    schema = BRIDGE_SCHEMA
+    mode = "overwrite"
+    partition_by = "filing_year"
+
+    def transform(self, filings: pa.Table, asset_id: str) -> pa.Table:
+        appearances = _appearances(filings)
+        if not len(appearances):
+            return self.schema.empty_table()
+
+        # A lobbyist listed twice on one activity yields one bridge row
+        pairs = appearances.group_by(["activity_id", "lobbyist_id"], use_threads=False).aggregate([
+            ("filing_year", "first"), ("covered_position", "first"), ("is_new", "first"),
+        ])
+        return pa.table({
+            "activity_id": pairs["activity_id"],
+            "lobbyist_id": pairs["lobbyist_id"],
+            "filing_year": pairs["filing_year_first"],
+            "covered_position": pairs["covered_position_first"],
+            "is_new": pairs["is_new_first"],
+        })
+
+    def test(self, table: pa.Table) -> None:
+        test_bridge(table)
+
+
+def run():
+    """Transform, validate, and upload both datasets."""
+    run_builders(
+        [f"filings_{year}" for year in YEARS],
+        [LobbyistsBuilder(), ActivityLobbyistsBuilder()],
+        loader=load_filings,
+    )
+
+
+if __name__ == "__main__":
+    run()
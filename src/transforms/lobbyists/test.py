@@ -0,0 +1,52 @@
+"""Validation for LDA lobbyist datasets."""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from subsets_utils import validate
+from subsets_utils.testing import assert_in_range
+
+
+def test(table: pa.Table) -> None:
+    """Validate LDA lobbyists dimension."""
+    validate(table, {
+        "columns": {
+            "lobbyist_id": "int64",
+            "full_name": "string",
+            "first_name": "string",
+            "last_name": "string",
+            "covered_positions": "list",
+            "first_filing_year": "int",
+            "last_filing_year": "int",
+        },
+        "not_null": ["lobbyist_id", "first_filing_year", "last_filing_year"],
+        "unique": ["lobbyist_id"],
+        "min_rows": 10,
+    })
+
+    assert_in_range(table, "first_filing_year", 1999, 2030)
+    assert_in_range(table, "last_filing_year", 1999, 2030)
+
+    inverted = pc.sum(pc.greater(table["first_filing_year"], table["last_filing_year"])).as_py()
+    assert not inverted, f"{inverted} lobbyists have first_filing_year after last_filing_year"
+
+    print(f"    Validated {len(table):,} lobbyists")
+
+
+def test_bridge(table: pa.Table) -> None:
+    """Validate LDA activity-lobbyist bridge."""
+    validate(table, {
+        "columns": {
+            "activity_id": "int64",
+            "lobbyist_id": "int64",
+            "filing_year": "int",
+            "covered_position": "string",
+            "is_new": "bool",
+        },
+        "not_null": ["activity_id", "lobbyist_id", "filing_year"],
+        "unique": ["activity_id", "lobbyist_id"],
+        "min_rows": 100,
+    })
+
+    assert_in_range(table, "filing_year", 1999, 2030)
+
+    print(f"    Validated {len(table):,} activity-lobbyist links")
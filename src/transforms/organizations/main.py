@@ -0,0 +1,126 @@
+"""Transform LDA filings into lda_organization_names dataset.
+
+Entity resolution for registrants and clients. Every registrant and client
+name is normalized (utils.names.normalize_name), and each distinct
+normalized name is mapped to a canonical organization_id; the filings and
+activities transforms look their names up in this table.
+
+Names already in the stored table keep their organization_id. Only names
+new to this run are resolved: they are blocked on rare word tokens, scored
+against their candidates by character-trigram Jaccard similarity, and
+either join the organization of their best match or start a new one
+(subsets_utils.similarity.resolve_incremental). Only the new names are
+merged into the Delta table.
+"""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from subsets_utils import raw_column, load_asset, upload_data
+from subsets_utils.publish import publish
+from subsets_utils.similarity import resolve_incremental
+from subsets_utils.transform import Builder, run_builders
+from utils import YEARS, load_filings, normalize_name, text_key, clear_organization_cache, ORGANIZATION_NAMES_DATASET_ID
+from .test import test
+
+DATASET_ID = ORGANIZATION_NAMES_DATASET_ID
+
+# Character-trigram Jaccard similarity at which two normalized names are the same organization
+ORGANIZATION_SIMILARITY = 0.75
+
+METADATA = {
+    "id": DATASET_ID,
+    "title": "LDA Organization Names",
+    "description": "Every registrant and client name spelling seen in LDA filings, normalized and resolved to a canonical organization. Spellings of the same organization share an organization_id, which also appears on lda_filings and lda_lobbying_activities. Use it to total lobbying by organization.",
+    "column_descriptions": {
+        "name_key": "Content hash of the normalized name",
+        "name": "Normalized name (lowercase, no punctuation or legal form such as Inc. or LLC)",
+        "display_name": "A raw spelling of the name as filed",
+        "organization_id": "Canonical organization; the name_key of one of its names, fixed once assigned",
+    }
+}
+
+SCHEMA = pa.schema([
+    ("name_key", pa.int64()),
+    ("name", pa.string()),
+    ("display_name", pa.string()),
+    ("organization_id", pa.int64()),
+])
+
+
+def _stored(columns: list[str]) -> pa.Table:
+    try:
+        return load_asset(DATASET_ID, columns=columns)
+    except FileNotFoundError:
+        return SCHEMA.empty_table().select(columns)
+
+
+def _distinct(names: pa.Table) -> pa.Table:
+    """One row per name_key."""
+    reduced = names.group_by("name_key", use_threads=False).aggregate([("name", "first"), ("display_name", "first")])
+    return pa.table({
+        "name_key": reduced["name_key"],
+        "name": reduced["name_first"],
+        "display_name": reduced["display_name_first"],
+        "organization_id": pa.nulls(len(reduced), pa.int64()),
+    })
+
+
+class OrganizationsBuilder(Builder):
+    """One row per normalized registrant or client name, resolved to an organization."""
+
+    dataset_id = DATASET_ID
+    metadata = METADATA
+    schema = SCHEMA
+    mode = "merge"
+    merge_key = "name_key"
+
+    def transform(self, filings: pa.Table, asset_id: str) -> pa.Table:
+        # Normalize each distinct spelling once; names repeat on many filings
+        display = pc.unique(pa.chunked_array(
+            raw_column(filings, "registrant.name").chunks + raw_column(filings, "client.name").chunks, pa.string()
+        ))
+        names = normalize_name(pa.chunked_array([display]))
+        table = pa.table({"name_key": text_key(names), "name": names, "display_name": pa.chunked_array([display])})
+        return _distinct(table.filter(pc.is_valid(table["name_key"])))
+
+    def combine(self, tables: list[pa.Table]) -> pa.Table:
+        if not tables:
+            return self.schema.empty_table()
+        names = _distinct(pa.concat_tables(tables)).sort_by("name_key")
+        stored = _stored(["name_key", "name", "organization_id"])
+
+        position = pc.index_in(names["name_key"], value_set=stored["name_key"])
+        is_new = pc.is_null(position)
+        new = names.filter(is_new)
+        print(f"  Resolving {len(new):,} new names against {len(stored):,} known")
+        labels = resolve_incremental(
+            stored["name"].to_pylist(), stored["organization_id"].to_pylist(),
+            new["name"].to_pylist(), new["name_key"].to_pylist(),
+            threshold=ORGANIZATION_SIMILARITY,
+        )
+
+        # Known names keep their stored id; new names take the resolved one, in name order
+        organization_id = pc.replace_with_mask(
+            pc.take(stored["organization_id"], position).combine_chunks(), is_new.combine_chunks(), pa.array(labels, pa.int64())
+        )
+        return names.set_column(3, "organization_id", organization_id).cast(self.schema)
+
+    def test(self, table: pa.Table) -> None:
+        test(table)
+
+    def upload(self, table: pa.Table) -> None:
+        new = table.filter(pc.invert(pc.is_in(table["name_key"], value_set=_stored(["name_key"])["name_key"])))
+        print(f"  {DATASET_ID}: {len(new):,} of {len(table):,} names new")
+        upload_data(new, self.dataset_id, mode=self.mode, merge_key=self.merge_key)
+        publish(self.dataset_id, self.metadata)
+        # Lookups in this process must see the names just added
+        clear_organization_cache()
+
+
+def run():
+    """Transform, validate, and upload dataset."""
+    run_builders([f"filings_{year}" for year in YEARS], [OrganizationsBuilder()], loader=load_filings)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,22 @@
+"""Validation for LDA organization names dataset."""
+
+import pyarrow as pa
+from subsets_utils import validate
+
+
+def test(table: pa.Table) -> None:
+    """Validate LDA organization names output."""
+    validate(table, {
+        "columns": {
+            "name_key": "int64",
+            "name": "string",
+            "display_name": "string",
+            "organization_id": "int64",
+        },
+        "not_null": ["name_key", "name", "display_name", "organization_id"],
+        "unique": ["name_key"],
+        "min_rows": 2,
+    })
+
+    organizations = len(set(table.column("organization_id").to_pylist()))
+    print(f"    Validated {len(table):,} names resolved to {organizations:,} organizations")
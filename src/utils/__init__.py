@@ -1,3 +1,8 @@
 """Connector-specific utilities for lda-lobbying."""
 
 from .constants import YEARS, FILING_YEARS, CONTRIBUTION_YEARS, API_BASE, RATE_LIMIT_DELAY
+from .schemas import CATEGORY, FILINGS_RAW_SCHEMA, CONTRIBUTIONS_RAW_SCHEMA, load_filings, load_contributions
+from .parsing import AMOUNT_TYPE, UUID_TYPE, parse_amount, parse_date, parse_uuid, uuid_key, text_key, full_name, extract_quarter, extract_period
+from .lists import list_offsets, list_positions, regroup
+from .activities import ACTIVITY_INDEX_BITS, explode_activities
+from .names import ORGANIZATION_NAMES_DATASET_ID, normalize_name, name_key, organization_id, clear_organization_cache
@@ -0,0 +1,39 @@
+"""Lobbying activities exploded from raw filings, with stable integer keys.
+
+Several datasets are keyed by activity (the activities table itself and the
+bridges to lobbyists and government entities), so the explode and the key
+are defined once here.
+
+activity_id packs the parent filing's 56-bit UUID key with the activity's
+position on the filing: (uuid_key(filing_uuid) << 7) | activity_index. It is
+the same every run for the same filing, so bridge tables written in
+different runs still join.
+"""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from subsets_utils import raw_column, raw_list
+from .parsing import parse_uuid, uuid_key
+from .lists import list_positions
+
+# A filing lists one activity per general issue code (fewer than 100 codes exist)
+ACTIVITY_INDEX_BITS = 7
+
+
+def explode_activities(filings: pa.Table) -> tuple[pa.Array, pa.Table, pa.Array]:
+    """Explode a raw filings table to one row per lobbying activity.
+
+    Returns:
+        (parent filing index of each activity, activities table, activity_id)
+    """
+    filing_index, activities = raw_list(filings, "lobbying_activities")
+    positions = list_positions(raw_column(filings, "lobbying_activities"))
+    if len(positions) and pc.max(positions).as_py() >= 1 << ACTIVITY_INDEX_BITS:
+        raise ValueError(f"Filing with more than {1 << ACTIVITY_INDEX_BITS} activities; widen ACTIVITY_INDEX_BITS")
+
+    filing_keys = uuid_key(parse_uuid(raw_column(filings, "filing_uuid")), bits=63 - ACTIVITY_INDEX_BITS)
+    activity_id = pc.add(
+        pc.multiply(pc.take(filing_keys, filing_index), 1 << ACTIVITY_INDEX_BITS),
+        pc.cast(positions, pa.int64()),
+    )
+    return filing_index, activities, activity_id
@@ -0,0 +1,31 @@
+"""Vectorized helpers for exploding and regrouping Arrow list columns."""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+def list_offsets(lists: pa.ChunkedArray) -> pa.Array:
+    """Start offset of each row's items in the flattened list (plus a final end offset).
+
+    Null lists count as empty, matching pc.list_flatten.
+    """
+    lengths = pc.cast(pc.fill_null(pc.list_value_length(lists), 0), pa.int64())
+    return pa.concat_arrays([pa.array([0], pa.int64()), pc.cumulative_sum(lengths).combine_chunks()])
+
+
+def list_positions(lists: pa.ChunkedArray) -> pa.Array:
+    """Position of each flattened item within its own list (0, 1, ... per row)."""
+    offsets = list_offsets(lists)
+    parents = pc.list_parent_indices(lists)
+    return pc.cast(pc.subtract(pa.array(range(len(parents)), pa.int64()), pc.take(offsets, parents)), pa.int32())
+
+
+def regroup(lists: pa.ChunkedArray, values: pa.Array, keep: pa.Array) -> pa.ListArray:
+    """Rebuild each row's list from its flattened values, keeping only those where keep is true.
+
+    Rows left with no values become null, matching the raw `or None`.
+    """
+    kept = pa.concat_arrays([pa.array([0], pa.int64()), pc.cumulative_sum(pc.cast(keep, pa.int64()))])
+    new_offsets = pc.cast(pc.take(kept, list_offsets(lists)), pa.int32())
+    empty = pc.equal(new_offsets[1:], new_offsets[:-1])
+    return pa.ListArray.from_arrays(new_offsets, pc.filter(values, keep), mask=empty)
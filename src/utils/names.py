@@ -0,0 +1,89 @@
+"""Organization name normalization and canonical organization IDs.
+
+Registrant and client names are spelled many ways across years ("Acme
+Corp.", "ACME CORPORATION", "The Acme Corporation, Inc."), and the raw
+client IDs are not stable. normalize_name() folds the spelling
+differences that carry no meaning; the lda_organization_names table
+(transforms.organizations) maps every normalized name to a canonical
+organization_id, and organization_id() looks names up in it.
+"""
+
+from functools import lru_cache
+import pyarrow as pa
+import pyarrow.compute as pc
+from subsets_utils import load_asset
+from .parsing import text_key
+
+ORGANIZATION_NAMES_DATASET_ID = "lda_organization_names"
+
+# Trailing legal-form words, dropped (repeatedly) from the end of a name
+_LEGAL_SUFFIX = (
+    r"(?:\s+(?:inc|incorporated|llc|llp|lllp|lp|ltd|limited|corp|corporation|co|company|pc|pllc|plc|pa|sa|ag|gmbh|nv|bv))+$"
+)
+
+# Common abbreviations, expanded so both spellings normalize alike
+_ABBREVIATIONS = {
+    "assn": "association",
+    "assoc": "association",
+    "natl": "national",
+    "intl": "international",
+    "govt": "government",
+    "dept": "department",
+    "mfg": "manufacturing",
+    "mfrs": "manufacturers",
+    "svcs": "services",
+    "univ": "university",
+}
+
+
+def normalize_name(names: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Lowercase, strip punctuation, legal forms and a leading 'the'; blank -> null.
+
+    'The Acme Corp., Inc.' and 'ACME CORPORATION' both become 'acme'.
+    """
+    names = pc.utf8_lower(names)
+    names = pc.replace_substring(names, "&", " and ")
+    # Drop dots and apostrophes inside words (u.s. -> us), everything else separates words
+    names = pc.replace_substring_regex(names, r"[.'’]", "")
+    names = pc.replace_substring_regex(names, r"[^\p{L}\p{N}]+", " ")
+    names = pc.utf8_trim_whitespace(names)
+    names = pc.replace_substring_regex(names, r"^the\s+", "")
+    names = pc.replace_substring_regex(names, _LEGAL_SUFFIX, "")
+    for short, full in _ABBREVIATIONS.items():
+        names = pc.replace_substring_regex(names, rf"\b{short}\b", full)
+    return pc.if_else(pc.equal(names, ""), None, names)
+
+
+def name_key(names: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Content hash of each normalized name; the key of lda_organization_names."""
+    return text_key(normalize_name(names))
+
+
+@lru_cache(maxsize=1)
+def _organization_names() -> pa.Table:
+    try:
+        return load_asset(ORGANIZATION_NAMES_DATASET_ID, columns=["name_key", "organization_id"])
+    except FileNotFoundError as e:
+        raise FileNotFoundError(
+            f"{ORGANIZATION_NAMES_DATASET_ID} not found; run transforms.organizations before this transform"
+        ) from e
+
+
+def organization_id(names: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Canonical organization_id of each raw name (null for blank names).
+
+    Names repeat on many filings, so each distinct spelling is normalized
+    and looked up once. An id is fixed once assigned and the organizations
+    scan adds a year's names before anything looks them up, so rows built
+    from a year stay valid as later names are added; builders don't
+    fingerprint the table.
+    """
+    mapping = _organization_names()
+    encoded = pc.dictionary_encode(names).combine_chunks()
+    ids = pc.take(mapping["organization_id"], pc.index_in(name_key(pa.chunked_array([encoded.dictionary])), value_set=mapping["name_key"]))
+    return pa.chunked_array([pc.take(ids, encoded.indices)], pa.int64())
+
+
+def clear_organization_cache() -> None:
+    """Forget the loaded name mapping, so the next lookup reads the updated table."""
+    _organization_names.cache_clear()
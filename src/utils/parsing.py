@@ -0,0 +1,157 @@
+"""Vectorized parsers for raw LDA string fields.
+
+Each function takes and returns Arrow arrays, so a whole year of filings is
+parsed with a handful of compute kernels instead of a Python call per value.
+"""
+
+import sys
+import hashlib
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Plain decimal amounts, optionally with digit-group underscores; at most 15
+# integer digits so every match still fits AMOUNT_TYPE after rounding up
+_DIGITS = r"\d(?:_?\d)*"
+AMOUNT_PATTERN = rf"^[+-]?(?:{_DIGITS}(?:\.(?:{_DIGITS})?)?|\.{_DIGITS})$"
+_AMOUNT_RANGE = r"^[+-]?0*\d{0,15}(?:\.|$)"
+AMOUNT_TYPE = pa.decimal128(18, 2)
+_AMOUNT_WORK_TYPE = pa.decimal128(38, 10)
+
+_UUID_PATTERN = r"^[0-9a-fA-F]{32}$"
+UUID_TYPE = pa.binary(16)
+
+QUARTERS = {
+    "first_quarter": "Q1",
+    "second_quarter": "Q2",
+    "third_quarter": "Q3",
+    "fourth_quarter": "Q4",
+}
+_PERIODS = pa.array(list(QUARTERS))
+_QUARTERS = pa.array(list(QUARTERS.values()))
+
+# Semiannual periods (reports before 2008) as H1/H2 alongside the quarters
+PERIODS = {**QUARTERS, "mid_year": "H1", "year_end": "H2"}
+_ALL_PERIODS = pa.array(list(PERIODS))
+_PERIOD_CODES = pa.array(list(PERIODS.values()))
+
+
+def parse_amount(values: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Parse amount strings like '10,000.00' to decimal(18, 2); empty or malformed -> null.
+
+    Extra fractional digits are rounded half-to-even to cents.
+    """
+    values = pc.utf8_trim_whitespace(pc.replace_substring(values, ",", ""))
+    valid = pc.match_substring_regex(values, AMOUNT_PATTERN)
+    values = pc.replace_substring(pc.if_else(valid, values, None), "_", "")
+    values = pc.if_else(pc.match_substring_regex(values, _AMOUNT_RANGE), values, None)
+    # Anything past 10 fractional digits can't change the rounded cents
+    values = pc.replace_substring_regex(values, r"(\.\d{10})\d+$", r"\1")
+    return pc.cast(pc.round(pc.cast(values, _AMOUNT_WORK_TYPE), 2), AMOUNT_TYPE)
+
+
+def parse_date(values: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Parse the YYYY-MM-DD prefix of ISO date or datetime strings to date32; empty or invalid -> null."""
+    dates = pc.utf8_slice_codeunits(values, 0, 10)
+    parsed = pc.cast(pc.strptime(dates, format="%Y-%m-%d", unit="s", error_is_null=True), pa.date32())
+    # strptime rolls impossible days over (Feb 30 -> Mar 1); keep only exact round trips
+    return pc.if_else(pc.equal(pc.cast(parsed, pa.string()), dates), parsed, None)
+
+
+def _data_view(values: pa.Array, width: int, value_type: pa.DataType) -> pa.Array:
+    """Reinterpret the data of a fixed-width string or binary array (`width` bytes per value) as value_type, zero-copy."""
+    if pa.types.is_fixed_size_binary(values.type):
+        start, data = values.offset * width, values.buffers()[1]
+    else:
+        offsets = pa.Array.from_buffers(pa.int32(), 1, [None, values.buffers()[1]], offset=values.offset)
+        start, data = offsets[0].as_py(), values.buffers()[2]
+    size = len(values) * width
+    data = data.slice(start, size) if data is not None else pa.py_buffer(b"")
+    return pa.Array.from_buffers(value_type, size // value_type.byte_width, [None, data])
+
+
+def _uint(value: int, value_type: pa.DataType) -> pa.Scalar:
+    return pa.scalar(value, value_type)
+
+
+def _byte_swap64(values: pa.Array) -> pa.Array:
+    """Reverse the byte order of uint64 values."""
+    for shift, mask in ((8, 0x00FF00FF00FF00FF), (16, 0x0000FFFF0000FFFF), (32, 0x00000000FFFFFFFF)):
+        low = pc.bit_wise_and(values, _uint(mask, pa.uint64()))
+        high = pc.bit_wise_and(pc.shift_right(values, _uint(shift, pa.uint64())), _uint(mask, pa.uint64()))
+        values = pc.bit_wise_or(pc.shift_left(low, _uint(shift, pa.uint64())), high)
+    return values
+
+
+def _hex_digit(chars: pa.Array) -> pa.Array:
+    """Value of ASCII hex digits ('0'-'9', 'a'-'f', 'A'-'F')."""
+    # Digits are 0x3N and letters 0x4N/0x6N with N = value - 9, so add 9 when bit 6 is set
+    low = pc.bit_wise_and(chars, _uint(0x0F, chars.type))
+    return pc.add(low, pc.multiply(pc.shift_right(chars, _uint(6, chars.type)), _uint(9, chars.type)))
+
+
+def parse_uuid(values: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Parse UUID strings to their 16 raw bytes; malformed -> null."""
+    hex_values = pc.replace_substring(values, "-", "")
+    valid = pc.fill_null(pc.match_substring_regex(hex_values, _UUID_PATTERN), False)
+    # No hex-decode kernel in Arrow: with every value 32 digits long, read the
+    # string data as uint16 pairs of ASCII digits and decode each to a byte
+    pairs = _data_view(pc.if_else(valid, hex_values, "0" * 32).combine_chunks(), 32, pa.uint16())
+    if sys.byteorder == "big":
+        first, second = pc.shift_right(pairs, _uint(8, pa.uint16())), pc.bit_wise_and(pairs, _uint(0xFF, pa.uint16()))
+    else:
+        first, second = pc.bit_wise_and(pairs, _uint(0xFF, pa.uint16())), pc.shift_right(pairs, _uint(8, pa.uint16()))
+    data = pc.cast(pc.bit_wise_or(pc.shift_left(_hex_digit(first), _uint(4, pa.uint16())), _hex_digit(second)), pa.uint8())
+    uuids = pa.Array.from_buffers(UUID_TYPE, len(valid), [None, data.buffers()[1].slice(data.offset, len(data))])
+    return pa.chunked_array([pc.if_else(valid.combine_chunks(), uuids, None)], UUID_TYPE)
+
+
+def uuid_key(uuids: pa.ChunkedArray, bits: int = 56) -> pa.ChunkedArray:
+    """Stable int64 key from the leading bits of 16-byte UUIDs; null stays null.
+
+    Random (v4) UUIDs keep their randomness in the leading bytes, so the key
+    is as unique as a 56-bit hash while staying reproducible across runs.
+    """
+    uuids = uuids.combine_chunks()
+    # Leading 8 bytes of each UUID, read as a uint64 in native byte order
+    words = pa.FixedSizeListArray.from_arrays(_data_view(uuids, 16, pa.uint64()), 2)
+    leading = pc.list_element(words, 0)
+    if sys.byteorder == "little":
+        leading = _byte_swap64(leading)
+    keys = pc.cast(pc.shift_right(leading, _uint(64 - bits, pa.uint64())), pa.int64())
+    return pa.chunked_array([pc.if_else(pc.is_valid(uuids), keys, None)], pa.int64())
+
+
+def text_key(values: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Stable int64 content hash of each string or binary value (63-bit blake2b); null stays null.
+
+    Each distinct value is hashed once, so repeated texts cost one lookup.
+    """
+    encoded = pc.dictionary_encode(values).combine_chunks()
+    distinct = [v if isinstance(v, bytes) else v.encode("utf-8") for v in encoded.dictionary.to_pylist()]
+    keys = pa.array(
+        [int.from_bytes(hashlib.blake2b(v, digest_size=8).digest(), "big") >> 1 for v in distinct],
+        pa.int64(),
+    )
+    return pa.chunked_array([pc.take(keys, encoded.indices)], pa.int64())
+
+
+def full_name(first: pa.ChunkedArray, last: pa.ChunkedArray) -> tuple[pa.ChunkedArray, pa.ChunkedArray]:
+    """Join first and last names as 'first last'.
+
+    Returns:
+        (names, has_name): has_name is false where both parts are null or empty
+    """
+    first = pc.fill_null(first, "")
+    last = pc.fill_null(last, "")
+    names = pc.utf8_trim_whitespace(pc.binary_join_element_wise(first, last, " "))
+    return names, pc.or_(pc.not_equal(first, ""), pc.not_equal(last, ""))
+
+
+def extract_quarter(periods: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Map filing_period to Q1-Q4; registrations and unknown periods -> null."""
+    return pc.take(_QUARTERS, pc.index_in(periods, value_set=_PERIODS))
+
+
+def extract_period(periods: pa.ChunkedArray) -> pa.ChunkedArray:
+    """Map filing_period to Q1-Q4 or H1/H2 (semiannual); unknown periods -> null."""
+    return pc.take(_PERIOD_CODES, pc.index_in(periods, value_set=_ALL_PERIODS))
@@ -0,0 +1,100 @@
+"""Explicit Arrow schemas for raw LDA API records.
+
+Only the fields the transforms read are listed; load_raw_table drops the
+rest while parsing. Pinning the types keeps every year decoding to the same
+table layout regardless of which fields happen to be null in that year.
+"""
+
+from functools import partial
+import pyarrow as pa
+from subsets_utils import load_raw_table
+
+# Output type for names and codes that repeat across many rows: stored once
+# per distinct value, with each row holding an index
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+REGISTRANT = pa.struct([
+    ("id", pa.int64()),
+    ("name", pa.string()),
+    ("state", pa.string()),
+])
+
+CLIENT = pa.struct([
+    ("id", pa.int64()),
+    ("name", pa.string()),
+    ("state", pa.string()),
+    ("country", pa.string()),
+])
+
+LOBBYIST = pa.struct([
+    ("id", pa.int64()),
+    ("prefix", pa.string()),
+    ("first_name", pa.string()),
+    ("nickname", pa.string()),
+    ("middle_name", pa.string()),
+    ("last_name", pa.string()),
+    ("suffix", pa.string()),
+])
+
+ACTIVITY_LOBBYIST = pa.struct([
+    ("lobbyist", LOBBYIST),
+    ("covered_position", pa.string()),
+    ("new", pa.bool_()),
+])
+
+GOVERNMENT_ENTITY = pa.struct([
+    ("id", pa.int64()),
+    ("name", pa.string()),
+])
+
+LOBBYING_ACTIVITY = pa.struct([
+    ("general_issue_code", pa.string()),
+    ("general_issue_code_display", pa.string()),
+    ("description", pa.string()),
+    ("lobbyists", pa.list_(ACTIVITY_LOBBYIST)),
+    ("government_entities", pa.list_(GOVERNMENT_ENTITY)),
+])
+
+FILINGS_RAW_SCHEMA = pa.schema([
+    ("filing_uuid", pa.string()),
+    ("filing_type", pa.string()),
+    ("filing_type_display", pa.string()),
+    ("filing_year", pa.int64()),
+    ("filing_period", pa.string()),
+    ("income", pa.string()),
+    ("expenses", pa.string()),
+    ("dt_posted", pa.string()),
+    ("termination_date", pa.string()),
+    ("registrant", REGISTRANT),
+    ("client", CLIENT),
+    ("lobbying_activities", pa.list_(LOBBYING_ACTIVITY)),
+])
+
+CONTRIBUTION_ITEM = pa.struct([
+    ("contribution_type", pa.string()),
+    ("contribution_type_display", pa.string()),
+    ("contributor_name", pa.string()),
+    ("payee_name", pa.string()),
+    ("honoree_name", pa.string()),
+    ("amount", pa.string()),
+    ("date", pa.string()),
+])
+
+CONTRIBUTIONS_RAW_SCHEMA = pa.schema([
+    ("filing_uuid", pa.string()),
+    ("filing_type", pa.string()),
+    ("filing_type_display", pa.string()),
+    ("filing_year", pa.int64()),
+    ("filing_period", pa.string()),
+    ("filer_type", pa.string()),
+    ("dt_posted", pa.string()),
+    ("registrant", pa.struct([("id", pa.int64()), ("name", pa.string())])),
+    ("lobbyist", LOBBYIST),
+    ("no_contributions", pa.bool_()),
+    ("pacs", pa.list_(pa.string())),
+    ("contribution_items", pa.list_(CONTRIBUTION_ITEM)),
+])
+
+# Loaders for run_builders: raw {filings,contributions}_{year} decoded with their schema
+load_filings = partial(load_raw_table, schema=FILINGS_RAW_SCHEMA)
+load_contributions = partial(load_raw_table, schema=CONTRIBUTIONS_RAW_SCHEMA)